@@ -0,0 +1,172 @@
+class FenwickTree:
+    """
+    Binary indexed tree over a list of non-negative weights.
+
+    Setting a weight and drawing an index with probability proportional
+    to its weight both take O(log n), which keeps adaptive drills fast on
+    decks with hundreds of thousands of cards.
+    """
+
+    def __init__(self, weights=()):
+        """
+        Build the tree in O(n).
+
+        Args:
+            weights (iterable): Initial weights
+        """
+        self.weights = [float(w) for w in weights]
+        self.tree = [0.0] + self.weights
+        n = len(self.weights)
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                self.tree[parent] += self.tree[i]
+
+    def __len__(self):
+        return len(self.weights)
+
+    def _add(self, index, delta):
+        i = index + 1
+        tree = self.tree
+        n = len(tree)
+        while i < n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, count):
+        """
+        Sum of the first `count` weights.
+
+        Args:
+            count (int): Number of leading weights to add up
+
+        Returns:
+            float: The sum
+        """
+        total = 0.0
+        i = count
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    @property
+    def total(self):
+        """float: Sum of all weights."""
+        return self.prefix_sum(len(self.weights))
+
+    def set(self, index, weight):
+        """
+        Change one weight.
+
+        Args:
+            index (int): Zero-based position
+            weight (float): New weight (>= 0)
+        """
+        weight = float(weight)
+        delta = weight - self.weights[index]
+        if delta:
+            self.weights[index] = weight
+            self._add(index, delta)
+
+    def append(self, weight):
+        """
+        Add a weight at the end.
+
+        Args:
+            weight (float): Weight of the new position (>= 0)
+        """
+        weight = float(weight)
+        i = len(self.weights) + 1
+        # A node covers (i - lowbit(i), i]; everything but the new weight is already summed
+        node = weight + self.prefix_sum(i - 1) - self.prefix_sum(i - (i & -i))
+        self.weights.append(weight)
+        self.tree.append(node)
+
+    def pop(self):
+        """
+        Remove the last weight.
+
+        Returns:
+            float: The removed weight
+        """
+        self.tree.pop()
+        return self.weights.pop()
+
+    def find(self, target):
+        """
+        Find the position whose cumulative weight range contains target.
+
+        Args:
+            target (float): Value in [0, total)
+
+        Returns:
+            int: Zero-based position
+        """
+        tree = self.tree
+        n = len(self.weights)
+        pos = 0
+        step = 1 << n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return min(pos, n - 1)
+
+    def sample(self, rng):
+        """
+        Draw a position with probability proportional to its weight.
+
+        Args:
+            rng (random.Random): Random number generator
+
+        Returns:
+            int: Zero-based position, or None if all weights are zero
+        """
+        total = self.total
+        if not self.weights or total <= 0:
+            return None
+
+        for _ in range(8):
+            pos = self.find(rng.random() * total)
+            if self.weights[pos] > 0:
+                return pos
+        # Rounding drift landed on empty slots repeatedly; fall back to a scan
+        positive = [i for i, w in enumerate(self.weights) if w > 0]
+        return rng.choice(positive) if positive else None
+
+
+class CardStats:
+    """
+    Answer history of one card, turned into a sampling weight.
+
+    The weight is a smoothed error rate plus a floor, so new cards start in
+    the middle, missed cards come up more often and mastered cards still
+    appear now and then.
+    """
+
+    __slots__ = ('attempts', 'misses')
+
+    MIN_WEIGHT = 0.05
+
+    def __init__(self):
+        self.attempts = 0
+        self.misses = 0
+
+    def record(self, correct):
+        """
+        Count one answer.
+
+        Args:
+            correct (bool): Whether the answer was right
+        """
+        self.attempts += 1
+        if not correct:
+            self.misses += 1
+
+    @property
+    def weight(self):
+        """float: Sampling weight of the card."""
+        return self.MIN_WEIGHT + (self.misses + 1) / (self.attempts + 2)
@@ -0,0 +1,374 @@
+import hashlib
+import numpy as np
+from libdict_io import atomic_write, deck_hash
+
+# Answer statistics are saved next to their deck (deck.libdict.stats.npz)
+STATS_SUFFIX = '.stats.npz'
+
+# One row per answer in the review history
+REVIEW_DTYPE = np.dtype([
+    ('card', '<i4'),      # Card index in the deck
+    ('correct', 'u1'),    # 1 if the answer was right
+    ('latency', '<f4'),   # Seconds from showing the card to answering, NaN if unknown
+    ('session', '<u4')    # Study session the answer was given in
+])
+
+
+def stats_path(deck_path):
+    """
+    Get the default statistics path for a deck.
+
+    Args:
+        deck_path (str): Path to the .libdict file
+
+    Returns:
+        str: Path to the statistics file
+    """
+    return deck_path + STATS_SUFFIX
+
+
+def card_keys(deck):
+    """
+    Get a stable 64-bit key per card, used to realign saved statistics
+    after the deck file changed.
+
+    Cards are identified by (section, term, occurrence of that term in the
+    section), the same matching live reload uses.
+
+    Args:
+        deck (Deck): The deck
+
+    Returns:
+        numpy.ndarray: uint64 key per card, in card order
+    """
+    digests = []
+    seen = {}
+    for section_name in deck.sections:
+        for i in deck.section_range(section_name):
+            key = (section_name, deck.terms[i])
+            seen[key] = seen.get(key, 0) + 1
+            text = f"{section_name}\0{deck.terms[i]}\0{seen[key]}"
+            digests.append(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest())
+    return np.frombuffer(b''.join(digests), dtype='<u8').copy()
+
+
+class CardAnalytics:
+    """
+    Answer statistics of one deck, kept in NumPy arrays aligned with the
+    deck's card order.
+
+    Per-card counters (attempts, correct answers, total answer time) make
+    aggregates a handful of vectorized operations, and every answer is
+    also appended to a review history for latency percentiles and learning
+    curves. Both survive across study sessions through save() and load().
+    """
+
+    def __init__(self, deck):
+        """
+        Args:
+            deck (Deck): Deck the statistics belong to
+        """
+        count = len(deck)
+        self.sections = list(deck.sections)
+        self.section_starts = np.asarray(deck.section_starts, dtype=np.int64)
+        self.attempts = np.zeros(count, dtype=np.int64)
+        self.correct = np.zeros(count, dtype=np.int64)
+        self.timed = np.zeros(count, dtype=np.int64)  # Answers with a known latency
+        self.latency = np.zeros(count, dtype=np.float64)  # Total latency of timed answers
+        self.session = 0
+        self._reviews = np.zeros(1024, dtype=REVIEW_DTYPE)
+        self._review_count = 0
+
+    @property
+    def reviews(self):
+        """numpy.ndarray: Review history, one REVIEW_DTYPE row per answer."""
+        return self._reviews[:self._review_count]
+
+    def start_session(self):
+        """
+        Start a new study session; later answers are counted under it.
+
+        Returns:
+            int: Number of the new session
+        """
+        self.session += 1
+        return self.session
+
+    def _reserve(self, extra):
+        needed = self._review_count + extra
+        if needed > len(self._reviews):
+            grown = np.zeros(max(needed, 2 * len(self._reviews)), dtype=REVIEW_DTYPE)
+            grown[:self._review_count] = self.reviews
+            self._reviews = grown
+
+    def record(self, index, correct, latency=None):
+        """
+        Count one answer.
+
+        Args:
+            index (int): Card index in the deck
+            correct (bool): Whether the answer was right
+            latency (float, optional): Seconds taken to answer
+        """
+        self.attempts[index] += 1
+        if correct:
+            self.correct[index] += 1
+        if latency is not None:
+            self.timed[index] += 1
+            self.latency[index] += latency
+
+        self._reserve(1)
+        self._reviews[self._review_count] = (index, bool(correct),
+                                             np.nan if latency is None else latency, self.session)
+        self._review_count += 1
+
+    def record_many(self, indices, correct, latencies=None):
+        """
+        Count many answers at once, e.g. when importing a review history.
+
+        Args:
+            indices (array-like): Card index of each answer
+            correct (array-like): Whether each answer was right
+            latencies (array-like, optional): Seconds per answer, NaN if unknown
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        correct = np.asarray(correct, dtype=bool)
+        if latencies is None:
+            latencies = np.full(len(indices), np.nan)
+        latencies = np.asarray(latencies, dtype=np.float64)
+        timed = ~np.isnan(latencies)
+
+        count = len(self.attempts)
+        self.attempts += np.bincount(indices, minlength=count)
+        self.correct += np.bincount(indices[correct], minlength=count)
+        self.timed += np.bincount(indices[timed], minlength=count)
+        self.latency += np.bincount(indices[timed], weights=latencies[timed], minlength=count)
+
+        self._reserve(len(indices))
+        rows = self._reviews[self._review_count:self._review_count + len(indices)]
+        rows['card'] = indices
+        rows['correct'] = correct
+        rows['latency'] = latencies
+        rows['session'] = self.session
+        self._review_count += len(indices)
+
+    def remap(self, deck, mapping=None):
+        """
+        Realign the statistics with a new version of the deck.
+
+        Args:
+            deck (Deck): The new deck
+            mapping (array-like, optional): New card index by old card index,
+                -1 for removed cards; None if indices are unchanged
+        """
+        count = len(deck)
+        self.sections = list(deck.sections)
+        self.section_starts = np.asarray(deck.section_starts, dtype=np.int64)
+
+        if mapping is None:
+            mapping = np.arange(len(self.attempts))
+        mapping = np.asarray(mapping, dtype=np.int64)
+        keep = mapping >= 0
+        for name in ('attempts', 'correct', 'timed', 'latency'):
+            old = getattr(self, name)
+            new = np.zeros(count, dtype=old.dtype)
+            new[mapping[keep]] = old[keep]
+            setattr(self, name, new)
+
+        reviews = self.reviews
+        targets = mapping[reviews['card']]
+        reviews = reviews[targets >= 0]
+        reviews['card'] = targets[targets >= 0]
+        self._reviews = reviews.copy() if len(reviews) else np.zeros(1024, dtype=REVIEW_DTYPE)
+        self._review_count = len(reviews)
+
+    # --- Aggregates ---
+
+    def section_ids(self):
+        """
+        Get the section of every card.
+
+        Returns:
+            numpy.ndarray: Section index per card
+        """
+        return np.repeat(np.arange(len(self.sections)), np.diff(self.section_starts))
+
+    def section_summary(self):
+        """
+        Aggregate the counters by section.
+
+        Returns:
+            list: One dict per section with 'section', 'cards', 'seen'
+                (cards answered at least once), 'attempts', 'correct',
+                'accuracy' (None before any answer) and 'mean_latency'
+        """
+        ids = self.section_ids()
+        size = len(self.sections)
+        cards = np.bincount(ids, minlength=size)
+        seen = np.bincount(ids, weights=self.attempts > 0, minlength=size)
+        attempts = np.bincount(ids, weights=self.attempts, minlength=size)
+        correct = np.bincount(ids, weights=self.correct, minlength=size)
+        timed = np.bincount(ids, weights=self.timed, minlength=size)
+        latency = np.bincount(ids, weights=self.latency, minlength=size)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            accuracy = correct / attempts
+            mean_latency = latency / timed
+
+        return [{
+            'section': name,
+            'cards': int(cards[k]),
+            'seen': int(seen[k]),
+            'attempts': int(attempts[k]),
+            'correct': int(correct[k]),
+            'accuracy': float(accuracy[k]) if attempts[k] else None,
+            'mean_latency': float(mean_latency[k]) if timed[k] else None
+        } for k, name in enumerate(self.sections)]
+
+    def error_rates(self):
+        """
+        Get the smoothed error rate of every card, (misses + 1) / (attempts + 2),
+        so cards answered once are not ranked as hard as cards missed often.
+
+        Returns:
+            numpy.ndarray: Error rate per card
+        """
+        return (self.attempts - self.correct + 1) / (self.attempts + 2)
+
+    def hardest(self, k=10, min_attempts=2):
+        """
+        Find the cards answered wrong most often.
+
+        Args:
+            k (int): Number of cards to return
+            min_attempts (int): Ignore cards answered fewer times than this
+
+        Returns:
+            numpy.ndarray: Card indices, hardest first
+        """
+        candidates = np.flatnonzero(self.attempts >= min_attempts)
+        if not len(candidates) or k <= 0:
+            return candidates[:0]
+
+        rates = self.error_rates()[candidates]
+        if len(candidates) > k:
+            # partition finds the k-th highest rate in O(n); every card tied
+            # with it is kept so the sort below can break the tie by attempts
+            threshold = -np.partition(-rates, k - 1)[k - 1]
+            top = np.flatnonzero(rates >= threshold)
+        else:
+            top = np.arange(len(candidates))
+        order = np.lexsort((-self.attempts[candidates[top]], -rates[top]))[:k]
+        return candidates[top[order]]
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)):
+        """
+        Get percentiles of the answer time over the review history.
+
+        Args:
+            percentiles (iterable): Percentiles to compute, 0-100
+
+        Returns:
+            dict: Percentile -> seconds, empty if no answer was timed
+        """
+        latencies = self.reviews['latency']
+        latencies = latencies[~np.isnan(latencies)]
+        if not len(latencies):
+            return {}
+        values = np.percentile(latencies, list(percentiles))
+        return {p: float(v) for p, v in zip(percentiles, values)}
+
+    def learning_curve(self):
+        """
+        Get the accuracy of each study session that had answers.
+
+        Returns:
+            tuple: (session numbers, accuracy per session, answers per session)
+        """
+        reviews = self.reviews
+        answers = np.bincount(reviews['session'])
+        right = np.bincount(reviews['session'], weights=reviews['correct'], minlength=len(answers))
+        sessions = np.flatnonzero(answers)
+        return sessions, right[sessions] / answers[sessions], answers[sessions]
+
+    def summary(self):
+        """
+        Get overall totals.
+
+        Returns:
+            dict: 'reviews', 'correct', 'accuracy' (None before any answer),
+                'cards_seen', 'cards' and 'sessions'
+        """
+        reviews = int(self.attempts.sum())
+        correct = int(self.correct.sum())
+        return {
+            'reviews': reviews,
+            'correct': correct,
+            'accuracy': correct / reviews if reviews else None,
+            'cards_seen': int(np.count_nonzero(self.attempts)),
+            'cards': len(self.attempts),
+            'sessions': len(np.unique(self.reviews['session']))
+        }
+
+    # --- Persistence ---
+
+    def save(self, deck, path=None):
+        """
+        Save the statistics next to the deck.
+
+        Args:
+            deck (Deck): The deck the statistics are aligned with
+            path (str, optional): Statistics path, defaults to next to the deck
+
+        Returns:
+            str: Path to the written file
+        """
+        path = path or stats_path(deck.path)
+        with atomic_write(path, binary=True) as f:
+            np.savez(f, deck_hash=np.array(deck_hash(deck.path)), keys=card_keys(deck),
+                     attempts=self.attempts, correct=self.correct, timed=self.timed,
+                     latency=self.latency, reviews=self.reviews, session=np.array(self.session))
+        return path
+
+    @classmethod
+    def load(cls, deck, path=None):
+        """
+        Load saved statistics for a deck, realigning them if the deck's
+        cards moved since they were saved. Cards that no longer exist lose
+        their history.
+
+        Args:
+            deck (Deck): The loaded deck
+            path (str, optional): Statistics path, defaults to next to the deck
+
+        Returns:
+            CardAnalytics: The statistics
+        """
+        path = path or stats_path(deck.path)
+        analytics = cls(deck)
+        with np.load(path, allow_pickle=False) as data:
+            attempts = data['attempts']
+            analytics.attempts = attempts
+            analytics.correct = data['correct']
+            analytics.timed = data['timed']
+            analytics.latency = data['latency']
+            analytics._reviews = data['reviews'].astype(REVIEW_DTYPE)
+            analytics._review_count = len(analytics._reviews)
+            analytics.session = int(data['session'])
+
+            if str(data['deck_hash']) == deck_hash(deck.path) and len(attempts) == len(deck):
+                return analytics
+
+            # Match saved cards to current ones through their keys
+            old_keys = data['keys']
+            new_keys = card_keys(deck)
+            order = np.argsort(new_keys)
+            positions = np.searchsorted(new_keys[order], old_keys).clip(0, max(len(deck) - 1, 0))
+            if len(deck):
+                found = new_keys[order][positions] == old_keys
+                mapping = np.where(found, order[positions], -1)
+            else:
+                mapping = np.full(len(old_keys), -1)
+
+        analytics.remap(deck, mapping)
+        return analytics
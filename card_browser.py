@@ -0,0 +1,216 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class CardTable(ttk.Frame):
+    """
+    Table of cards that only keeps the visible rows in its Treeview.
+
+    The Treeview holds a small pool of items, one per visible row; scrolling
+    moves a window over the data and rewrites those items with the rows
+    fetched for it. The cost of a scroll step therefore depends on the
+    window height, not on the number of cards, which keeps decks with
+    hundreds of thousands of cards smooth.
+    """
+
+    COLUMNS = (('term', "Term", 260), ('definition', "Definition", 360), ('section', "Section", 120))
+    ROW_HEIGHT = 22
+
+    def __init__(self, master, fetch, on_sort=None, on_open=None, **kwargs):
+        """
+        Args:
+            master: Parent widget
+            fetch (callable): fetch(start, stop) returning a list of
+                (term, definition, section) tuples for those row positions
+            on_sort (callable, optional): on_sort(column, descending) called
+                when a heading is clicked; it should reorder the rows and
+                call set_row_count()
+            on_open (callable, optional): on_open(position) called when a
+                row is double-clicked or opened with Enter
+        """
+        super().__init__(master, **kwargs)
+        self.fetch = fetch
+        self.on_sort = on_sort
+        self.on_open = on_open
+
+        self.row_count = 0
+        self.first = 0  # Row position shown at the top
+        self.visible = 20  # Rows that fit in the window
+        self.selected = None  # Selected row position
+        self.sort_column = None
+        self.descending = False
+        self._items = []  # Treeview items reused for the visible rows
+        self._render_job = None
+
+        style = ttk.Style(self)
+        style.configure('Browse.Treeview', rowheight=self.ROW_HEIGHT)
+
+        self.tree = ttk.Treeview(self,
+                                 columns=[name for name, _, _ in self.COLUMNS],
+                                 show='headings',
+                                 selectmode='browse',
+                                 style='Browse.Treeview')
+        for name, title, width in self.COLUMNS:
+            self.tree.heading(name, text=title, command=lambda c=name: self._sort_by(c))
+            self.tree.column(name, width=width, anchor=tk.W)
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda event: self._scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self._scroll_by(3))
+        self.tree.bind('<Double-1>', self._on_double_click)
+        self.tree.bind('<Return>', lambda event: self._open(self.selected))
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        for key, step in (('<Up>', -1), ('<Down>', 1), ('<Prior>', None), ('<Next>', None),
+                          ('<Home>', None), ('<End>', None)):
+            self.tree.bind(key, lambda event, k=key, s=step: self._on_key(k, s))
+
+    # --- Data ---
+
+    def set_row_count(self, count, keep_position=False):
+        """
+        Show a new set of rows, e.g. after loading, sorting or filtering.
+
+        Args:
+            count (int): Number of rows
+            keep_position (bool): Stay at the current scroll position
+                instead of going back to the top
+        """
+        self.row_count = count
+        if not keep_position:
+            self.first = 0
+            self.selected = None
+        self._schedule_render()
+
+    def refresh(self):
+        """Fetch and redraw the visible rows, e.g. after cards were edited."""
+        self._schedule_render()
+
+    def _sort_by(self, column):
+        if self.sort_column == column:
+            self.descending = not self.descending
+        else:
+            self.sort_column, self.descending = column, False
+
+        for name, title, _ in self.COLUMNS:
+            arrow = (" ▼" if self.descending else " ▲") if name == column else ""
+            self.tree.heading(name, text=title + arrow)
+        if self.on_sort:
+            self.on_sort(self.sort_column, self.descending)
+
+    # --- Drawing ---
+
+    def _schedule_render(self):
+        # Many scroll events can arrive between redraws; draw once when idle
+        if self._render_job is None:
+            self._render_job = self.after_idle(self._render)
+
+    def _render(self):
+        self._render_job = None
+        self.first = max(0, min(self.first, self.row_count - self.visible))
+        stop = min(self.row_count, self.first + self.visible)
+        rows = self.fetch(self.first, stop) if stop > self.first else []
+
+        # Grow or shrink the item pool to the number of rows shown
+        while len(self._items) < len(rows):
+            self._items.append(self.tree.insert('', tk.END))
+        while len(self._items) > len(rows):
+            self.tree.delete(self._items.pop())
+
+        for item, values in zip(self._items, rows):
+            self.tree.item(item, values=values)
+
+        selection = ()
+        if self.selected is not None and self.first <= self.selected < stop:
+            selection = (self._items[self.selected - self.first],)
+        if tuple(self.tree.selection()) != selection:
+            self.tree.selection_set(selection)
+        if selection:
+            self.tree.focus(selection[0])
+
+        if self.row_count:
+            self.scrollbar.set(self.first / self.row_count, stop / self.row_count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # --- Scrolling and selection ---
+
+    def _scroll_to(self, first):
+        first = max(0, min(first, self.row_count - self.visible))
+        if first != self.first:
+            self.first = first
+            self._schedule_render()
+
+    def _scroll_by(self, rows):
+        self._scroll_to(self.first + rows)
+        return 'break'
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self._scroll_to(int(float(amount) * self.row_count))
+        elif action == 'scroll':
+            step = self.visible - 1 if unit == 'pages' else 1
+            self._scroll_by(int(amount) * step)
+
+    def _on_wheel(self, event):
+        # Windows reports multiples of 120 per notch; macOS reports small deltas
+        notches = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+        return self._scroll_by(-3 * notches)
+
+    def _on_resize(self, event):
+        visible = max(1, (event.height - self.ROW_HEIGHT) // self.ROW_HEIGHT)
+        if visible != self.visible:
+            self.visible = visible
+            self._schedule_render()
+
+    def _position_of(self, item):
+        try:
+            return self.first + self._items.index(item)
+        except ValueError:
+            return None
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            position = self._position_of(selection[0])
+            if position is not None:
+                self.selected = position
+
+    def _on_key(self, key, step):
+        if not self.row_count:
+            return 'break'
+        current = self.selected if self.selected is not None else self.first
+        if key == '<Home>':
+            target = 0
+        elif key == '<End>':
+            target = self.row_count - 1
+        elif key == '<Prior>':
+            target = current - (self.visible - 1)
+        elif key == '<Next>':
+            target = current + (self.visible - 1)
+        else:
+            target = current + step
+        self.selected = max(0, min(target, self.row_count - 1))
+
+        # Keep the selection inside the window
+        if self.selected < self.first:
+            self.first = self.selected
+        elif self.selected >= self.first + self.visible:
+            self.first = self.selected - self.visible + 1
+        self._schedule_render()
+        return 'break'
+
+    def _on_double_click(self, event):
+        position = self._position_of(self.tree.identify_row(event.y))
+        if position is not None:
+            self.selected = position
+            self._open(position)
+        return 'break'
+
+    def _open(self, position):
+        if position is not None and self.on_open:
+            self.on_open(position)
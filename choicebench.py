@@ -0,0 +1,103 @@
+import argparse
+import random
+import time
+from deck import Deck, StudySession
+
+
+def synthetic_deck(cards, sections=8, seed=0):
+    """
+    Build an in-memory deck of generated cards with varied definition lengths.
+
+    Args:
+        cards (int): Number of cards
+        sections (int): Number of sections, sized roughly equally
+        seed (int): Seed for the generated text
+
+    Returns:
+        Deck: The deck
+    """
+    rng = random.Random(seed)
+    names = [f"section{k}" for k in range(sections)]
+    starts = [k * cards // sections for k in range(sections)] + [cards]
+    terms = [f"term{i}" for i in range(cards)]
+    definitions = [f"definition {i} " + "x" * rng.randrange(40) for i in range(cards)]
+    return Deck(f"{cards} generated cards", None, '1.0', names, terms, definitions, starts)
+
+
+def scan_choices(session, count=4):
+    """
+    Pick options by scanning the current card's section for definitions of
+    similar length on every question; the baseline for the indexed choices().
+
+    Args:
+        session (StudySession): Session positioned on the question card
+        count (int): Number of options
+
+    Returns:
+        list: Card indices of the options
+    """
+    deck = session.deck
+    index = session.view[session.current_index]
+    length = len(deck.definitions[index])
+    cards = deck.section_range(deck.section_of(index))
+    candidates = [i for i in cards
+                  if i != index and abs(len(deck.definitions[i]) - length) <= max(2, length // 4)]
+    options = [index] + session.rng.sample(candidates, min(count - 1, len(candidates)))
+    session.rng.shuffle(options)
+    return options
+
+
+def benchmark(deck, questions=100000, count=4, scan_questions=0, seed=0):
+    """
+    Measure how many multiple-choice questions can be generated per second.
+
+    Args:
+        deck (Deck): Deck to quiz on
+        questions (int): Questions generated with the length index
+        count (int): Options per question
+        scan_questions (int): Questions generated by scanning, 0 to skip
+        seed (int): Session seed
+
+    Returns:
+        dict: Index build time and questions per second for each method
+    """
+    session = StudySession(deck, seed=seed)
+    session.shuffle_cards()
+
+    start = time.perf_counter()
+    deck.length_order()
+    result = {'cards': len(deck), 'build_seconds': time.perf_counter() - start}
+
+    start = time.perf_counter()
+    for _ in range(questions):
+        session.choices(count)
+        session.next_card()
+    elapsed = time.perf_counter() - start
+    result['questions_per_second'] = questions / elapsed if elapsed else 0.0
+
+    if scan_questions:
+        start = time.perf_counter()
+        for _ in range(scan_questions):
+            scan_choices(session, count)
+            session.next_card()
+        elapsed = time.perf_counter() - start
+        result['scan_questions_per_second'] = scan_questions / elapsed if elapsed else 0.0
+    return result
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark multiple-choice question generation.")
+    arg_parser.add_argument('--deck', help="A .libdict file; a generated deck is used if omitted")
+    arg_parser.add_argument('--cards', type=int, default=100000, help="Size of the generated deck")
+    arg_parser.add_argument('--questions', type=int, default=100000, help="Questions to generate")
+    arg_parser.add_argument('--options', type=int, default=4, help="Options per question")
+    arg_parser.add_argument('--scan', type=int, default=200,
+                            help="Questions generated by scanning the section, for comparison (0 to skip)")
+    args = arg_parser.parse_args()
+
+    deck = Deck.load(args.deck) if args.deck else synthetic_deck(args.cards)
+    result = benchmark(deck, args.questions, args.options, args.scan)
+    print(f"{result['cards']} cards, length index built in {result['build_seconds'] * 1000:.1f} ms")
+    print(f"  indexed: {result['questions_per_second']:.0f} questions/s")
+    if 'scan_questions_per_second' in result:
+        print(f"  scan:    {result['scan_questions_per_second']:.0f} questions/s")
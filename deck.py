@@ -0,0 +1,1043 @@
+import bisect
+import itertools
+import os
+import random
+from array import array
+from libdict_io import read_libdict, deck_hash, normalize_word, NORMALIZER_VERSION
+from adaptive import FenwickTree, CardStats
+from snapshots import snapshot_path, write_snapshot, read_snapshot, pack_bits, bit_is_set
+
+
+class Deck:
+    """
+    A parsed deck, shared read-only by any number of study sessions.
+
+    Cards are kept as parallel columns in file order: normalized terms and
+    definitions for matching answers, and the original display text. The
+    cards of each section form one contiguous range of card indices
+    described by section_starts. A Deck is never modified after it is
+    built: edits return a new Deck, which lets sessions on other threads
+    keep reading the old one without any locking.
+    """
+
+    __slots__ = ('title', 'path', 'format_version', 'sections', 'terms', 'definitions',
+                 'display_terms', 'display_definitions', 'section_starts', '_section_index',
+                 '_sort_orders')
+
+    def __init__(self, title, path, format_version, sections, terms, definitions, section_starts,
+                 display_terms=None, display_definitions=None):
+        """
+        Args:
+            title (str): Deck title
+            path (str): Path of the .libdict file, or None
+            format_version (str): Format version of the file
+            sections (iterable): Section names in file order
+            terms (iterable): Normalized term of each card
+            definitions (iterable): Normalized definition of each card
+            section_starts (iterable): First card index of each section,
+                followed by the card count
+            display_terms (iterable, optional): Original text of each term,
+                defaults to the normalized terms
+            display_definitions (iterable, optional): Original text of each
+                definition, defaults to the normalized definitions
+        """
+        self.title = title
+        self.path = path
+        self.format_version = format_version
+        self.sections = tuple(sections)
+        self.terms = tuple(terms)
+        self.definitions = tuple(definitions)
+        self.display_terms = tuple(display_terms) if display_terms is not None else self.terms
+        self.display_definitions = (tuple(display_definitions) if display_definitions is not None
+                                    else self.definitions)
+        self.section_starts = tuple(section_starts)
+        self._section_index = {name: k for k, name in enumerate(self.sections)}
+        self._sort_orders = {}  # Column -> card indices in sorted order, computed on first use
+
+    @classmethod
+    def empty(cls):
+        """
+        Get a deck without cards, used before anything is loaded.
+
+        Returns:
+            Deck: The empty deck
+        """
+        return cls(None, None, '1.0', (), (), (), (0,))
+
+    @classmethod
+    def load(cls, file_path, cache=None):
+        """
+        Load a .libdict file, going through the deck cache when one is given.
+
+        Args:
+            file_path (str): Path to the .libdict file
+            cache (DeckCache, optional): Warm cache of parsed decks
+
+        Returns:
+            Deck: The loaded deck
+        """
+        if cache is None:
+            return cls.from_entry(cls.parse(file_path), file_path)
+
+        # Describe the file before parsing it: if it changes meanwhile, the
+        # entry is stored under the old description and simply misses later
+        meta = cache.describe(file_path)
+        entry = cache.get(file_path, meta)
+        if entry is None:
+            entry = cls.parse(file_path)
+            cache.put(file_path, entry, meta)
+        return cls.from_entry(entry, file_path)
+
+    @staticmethod
+    def parse(file_path):
+        """
+        Parse a .libdict file into normalized card columns, the form kept in the deck cache.
+
+        Args:
+            file_path (str): Path to the .libdict file.
+
+        Returns:
+            dict: 'title', 'format_version', 'sections' (names), and per card
+                'terms', 'definitions' (normalized), 'display_terms',
+                'display_definitions' (original text) and 'section_ids'
+                (index into sections)
+        """
+        data = read_libdict(file_path)
+        sections = data.get('sections', {})
+        # Saved keys are only trusted when made by the current normalizer
+        keyed = data.get('normalizer_version') == NORMALIZER_VERSION
+        entry = {
+            'title': data.get('title', os.path.basename(file_path)),
+            'format_version': data.get('format_version', '1.0'),
+            'sections': list(sections),
+            'terms': [],
+            'definitions': [],
+            'display_terms': [],
+            'display_definitions': [],
+            'section_ids': []
+        }
+
+        for section_id, items in enumerate(sections.values()):
+            for item in items:
+                term = item.get('term', '')
+                definition = item.get('definition', '')
+                term_key = item.get('term_key') if keyed else None
+                definition_key = item.get('definition_key') if keyed else None
+                if term_key is None:
+                    term_key = normalize_word(term)
+                if definition_key is None:
+                    definition_key = normalize_word(definition)
+
+                # Share the string when the display text needs no normalizing
+                entry['terms'].append(term_key)
+                entry['definitions'].append(definition_key)
+                entry['display_terms'].append(term_key if term == term_key else term)
+                entry['display_definitions'].append(definition_key if definition == definition_key
+                                                    else definition)
+                entry['section_ids'].append(section_id)
+        return entry
+
+    @classmethod
+    def from_entry(cls, entry, path):
+        """
+        Build a deck from the card columns made by parse().
+
+        Args:
+            entry (dict): Card columns
+            path (str): Path of the .libdict file
+
+        Returns:
+            Deck: The deck
+        """
+        section_ids = entry['section_ids']
+        # Cards come grouped by section in file order, so the ranges can be found by bisection
+        starts = [bisect.bisect_left(section_ids, k) for k in range(len(entry['sections']))]
+        starts.append(len(section_ids))
+        return cls(entry['title'], path, entry['format_version'], entry['sections'],
+                   entry['terms'], entry['definitions'], starts,
+                   entry.get('display_terms'), entry.get('display_definitions'))
+
+    def __len__(self):
+        return len(self.terms)
+
+    def section_range(self, section_name):
+        """
+        Get the card indices of a section.
+
+        Args:
+            section_name (str): Name of the section
+
+        Returns:
+            range: Card indices of the section in file order
+        """
+        k = self._section_index.get(section_name)
+        if k is None:
+            raise ValueError(f"Unknown section: {section_name}")
+        return range(self.section_starts[k], self.section_starts[k + 1])
+
+    def section_of(self, index):
+        """
+        Get the section a card belongs to.
+
+        Args:
+            index (int): Card index
+
+        Returns:
+            str: Name of the section
+        """
+        return self.sections[bisect.bisect_right(self.section_starts, index) - 1]
+
+    def card(self, index):
+        """
+        Get a card as a dict.
+
+        Args:
+            index (int): Card index
+
+        Returns:
+            dict: 'term' and 'definition' as written in the file, and 'section'
+        """
+        return {
+            'term': self.display_terms[index],
+            'definition': self.display_definitions[index],
+            'section': self.section_of(index)
+        }
+
+    def sort_order(self, column=None):
+        """
+        Get every card index sorted by a column. Orders are computed once
+        per deck and then shared, so re-sorting a table is a lookup.
+
+        Args:
+            column (str, optional): 'term', 'definition' or 'section';
+                None for file order
+
+        Returns:
+            array: Card indices in ascending order, ties in file order
+        """
+        order = self._sort_orders.get(column)
+        if order is not None:
+            return order
+
+        if column is None:
+            order = array('I', range(len(self)))
+        elif column == 'section':
+            order = array('I')
+            for section_name in sorted(self.sections):
+                order.extend(self.section_range(section_name))
+        elif column in ('term', 'definition'):
+            values = self.terms if column == 'term' else self.definitions
+            # tuple() is free for a plain deck's columns and flattens a union's once
+            order = array('I', sorted(range(len(self)), key=tuple(values).__getitem__))
+        else:
+            raise ValueError(f"Unknown sort column: {column}")
+
+        self._sort_orders[column] = order
+        return order
+
+    def length_order(self):
+        """
+        Get the cards of each section sorted by definition length, for
+        picking multiple-choice distractors of similar length. Computed
+        once per deck and then shared.
+
+        Sections stay in their card index ranges, so the cards of a section
+        occupy the same positions in the order as in the deck, and cards of
+        similar length sit next to each other.
+
+        Returns:
+            tuple: (order, rank) arrays; order holds card indices and
+                rank[card] is the card's position in order
+        """
+        cached = self._sort_orders.get('length')
+        if cached is not None:
+            return cached
+
+        lengths = [len(definition) for definition in self.definitions]
+        order = array('I')
+        for k in range(len(self.sections)):
+            cards = range(self.section_starts[k], self.section_starts[k + 1])
+            order.extend(sorted(cards, key=lengths.__getitem__))
+
+        rank = array('I', bytes(order.itemsize * len(order)))
+        for position, index in enumerate(order):
+            rank[index] = position
+
+        self._sort_orders['length'] = (order, rank)
+        return order, rank
+
+    def apply_edit(self, op):
+        """
+        Apply one edit operation, in the same form as the deck's journal entries.
+
+        Args:
+            op (dict): Edit with 'op' set to add_section, delete_section,
+                add_card, update_card or delete_card
+
+        Returns:
+            tuple: (new Deck, mapping, added). mapping is an array of new card
+                indices by old card index (-1 for deleted cards), or None when
+                indices did not move; added lists the indices of new cards.
+        """
+        kind = op['op']
+        sections = list(self.sections)
+        starts = list(self.section_starts)
+
+        if kind == 'add_section':
+            if op['section'] in self._section_index:
+                return self, None, []
+            sections.append(op['section'])
+            starts.append(starts[-1])
+            return self._replace(sections, starts), None, []
+
+        if op['section'] not in self._section_index:
+            raise ValueError(f"Unknown section: {op['section']}")
+        k = self._section_index[op['section']]
+        start, end = starts[k], starts[k + 1]
+
+        if kind in ('update_card', 'delete_card'):
+            index = op['index']
+            if not 0 <= index < end - start:
+                raise IndexError(f"Card index {index} out of range for section {op['section']}")
+            position = start + index
+
+        # New cards as (key, display text) columns: terms, definitions
+        if kind == 'delete_section':
+            position, removed, columns = start, end - start, ((), (), (), ())
+        elif kind == 'add_card':
+            position, removed = end, 0
+            columns = self._edited_columns(None, op.get('term', ''), op.get('definition', ''))
+        elif kind == 'update_card':
+            columns = self._edited_columns(position, op.get('term'), op.get('definition'))
+            deck = self._replace(sections, starts, *self._spliced(position, 1, columns))
+            return deck, None, []
+        elif kind == 'delete_card':
+            removed, columns = 1, ((), (), (), ())
+        else:
+            raise ValueError(f"Unknown edit operation: {kind}")
+
+        added = len(columns[0])
+        for j in range(k + 1, len(starts)):
+            starts[j] += added - removed
+        if kind == 'delete_section':
+            del sections[k]
+            del starts[k]
+
+        deck = self._replace(sections, starts, *self._spliced(position, removed, columns))
+
+        mapping = array('i', range(position))
+        mapping.extend([-1] * removed)
+        mapping.extend(range(position + added, len(deck)))
+        return deck, mapping, list(range(position, position + added))
+
+    def _edited_columns(self, position, term, definition):
+        """
+        Normalize the text of an added or updated card; a field left as None
+        keeps the value of the card at position.
+        """
+        columns = []
+        for text, keys, displays in ((term, self.terms, self.display_terms),
+                                     (definition, self.definitions, self.display_definitions)):
+            if text is None:
+                columns += [(keys[position],), (displays[position],)]
+            else:
+                key = normalize_word(text)
+                columns += [(key,), (key if text == key else text,)]
+        return columns[0], columns[2], columns[1], columns[3]
+
+    def _spliced(self, position, removed, columns):
+        """
+        Replace removed cards at position with the given columns, in the
+        order terms, definitions, display_terms, display_definitions.
+        """
+        current = (self.terms, self.definitions, self.display_terms, self.display_definitions)
+        return [tuple(old[:position]) + new + tuple(old[position + removed:])
+                for old, new in zip(current, columns)]
+
+    def _replace(self, sections, starts, terms=None, definitions=None,
+                 display_terms=None, display_definitions=None):
+        if terms is None:
+            terms, definitions = self.terms, self.definitions
+            display_terms, display_definitions = self.display_terms, self.display_definitions
+        return Deck(self.title, self.path, self.format_version, sections, terms, definitions, starts,
+                    display_terms, display_definitions)
+
+    def diff(self, other):
+        """
+        Match the cards of this deck to those of a newer version of it.
+
+        Cards are matched by (section, term, occurrence of that term in the
+        section); a match with a new definition, or with new display text
+        for either side, counts as changed.
+
+        Args:
+            other (Deck): The newer version
+
+        Returns:
+            tuple: (mapping, added, changed) where mapping holds the new index
+                of each card (-1 if it is gone), added lists unmatched new
+                card indices and changed counts matched cards whose text changed
+        """
+        old_cards = {}
+        seen = {}
+        for section_name in self.sections:
+            for i in self.section_range(section_name):
+                key = (section_name, self.terms[i])
+                seen[key] = seen.get(key, 0) + 1
+                old_cards[key + (seen[key],)] = i
+
+        mapping = array('i', [-1]) * len(self)
+        added = []
+        changed = 0
+        seen = {}
+        for section_name in other.sections:
+            for j in other.section_range(section_name):
+                key = (section_name, other.terms[j])
+                seen[key] = seen.get(key, 0) + 1
+                i = old_cards.pop(key + (seen[key],), None)
+                if i is None:
+                    added.append(j)
+                    continue
+                mapping[i] = j
+                if (self.definitions[i] != other.definitions[j] or
+                        self.display_terms[i] != other.display_terms[j] or
+                        self.display_definitions[i] != other.display_definitions[j]):
+                    changed += 1
+        return mapping, added, changed
+
+
+class ChainedColumn:
+    """
+    Read-only sequence over the columns of several decks, one after
+    another, without copying them. Index i is found in its part by
+    bisection over the part offsets.
+    """
+
+    __slots__ = ('parts', 'offsets')
+
+    def __init__(self, parts):
+        """
+        Args:
+            parts (iterable): Sequences to chain, e.g. each deck's terms
+        """
+        self.parts = tuple(parts)
+        offsets = [0]
+        for part in self.parts:
+            offsets.append(offsets[-1] + len(part))
+        self.offsets = tuple(offsets)
+
+    def __len__(self):
+        return self.offsets[-1]
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.parts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("card index out of range")
+        k = bisect.bisect_right(self.offsets, index) - 1
+        return self.parts[k][index - self.offsets[k]]
+
+
+class UnionDeck(Deck):
+    """
+    Several decks studied as one, e.g. stages 5 through 8 together.
+
+    The union is a view: its columns chain the decks' own columns, so no
+    card is copied, and card i of the union is card i - offset of one of
+    its decks. Sections are namespaced by deck ('stage7/nouns'), and since
+    every deck keeps its sections contiguous, so does the union; sessions,
+    section toggles, shuffling and removal work on it unchanged.
+
+    A union is read-only; edit its decks one at a time.
+    """
+
+    __slots__ = ('parts', 'names', 'offsets')
+
+    def __init__(self, decks, names=None):
+        """
+        Args:
+            decks (iterable): Decks to combine, in study order
+            names (iterable, optional): Namespace of each deck's sections,
+                defaults to the deck's file name without extension
+        """
+        self.parts = tuple(decks)
+        self.names = self._namespaces(self.parts, names)
+        self.terms = ChainedColumn(deck.terms for deck in self.parts)
+        self.definitions = ChainedColumn(deck.definitions for deck in self.parts)
+        self.display_terms = ChainedColumn(deck.display_terms for deck in self.parts)
+        self.display_definitions = ChainedColumn(deck.display_definitions for deck in self.parts)
+        self.offsets = self.terms.offsets
+
+        sections = []
+        starts = []
+        for name, deck, offset in zip(self.names, self.parts, self.offsets):
+            sections.extend(f"{name}/{section_name}" for section_name in deck.sections)
+            starts.extend(offset + start for start in deck.section_starts[:-1])
+        starts.append(self.offsets[-1])
+
+        self.title = " + ".join(str(deck.title) for deck in self.parts)
+        self.path = None
+        self.format_version = max((deck.format_version for deck in self.parts), default='1.0')
+        self.sections = tuple(sections)
+        self.section_starts = tuple(starts)
+        self._section_index = {name: k for k, name in enumerate(self.sections)}
+        self._sort_orders = {}
+
+    @staticmethod
+    def _namespaces(decks, names):
+        if names is not None:
+            names = tuple(names)
+            if len(names) != len(decks) or len(set(names)) != len(names):
+                raise ValueError("Union decks need one unique name per deck")
+            return names
+
+        result = []
+        for k, deck in enumerate(decks):
+            base = os.path.splitext(os.path.basename(deck.path))[0] if deck.path else f"deck{k + 1}"
+            name, copy = base, 1
+            while name in result:
+                copy += 1
+                name = f"{base}-{copy}"
+            result.append(name)
+        return tuple(result)
+
+    @classmethod
+    def load(cls, file_paths, cache=None):
+        """
+        Load several .libdict files as one union deck.
+
+        Args:
+            file_paths (iterable): Paths to the .libdict files
+            cache (DeckCache, optional): Warm cache of parsed decks
+
+        Returns:
+            UnionDeck: The union
+        """
+        return cls([Deck.load(file_path, cache) for file_path in file_paths])
+
+    @property
+    def paths(self):
+        """tuple: Paths of the combined decks."""
+        return tuple(deck.path for deck in self.parts)
+
+    def locate(self, index):
+        """
+        Find which deck a card of the union comes from.
+
+        Args:
+            index (int): Card index in the union
+
+        Returns:
+            tuple: (position of the deck in parts, card index in that deck)
+        """
+        k = bisect.bisect_right(self.offsets, index) - 1
+        return k, index - self.offsets[k]
+
+    def apply_edit(self, op):
+        raise ValueError("A union of decks is read-only; edit its decks one at a time")
+
+
+class StudySession:
+    """
+    One learner's study state over a shared Deck.
+
+    A session only holds card indices and settings: the study order as an
+    array of deck card indices, the position in it, section toggles,
+    answer statistics and the random state. Creating one costs O(1) plus
+    the size of its view, and the deck is never copied. A session should be
+    used by one thread at a time; any number of sessions may share a deck.
+    """
+
+    def __init__(self, deck, remove_on_correct=False, adaptive=False, seed=None):
+        """
+        Args:
+            deck (Deck): The deck to study
+            remove_on_correct (bool): Drop cards from the view when answered right
+            adaptive (bool): Draw cards weighted by error rate instead of in order
+            seed (int, optional): Seed of the random number generator
+        """
+        self.deck = deck
+        self.active_sections = {name: True for name in deck.sections}
+        self.remove_on_correct = remove_on_correct
+        self.adaptive = adaptive
+        self.card_stats = {}  # Card index -> CardStats, drives the adaptive weights
+        self.view = array('I')  # Study order as deck card indices
+        self.current_index = 0  # Position in view
+        self._sampler = None  # FenwickTree over view positions when adaptive
+        self._history = []  # Card indices drawn in adaptive mode, for previous_card
+        self.analytics = None  # CardAnalytics collecting answer statistics, if enabled
+        self.rng = random.Random()
+        self.set_seed(seed)
+        self._apply_filters()
+
+    def set_seed(self, seed=None):
+        """
+        Seed the random number generator used for shuffling and adaptive draws,
+        so a session can be reproduced.
+
+        Args:
+            seed (int, optional): Seed to use; a fresh one is picked if omitted
+
+        Returns:
+            int: The seed in use
+        """
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng.seed(self.seed)
+        return self.seed
+
+    def set_adaptive(self, value, seed=None):
+        """
+        Enable or disable adaptive mode, where next_card draws cards with a
+        probability that grows with how often they were answered wrong.
+
+        Args:
+            value (bool): True to enable, False to disable
+            seed (int, optional): Reseed the random number generator
+        """
+        self.adaptive = value
+        if seed is not None:
+            self.set_seed(seed)
+        self._history = []
+        self._rebuild_sampler()
+
+    def _card_weight(self, index):
+        stats = self.card_stats.get(index)
+        return stats.weight if stats else CardStats().weight
+
+    def _rebuild_sampler(self):
+        """
+        Rebuild the adaptive sampler after the view was reordered or rebuilt.
+        """
+        if self.adaptive:
+            self._sampler = FenwickTree(map(self._card_weight, self.view))
+        else:
+            self._sampler = None
+
+    def _apply_filters(self):
+        """
+        Rebuild the view from the active sections, in deck order.
+        """
+        view = array('I')
+        for section_name in self.deck.sections:
+            if self.active_sections.get(section_name, True):
+                view.extend(self.deck.section_range(section_name))
+        self.view = view
+
+        # Reset the current index if needed
+        if view:
+            self.current_index = min(self.current_index, len(view) - 1)
+        else:
+            self.current_index = 0
+
+        self._history = []
+        self._rebuild_sampler()
+
+    def toggle_section(self, section_name):
+        """
+        Toggle a section on/off for study.
+
+        Args:
+            section_name (str): Name of the section to toggle
+
+        Returns:
+            bool: New state of the section (True if active)
+        """
+        if section_name in self.active_sections:
+            self.active_sections[section_name] = not self.active_sections[section_name]
+            self._apply_filters()
+            return self.active_sections[section_name]
+        return False
+
+    def jump_to(self, index):
+        """
+        Make a card the current one.
+
+        Args:
+            index (int): Deck index of the card
+
+        Returns:
+            bool: True if the card is in the view, False if it was filtered
+                out or removed
+        """
+        try:
+            position = self.view.index(index)
+        except ValueError:
+            return False
+
+        if self._sampler is not None and self.view:
+            self._history.append(self.view[self.current_index])
+            del self._history[:-100]
+        self.current_index = position
+        return True
+
+    def current_card_index(self):
+        """
+        Get the deck index of the current card.
+
+        Returns:
+            int: Card index, or None if the view is empty
+        """
+        return self.view[self.current_index] if self.view else None
+
+    def get_current_card(self):
+        """
+        Get the current flashcard.
+
+        Returns:
+            dict: Current flashcard data or None if no cards
+        """
+        if not self.view:
+            return None
+        return self.deck.card(self.view[self.current_index])
+
+    def next_card(self):
+        """
+        Move to the next flashcard.
+
+        Returns:
+            dict: New current flashcard or None if no cards
+        """
+        if not self.view:
+            return None
+
+        if self._sampler is not None:
+            return self._draw_card()
+
+        self.current_index = (self.current_index + 1) % len(self.view)
+        return self.get_current_card()
+
+    def _draw_card(self):
+        """
+        Draw the next card by adaptive weight, avoiding an immediate repeat when possible.
+
+        Returns:
+            dict: New current flashcard or None if no cards
+        """
+        position = None
+        for _ in range(3):
+            position = self._sampler.sample(self.rng)
+            if position != self.current_index or len(self.view) == 1:
+                break
+        if position is None:
+            return None
+
+        self._history.append(self.view[self.current_index])
+        del self._history[:-100]
+        self.current_index = position
+        return self.get_current_card()
+
+    def previous_card(self):
+        """
+        Move to the previous flashcard.
+
+        Returns:
+            dict: New current flashcard or None if no cards
+        """
+        if not self.view:
+            return None
+
+        if self._sampler is not None:
+            # Step back through the drawn cards that are still in the view
+            while self._history:
+                index = self._history.pop()
+                try:
+                    self.current_index = self.view.index(index)
+                except ValueError:
+                    continue
+                return self.get_current_card()
+            return self.get_current_card()
+
+        self.current_index = (self.current_index - 1) % len(self.view)
+        return self.get_current_card()
+
+    def shuffle_cards(self):
+        """
+        Shuffle the study order.
+        """
+        if self.view:
+            self.rng.shuffle(self.view)
+            self.current_index = 0
+            self._history = []
+            self._rebuild_sampler()
+
+    def remove_current_card(self):
+        """
+        Remove the current card from the view and update the index.
+        """
+        if not self.view:
+            return
+
+        if self._sampler is not None:
+            # Order does not matter when drawing by weight, so move the last
+            # card into the hole and keep the sampler update O(log n)
+            last = len(self.view) - 1
+            if self.current_index != last:
+                self.view[self.current_index] = self.view[last]
+                self._sampler.set(self.current_index, self._sampler.weights[last])
+            self.view.pop()
+            self._sampler.pop()
+        else:
+            del self.view[self.current_index]
+
+        if self.current_index >= len(self.view):
+            self.current_index = max(0, len(self.view) - 1)
+
+    def record_answer(self, correct, latency=None):
+        """
+        Record an answer to the current card and update its adaptive weight.
+
+        Args:
+            correct (bool): Whether the answer was right
+            latency (float, optional): Seconds taken to answer, for analytics
+        """
+        if not self.view:
+            return
+
+        index = self.view[self.current_index]
+        stats = self.card_stats.setdefault(index, CardStats())
+        stats.record(correct)
+        if self._sampler is not None:
+            self._sampler.set(self.current_index, stats.weight)
+        if self.analytics is not None:
+            self.analytics.record(index, correct, latency)
+
+    def check_answer(self, user_input, latency=None):
+        """
+        Check an answer against the current card's term or definition and record the result.
+
+        Args:
+            user_input (str): The text entered by the user
+            latency (float, optional): Seconds taken to answer, for analytics
+
+        Returns:
+            bool: True if the answer is correct
+        """
+        if not self.view:
+            return False
+
+        index = self.view[self.current_index]
+        correct = normalize_word(user_input) in (self.deck.terms[index], self.deck.definitions[index])
+        self.record_answer(correct, latency)
+        return correct
+
+    def choices(self, count=4, pool=16):
+        """
+        Get multiple-choice options for the current card: its own
+        definition plus distractors from cards of the same section with a
+        similar definition length.
+
+        Distractors are drawn from the pool cards nearest in length, so a
+        question costs O(pool) however large the deck is. Sections with too
+        few cards borrow from the neighbouring ones.
+
+        Args:
+            count (int): Number of options, including the right one
+            pool (int): How many cards of similar length to draw from
+
+        Returns:
+            list: Card indices of the options in random order, empty if no cards
+        """
+        if not self.view:
+            return []
+
+        index = self.view[self.current_index]
+        order, rank = self.deck.length_order()
+        k = bisect.bisect_right(self.deck.section_starts, index) - 1
+        start, stop = self.deck.section_starts[k], self.deck.section_starts[k + 1]
+        if stop - start < count:
+            start, stop = 0, len(order)
+
+        # Window of up to pool other cards around this card in length order
+        position = rank[index]
+        width = min(max(pool, count - 1), stop - start - 1)
+        low = max(start, min(position - width // 2, stop - width - 1))
+
+        options = [index]
+        seen = {self.deck.definitions[index]}
+        for offset in self.rng.sample(range(width), width):
+            candidate = low + offset
+            if candidate >= position:
+                candidate += 1  # Skip the card itself
+            definition = self.deck.definitions[order[candidate]]
+            if definition not in seen:
+                seen.add(definition)
+                options.append(order[candidate])
+                if len(options) == count:
+                    break
+
+        self.rng.shuffle(options)
+        return options
+
+    def check_choice(self, choice, latency=None):
+        """
+        Check a multiple-choice answer and record the result.
+
+        Args:
+            choice (int): Card index of the chosen option
+            latency (float, optional): Seconds taken to answer, for analytics
+
+        Returns:
+            bool: True if the option has the current card's definition
+        """
+        if not self.view:
+            return False
+
+        index = self.view[self.current_index]
+        correct = self.deck.definitions[choice] == self.deck.definitions[index]
+        self.record_answer(correct, latency)
+        return correct
+
+    def rebind(self, deck, mapping=None, added=()):
+        """
+        Move the session onto a new version of its deck, keeping the study
+        order, position and statistics of the cards that still exist.
+
+        Args:
+            deck (Deck): The new deck
+            mapping (array, optional): New card index by old card index, -1
+                for removed cards; None if indices are unchanged
+            added (iterable): Indices of new cards, appended to the view if
+                their section is active
+        """
+        current = self.current_card_index()
+        resample = mapping is not None
+        if mapping is not None:
+            self.view = array('I', [i for i in map(mapping.__getitem__, self.view) if i >= 0])
+            self.card_stats = {mapping[i]: stats for i, stats in self.card_stats.items() if mapping[i] >= 0}
+            self._history = [mapping[i] for i in self._history if mapping[i] >= 0]
+            if current is not None:
+                current = mapping[current]
+
+        self.deck = deck
+        self.active_sections = {name: self.active_sections.get(name, True) for name in deck.sections}
+        for index in added:
+            if self.active_sections[deck.section_of(index)]:
+                self.view.append(index)
+                if self._sampler is not None and not resample:
+                    self._sampler.append(self._card_weight(index))
+
+        if self.analytics is not None:
+            self.analytics.remap(deck, mapping)
+
+        if current is not None and current >= 0:
+            self.current_index = self.view.index(current)
+        self.current_index = min(self.current_index, max(0, len(self.view) - 1))
+        if resample:
+            self._rebuild_sampler()
+
+    # --- Snapshots ---
+
+    def save(self, path=None):
+        """
+        Save the session so it can be resumed later: the card order,
+        removed cards, current position, settings and random state.
+
+        The order is stored as a packed array of card indices and removed
+        cards as a bitmap. The order is left out when it is the deck's
+        natural order, so unshuffled sessions only cost a bit per card.
+
+        Args:
+            path (str, optional): Snapshot path, defaults to next to the deck
+
+        Returns:
+            str: Path to the snapshot
+        """
+        deck = self.deck
+        path = path or snapshot_path(deck.path)
+        count = len(deck)
+        active = [i for name in deck.sections if self.active_sections.get(name, True)
+                  for i in deck.section_range(name)]
+
+        # Cards of active sections missing from the view were removed
+        in_view = pack_bits(self.view, count)
+        removed = pack_bits((i for i in active if not bit_is_set(in_view, i)), count)
+
+        arrays = {'removed': removed}
+        if self.view.tolist() != [i for i in active if not bit_is_set(removed, i)]:
+            arrays['order'] = self.view
+
+        rng_version, rng_words, rng_gauss = self.rng.getstate()
+        arrays['rng'] = array('I', rng_words)
+
+        if self.card_stats:
+            # Answer counts are stored sparsely, only for cards answered so far
+            answered = array('I', sorted(self.card_stats))
+            arrays.update(answered=answered,
+                          attempts=array('I', (self.card_stats[i].attempts for i in answered)),
+                          misses=array('I', (self.card_stats[i].misses for i in answered)))
+
+        header = {
+            'deck_hash': deck_hash(deck.path),
+            'card_count': count,
+            'current_index': self.current_index,
+            'active_sections': self.active_sections,
+            'remove_on_correct': self.remove_on_correct,
+            'adaptive': self.adaptive,
+            'seed': self.seed,
+            'rng_version': rng_version,
+            'rng_gauss': rng_gauss
+        }
+        return write_snapshot(path, header, arrays)
+
+    def restore(self, path=None):
+        """
+        Restore a session saved by save().
+
+        The snapshot only applies to the exact deck content it was saved
+        from; a snapshot of an older version of the deck is rejected.
+
+        Args:
+            path (str, optional): Snapshot path, defaults to next to the deck
+
+        Returns:
+            bool: True if the session was restored, False otherwise
+        """
+        deck = self.deck
+        path = path or snapshot_path(deck.path)
+        try:
+            header, arrays = read_snapshot(path)
+            count = len(deck)
+            if header['card_count'] != count or header['deck_hash'] != deck_hash(deck.path):
+                print("Session snapshot does not match the loaded deck")
+                return False
+
+            for section_name, active in header['active_sections'].items():
+                if section_name in self.active_sections:
+                    self.active_sections[section_name] = active
+
+            if 'order' in arrays:
+                order = arrays['order']
+                if order and max(order) >= count:
+                    raise ValueError("Card index out of range")
+                self.view = array('I', order)
+            else:
+                removed = arrays['removed']
+                self.view = array('I', [i for name in deck.sections if self.active_sections.get(name, True)
+                                        for i in deck.section_range(name) if not bit_is_set(removed, i)])
+
+            self.card_stats = {}
+            if 'answered' in arrays:
+                for i, attempts, misses in zip(arrays['answered'], arrays['attempts'], arrays['misses']):
+                    if i >= count:
+                        raise ValueError("Card index out of range")
+                    stats = self.card_stats[i] = CardStats()
+                    stats.attempts = attempts
+                    stats.misses = misses
+
+            self.seed = header['seed']
+            self.rng.setstate((header['rng_version'], tuple(arrays['rng']), header['rng_gauss']))
+            self.remove_on_correct = header['remove_on_correct']
+            self.adaptive = header['adaptive']
+            self.current_index = min(header['current_index'], max(0, len(self.view) - 1))
+            self._history = []
+            self._rebuild_sampler()
+            return True
+
+        except Exception as e:
+            print(f"Error resuming session: {str(e)}")
+            return False
@@ -0,0 +1,176 @@
+import hashlib
+import marshal
+import os
+import struct
+import sys
+from libdict_io import atomic_write, deck_hash, journal_path
+
+# Bump when the cached card layout or the normalization of terms changes
+CACHE_VERSION = 2
+
+_MAGIC = b'LDCACHE1'
+_META_LENGTH = struct.Struct('<I')
+
+
+def default_cache_dir():
+    """
+    Get the per-user directory for cached decks.
+
+    Returns:
+        str: Path to the cache directory
+    """
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'libdict')
+
+
+class DeckCache:
+    """
+    Persistent cache of parsed, normalized decks.
+
+    Each entry holds a deck's card columns (section names, normalized terms
+    and definitions, section index per card) serialized with marshal, which
+    loads far faster than json plus a regex pass per card. Entries are
+    validated against the deck's path, size, modification time and content
+    hash, and the least recently used ones are evicted once the cache grows
+    past max_bytes.
+
+    Describe a deck with describe() before parsing it and pass that to put(),
+    so an entry is never stored under a newer version of the file than the
+    one that was parsed.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=256 * 1024 * 1024):
+        """
+        Args:
+            cache_dir (str, optional): Where to keep entries, defaults to
+                the per-user cache directory
+            max_bytes (int): Size limit of all entries together
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, file_path):
+        key = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + '.cache')
+
+    def _fingerprint(self, file_path):
+        stat = os.stat(file_path)
+        journal = journal_path(file_path)
+        journal_stat = os.stat(journal) if os.path.exists(journal) else None
+        return {
+            'path': os.path.abspath(file_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'journal': [journal_stat.st_size, journal_stat.st_mtime_ns] if journal_stat else None,
+            'python': list(sys.version_info[:2]),
+            'version': CACHE_VERSION
+        }
+
+    def describe(self, file_path):
+        """
+        Take the fingerprint and content hash an entry is validated against.
+
+        Args:
+            file_path (str): Path to the .libdict file
+
+        Returns:
+            dict: Description to pass to get() and put()
+        """
+        return {'fingerprint': self._fingerprint(file_path), 'hash': deck_hash(file_path)}
+
+    def get(self, file_path, meta=None):
+        """
+        Look up the cached columns of a deck.
+
+        Args:
+            file_path (str): Path to the .libdict file
+            meta (dict, optional): describe() of the file, taken now if omitted
+
+        Returns:
+            dict: The entry stored by put(), or None on a miss or stale entry
+        """
+        entry_path = self._entry_path(file_path)
+        try:
+            with open(entry_path, 'rb') as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    return None
+                (length,) = _META_LENGTH.unpack(f.read(_META_LENGTH.size))
+                stored = marshal.loads(f.read(length))
+                if meta is not None:
+                    if stored != meta:
+                        return None
+                # Cheap checks first; hash the deck only when they pass
+                elif stored['fingerprint'] != self._fingerprint(file_path):
+                    return None
+                elif stored['hash'] != deck_hash(file_path):
+                    return None
+                # marshal.loads on one buffer is much faster than marshal.load on a file
+                entry = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError, KeyError, struct.error):
+            return None
+
+        try:
+            os.utime(entry_path)  # Mark as recently used for eviction
+        except OSError:
+            pass
+        return entry
+
+    def put(self, file_path, entry, meta):
+        """
+        Store the columns of a deck, evicting old entries if needed.
+
+        Args:
+            file_path (str): Path to the .libdict file
+            entry (dict): Values marshal can serialize (str, list, bytes...)
+            meta (dict): describe() of the file, taken before it was parsed
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with atomic_write(self._entry_path(file_path), binary=True) as f:
+                encoded_meta = marshal.dumps(meta)
+                f.write(_MAGIC)
+                f.write(_META_LENGTH.pack(len(encoded_meta)))
+                f.write(encoded_meta)
+                f.write(marshal.dumps(entry))
+            self.evict()
+        except (OSError, ValueError) as e:
+            print(f"Error writing deck cache: {str(e)}")
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        try:
+            names = [name for name in os.listdir(self.cache_dir) if name.endswith('.cache')]
+        except OSError:
+            return
+
+        entries = []
+        total = 0
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Delete every cache entry."""
+        max_bytes, self.max_bytes = self.max_bytes, -1
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = max_bytes
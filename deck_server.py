@@ -0,0 +1,303 @@
+import asyncio
+import json
+import os
+import secrets
+import time
+from urllib.parse import urlsplit
+from deck import Deck, StudySession
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+_REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    """Error answered to the client with an HTTP status and a JSON message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class DeckServer:
+    """
+    Local HTTP/JSON server that loads each deck once and serves many
+    concurrent study sessions over it.
+
+    Every session is a StudySession over the shared, immutable Deck, so a
+    session only costs its own array of card indices and a few flags. All
+    requests run on one asyncio event loop; deck loading happens in a
+    worker thread so it never stalls other sessions.
+
+    Endpoints (JSON in, JSON out):
+        GET    /decks                      Loaded and available decks
+        POST   /sessions                   {"deck", "remove_on_correct", "adaptive", "seed"}
+        GET    /sessions/<id>              Current card and deck info
+        POST   /sessions/<id>/next         Move to the next card
+        POST   /sessions/<id>/previous     Move to the previous card
+        POST   /sessions/<id>/shuffle      Shuffle the session's cards
+        POST   /sessions/<id>/check        {"answer"}; advances when correct
+        DELETE /sessions/<id>              End the session
+    """
+
+    MAX_BODY = 64 * 1024
+
+    def __init__(self, deck_dir='.', session_timeout=4 * 3600):
+        """
+        Args:
+            deck_dir (str): Directory .libdict files are served from
+            session_timeout (int): Seconds of inactivity before a session is dropped
+        """
+        self.deck_dir = os.path.abspath(deck_dir)
+        self.session_timeout = session_timeout
+        self.decks = {}  # Deck name -> Deck
+        self._stamps = {}  # Deck name -> (size, mtime) of the file it was loaded from
+        self.sessions = {}  # Session id -> [StudySession, last used time]
+        self._loading = {}  # Deck name -> asyncio.Lock while loading
+
+    # --- Decks and sessions ---
+
+    def _deck_path(self, name):
+        if not name or os.path.basename(name) != name:
+            raise HTTPError(400, "Deck must be a file name inside the deck directory")
+        if not name.endswith('.libdict'):
+            name += '.libdict'
+        path = os.path.join(self.deck_dir, name)
+        if not os.path.isfile(path):
+            raise HTTPError(404, f"Deck not found: {name}")
+        return name, path
+
+    def _stamp(self, name, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            raise HTTPError(404, f"Deck not found: {name}")
+        return stat.st_size, stat.st_mtime_ns
+
+    async def get_deck(self, name):
+        """
+        Get a loaded deck, loading it on first use and again whenever its
+        file has changed. Sessions already running keep the deck they
+        started with; new sessions get the new one.
+
+        Args:
+            name (str): Deck file name inside the deck directory
+
+        Returns:
+            Deck: The loaded deck
+        """
+        name, path = self._deck_path(name)
+        if name in self.decks and self._stamps[name] == self._stamp(name, path):
+            return self.decks[name]
+
+        lock = self._loading.setdefault(name, asyncio.Lock())
+        async with lock:
+            # Stamp before loading, so a write during the load triggers another
+            stamp = self._stamp(name, path)
+            if name not in self.decks or self._stamps[name] != stamp:
+                loop = asyncio.get_running_loop()
+                try:
+                    deck = await loop.run_in_executor(None, Deck.load, path)
+                except Exception as e:
+                    raise HTTPError(500, f"Failed to load deck {name}: {str(e)}")
+                if name in self.decks:
+                    print(f"Reloaded changed deck {name}")
+                self.decks[name] = deck
+                self._stamps[name] = stamp
+        return self.decks[name]
+
+    def _session(self, session_id):
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            raise HTTPError(404, "Unknown session")
+        entry[1] = time.monotonic()
+        return entry[0]
+
+    def expire_sessions(self):
+        """Drop sessions idle for longer than session_timeout."""
+        cutoff = time.monotonic() - self.session_timeout
+        for session_id in [sid for sid, (_, used) in self.sessions.items() if used < cutoff]:
+            del self.sessions[session_id]
+
+    def _state(self, session_id, session):
+        return {
+            'session': session_id,
+            'deck': session.deck.title,
+            'card_count': len(session.view),
+            'position': session.current_index,
+            'card': session.get_current_card()
+        }
+
+    # --- Request handling ---
+
+    async def handle(self, method, path, body):
+        """
+        Route one request.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+            body (dict): Decoded JSON body ({} if none)
+
+        Returns:
+            tuple: (status, JSON-serializable response)
+        """
+        parts = [part for part in urlsplit(path).path.split('/') if part]
+
+        if parts == ['decks'] and method == 'GET':
+            available = sorted(name for name in os.listdir(self.deck_dir) if name.endswith('.libdict'))
+            return 200, {'loaded': sorted(self.decks), 'available': available}
+
+        if parts == ['sessions'] and method == 'POST':
+            deck = await self.get_deck(body.get('deck', ''))
+            seed = body.get('seed')
+            if seed is not None and not isinstance(seed, int):
+                raise HTTPError(400, "'seed' must be an integer")
+            session = StudySession(deck, bool(body.get('remove_on_correct', False)),
+                                   bool(body.get('adaptive', False)), seed)
+
+            session_id = secrets.token_urlsafe(9)
+            self.sessions[session_id] = [session, time.monotonic()]
+            return 201, self._state(session_id, session)
+
+        if len(parts) in (2, 3) and parts[0] == 'sessions':
+            session_id = parts[1]
+            session = self._session(session_id)
+            action = parts[2] if len(parts) == 3 else None
+
+            if action is None:
+                if method == 'GET':
+                    return 200, self._state(session_id, session)
+                if method == 'DELETE':
+                    del self.sessions[session_id]
+                    return 200, {'session': session_id, 'deleted': True}
+                raise HTTPError(405, "Use GET or DELETE on a session")
+
+            if method != 'POST':
+                raise HTTPError(405, "Session actions use POST")
+            if action == 'next':
+                session.next_card()
+            elif action == 'previous':
+                session.previous_card()
+            elif action == 'shuffle':
+                session.shuffle_cards()
+            elif action == 'check':
+                answer = body.get('answer')
+                if not isinstance(answer, str):
+                    raise HTTPError(400, "Missing 'answer'")
+                correct = session.check_answer(answer)
+                if correct:
+                    if session.remove_on_correct:
+                        session.remove_current_card()
+                    session.next_card()
+                return 200, dict(self._state(session_id, session), correct=correct)
+            else:
+                raise HTTPError(404, f"Unknown action: {action}")
+            return 200, self._state(session_id, session)
+
+        raise HTTPError(404, "Not found")
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, path, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    key, _, value = line.partition(':')
+                    if key:
+                        headers[key.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                try:
+                    try:
+                        length = int(headers.get('content-length', 0))
+                    except ValueError:
+                        length = -1
+                    # An unread body leaves the stream mid-request, so close afterwards
+                    if length < 0:
+                        keep_alive = False
+                        raise HTTPError(400, "Invalid Content-Length")
+                    if length > self.MAX_BODY:
+                        keep_alive = False
+                        raise HTTPError(413, "Request body too large")
+                    raw = await reader.readexactly(length) if length else b''
+                    try:
+                        body = json.loads(raw) if raw else {}
+                    except ValueError:
+                        raise HTTPError(400, "Body must be JSON")
+                    if not isinstance(body, dict):
+                        raise HTTPError(400, "Body must be a JSON object")
+                    status, payload = await self.handle(method.upper(), path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': e.message}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def _expire_periodically(self):
+        while True:
+            await asyncio.sleep(min(60, self.session_timeout))
+            self.expire_sessions()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, preload=()):
+        """
+        Run the server until cancelled.
+
+        Args:
+            host (str): Interface to bind, localhost by default
+            port (int): TCP port
+            preload (iterable): Deck names to load before accepting requests
+        """
+        for name in preload:
+            await self.get_deck(name)
+
+        server = await asyncio.start_server(self._serve_connection, host, port, backlog=1024)
+        expiry = asyncio.ensure_future(self._expire_periodically())
+        print(f"Serving decks from {self.deck_dir} on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            expiry.cancel()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Serve .libdict decks to many study sessions.")
+    arg_parser.add_argument('--deck-dir', default='.', help="Directory containing .libdict files")
+    arg_parser.add_argument('--host', default=DEFAULT_HOST)
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument('--preload', action='append', default=[],
+                            help="Deck to load at startup (repeatable)")
+    args = arg_parser.parse_args()
+
+    try:
+        asyncio.run(DeckServer(args.deck_dir).serve(args.host, args.port, args.preload))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,177 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from libdict_io import journal_path
+
+
+class DeckWatcher:
+    """
+    Base class for deck file watchers.
+
+    A watcher covers a deck and its edit journal. poll() never blocks, so
+    it can be called from the Tk event loop with root.after().
+    """
+
+    name = None
+
+    def __init__(self, deck_path):
+        self.deck_path = deck_path
+        self.paths = (deck_path, journal_path(deck_path))
+
+    @classmethod
+    def is_available(cls):
+        """
+        Check whether the watcher works on this platform.
+
+        Returns:
+            bool: True if the watcher can be used
+        """
+        return True
+
+    def poll(self):
+        """
+        Check for changes since the last poll.
+
+        Returns:
+            bool: True if the deck or its journal changed
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the watcher."""
+
+
+class PollingWatcher(DeckWatcher):
+    """Detects changes by comparing modification time and size on each poll."""
+
+    name = 'polling'
+
+    def __init__(self, deck_path):
+        super().__init__(deck_path)
+        self._state = self._stat()
+
+    def _stat(self):
+        state = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                state.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                state.append(None)
+        return state
+
+    def poll(self):
+        state = self._stat()
+        changed = state != self._state
+        self._state = state
+        return changed
+
+
+class InotifyWatcher(DeckWatcher):
+    """
+    Detects changes through Linux inotify, called through ctypes so no
+    extra package is needed. Watches the deck's directory rather than the
+    file, since atomic saves replace the file with a renamed one.
+    """
+
+    name = 'inotify'
+
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOSE_WRITE = 0x008
+    _IN_MOVED_FROM = 0x040
+    _IN_MOVED_TO = 0x080
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _EVENT = struct.Struct('iIII')
+    _libc = None
+
+    @classmethod
+    def _load_libc(cls):
+        if cls._libc is None:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            cls._libc = libc
+        return cls._libc
+
+    @classmethod
+    def is_available(cls):
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            return hasattr(cls._load_libc(), 'inotify_init1')
+        except OSError:
+            return False
+
+    def __init__(self, deck_path):
+        super().__init__(deck_path)
+        libc = self._load_libc()
+        self._names = {os.fsencode(os.path.basename(path)) for path in self.paths}
+
+        self._fd = libc.inotify_init1(self._IN_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        directory = os.path.dirname(os.path.abspath(deck_path))
+        mask = (self._IN_CLOSE_WRITE | self._IN_MOVED_FROM | self._IN_MOVED_TO |
+                self._IN_CREATE | self._IN_DELETE)
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"Cannot watch {directory}")
+
+    def poll(self):
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if name in self._names:
+                    changed = True
+        return changed
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+WATCHERS = {watcher.name: watcher for watcher in (InotifyWatcher, PollingWatcher)}
+
+
+def create_watcher(deck_path, backend=None):
+    """
+    Create a watcher for a deck file.
+
+    Args:
+        deck_path (str): Path to the .libdict file
+        backend (str, optional): 'inotify' or 'polling'; by default inotify
+            is used where available, falling back to polling
+
+    Returns:
+        DeckWatcher: The watcher
+    """
+    if backend is not None:
+        if backend not in WATCHERS:
+            raise ValueError(f"Unknown watcher backend '{backend}'. Choose from: {', '.join(WATCHERS)}")
+        return WATCHERS[backend](deck_path)
+
+    for watcher in WATCHERS.values():
+        if watcher.is_available():
+            try:
+                return watcher(deck_path)
+            except OSError:
+                continue
+    return PollingWatcher(deck_path)
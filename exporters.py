@@ -0,0 +1,136 @@
+import csv
+import re
+from libdict_io import atomic_write, iter_libdict
+
+EXPORT_FORMATS = ('csv', 'tsv', 'anki')
+
+
+def _section_tag(section, tag_map):
+    """
+    Turn a section name into an Anki tag (tags cannot contain spaces).
+
+    Args:
+        section (str): Section name
+        tag_map (dict, optional): Section name -> tag overrides
+
+    Returns:
+        str: The tag
+    """
+    tag = tag_map.get(section, section) if tag_map else section
+    return re.sub(r'\s+', '_', tag.strip())
+
+
+def export_cards(cards, output_path, file_format='csv', tag_map=None, header=True):
+    """
+    Write (section, term, definition) tuples to a CSV, TSV or Anki text file.
+
+    Cards are written as they are produced, so memory use stays constant.
+    Anki files carry "#separator", "#html" and "#tags column" header lines
+    and use each card's section, mapped through tag_map, as its tag.
+
+    Args:
+        cards (iterable): (section, term, definition) tuples
+        output_path (str): Path of the file to write
+        file_format (str): 'csv', 'tsv' or 'anki'
+        tag_map (dict, optional): Section name -> tag/section label overrides
+        header (bool): Write a column header row (CSV/TSV only)
+
+    Returns:
+        str: Path to the written file
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{file_format}'. Choose from: {', '.join(EXPORT_FORMATS)}")
+
+    count = 0
+    try:
+        with atomic_write(output_path, newline='') as f:
+            if file_format == 'anki':
+                f.write('#separator:tab\n#html:false\n#tags column:3\n')
+                writer = csv.writer(f, delimiter='\t', lineterminator='\n')
+            else:
+                writer = csv.writer(f, delimiter=',' if file_format == 'csv' else '\t')
+                if header:
+                    writer.writerow(['term', 'definition', 'section'])
+
+            for section, term, definition in cards:
+                if file_format == 'anki':
+                    label = _section_tag(section, tag_map)
+                else:
+                    label = tag_map.get(section, section) if tag_map else section
+                writer.writerow([term, definition, label])
+                count += 1
+    except OSError as e:
+        raise Exception(f"Error exporting cards: {str(e)}")
+
+    print(f"Exported {count} cards to {output_path}")
+    return output_path
+
+
+def iter_deck_cards(manager, active_only=True):
+    """
+    Iterate over the cards of a loaded deck without copying them.
+
+    Args:
+        manager (FlashcardManager): Manager with a loaded deck
+        active_only (bool): Skip cards of sections toggled off for study
+
+    Yields:
+        tuple: (section, term, definition)
+    """
+    deck = manager.session.deck
+    for section_name in deck.sections:
+        if active_only and not manager.active_sections.get(section_name, True):
+            continue
+        for i in deck.section_range(section_name):
+            yield section_name, deck.display_terms[i], deck.display_definitions[i]
+
+
+def iter_file_cards(file_path, sections=None):
+    """
+    Stream the cards of a .libdict file without building a deck.
+
+    Args:
+        file_path (str): Path to the .libdict file
+        sections (iterable, optional): Only yield cards of these sections
+
+    Yields:
+        tuple: (section, term, definition)
+    """
+    wanted = set(sections) if sections is not None else None
+    for section, item in iter_libdict(file_path):
+        if wanted is None or section in wanted:
+            yield section, item.get('term', ''), item.get('definition', '')
+
+
+def export_deck(manager, output_path, file_format='csv', active_only=True, tag_map=None):
+    """
+    Export the deck loaded in a FlashcardManager.
+
+    Args:
+        manager (FlashcardManager): Manager with a loaded deck
+        output_path (str): Path of the file to write
+        file_format (str): 'csv', 'tsv' or 'anki'
+        active_only (bool): Only export sections toggled on for study
+        tag_map (dict, optional): Section name -> tag/section label overrides
+
+    Returns:
+        str: Path to the written file
+    """
+    return export_cards(iter_deck_cards(manager, active_only), output_path, file_format, tag_map)
+
+
+def export_libdict(file_path, output_path, file_format='csv', sections=None, tag_map=None):
+    """
+    Export a .libdict file by streaming it, never loading the whole deck.
+
+    Args:
+        file_path (str): Path to the .libdict file
+        output_path (str): Path of the file to write
+        file_format (str): 'csv', 'tsv' or 'anki'
+        sections (iterable, optional): Only export these sections
+        tag_map (dict, optional): Section name -> tag/section label overrides
+
+    Returns:
+        str: Path to the written file
+    """
+    return export_cards(iter_file_cards(file_path, sections), output_path, file_format, tag_map)
@@ -1,12 +1,16 @@
-import json
 import os
-import random
-import re
+from array import array
+from libdict_io import DeckJournal, write_libdict, compact_libdict
+from deck import Deck, UnionDeck, StudySession, normalize_word
 
 class FlashcardManager:
     """
     Manages flashcard data, loading and saving .libdict files,
     and handling flashcard navigation.
+    
+    The loaded cards live in an immutable Deck and the study state in a
+    StudySession over it; the manager ties the two together with the
+    deck's edit journal. fork() adds more sessions over the same deck.
     """
     
     def _normalize_word(self, word):
@@ -19,16 +23,64 @@ class FlashcardManager:
         Returns:
             str: The normalized word.
         """
-        return re.sub(r'\s*\(.*?\)', '', word).strip().lower()
+        return normalize_word(word)
 
-    def __init__(self):
-        self.current_deck = None
-        self.current_index = 0
-        self.cards = []
-        self.filtered_cards = []
-        self.active_sections = {}  # Track which sections are active for study
-        self.remove_on_correct = False  # New setting to remove cards on correct answer
+    def __init__(self, cache=None):
+        """
+        Args:
+            cache (DeckCache, optional): Warm cache of parsed decks used to
+                skip JSON parsing and normalization on reload
+        """
+        self.cache = cache
+        self.deck = None  # Loaded Deck, shared with forks
+        self.session = StudySession(Deck.empty())  # Study state over the deck
+        self.journal = None  # Edit journal of the loaded deck
+        self.compact_threshold = 500  # Journaled edits before folding them into the deck
+        self.multiple_choice = False  # Build the length index of each deck as it loads
 
+    # Study state lives in the session; these keep the manager's attributes working
+    
+    @property
+    def current_deck(self):
+        """dict: 'title', 'path' and 'format_version' of the loaded deck, or None."""
+        if self.deck is None:
+            return None
+        return {'title': self.deck.title, 'path': self.deck.path, 'format_version': self.deck.format_version}
+    
+    @property
+    def current_index(self):
+        """int: Position of the current card in the study order."""
+        return self.session.current_index
+    
+    @current_index.setter
+    def current_index(self, value):
+        self.session.current_index = value
+    
+    @property
+    def active_sections(self):
+        """dict: Section name -> whether it is active for study."""
+        return self.session.active_sections
+    
+    @property
+    def remove_on_correct(self):
+        """bool: Whether cards are removed when answered correctly."""
+        return self.session.remove_on_correct
+    
+    @property
+    def adaptive(self):
+        """bool: Whether cards are drawn by adaptive weight."""
+        return self.session.adaptive
+    
+    @property
+    def seed(self):
+        """int: Seed of the session's random number generator."""
+        return self.session.seed
+    
+    @property
+    def analytics(self):
+        """CardAnalytics: Answer statistics of the session, or None if not collected."""
+        return self.session.analytics
+    
     def set_remove_on_correct(self, value):
         """
         Enable or disable removing cards on correct answer.
@@ -36,16 +88,114 @@ class FlashcardManager:
         Args:
             value (bool): True to enable, False to disable
         """
-        self.remove_on_correct = value
+        self.session.remove_on_correct = value
+
+    def set_seed(self, seed=None):
+        """
+        Seed the random number generator used for shuffling and adaptive draws,
+        so a session can be reproduced.
+        
+        Args:
+            seed (int, optional): Seed to use; a fresh one is picked if omitted
+            
+        Returns:
+            int: The seed in use
+        """
+        return self.session.set_seed(seed)
+
+    def set_adaptive(self, value, seed=None):
+        """
+        Enable or disable adaptive mode, where next_card draws cards with a
+        probability that grows with how often they were answered wrong.
+        
+        Args:
+            value (bool): True to enable, False to disable
+            seed (int, optional): Reseed the random number generator
+        """
+        self.session.set_adaptive(value, seed)
+
+    def set_multiple_choice(self, value):
+        """
+        Enable or disable multiple-choice mode. While enabled, the length
+        index that choices are drawn from is built when a deck loads, so
+        the first question does not pay for it.
+        
+        Args:
+            value (bool): True to enable, False to disable
+        """
+        self.multiple_choice = value
+        if value:
+            self.session.deck.length_order()
 
     def remove_current_card(self):
         """
         Remove the current card from the filtered cards and update the index.
         """
-        if self.filtered_cards:
-            del self.filtered_cards[self.current_index]
-            if self.current_index >= len(self.filtered_cards):
-                self.current_index = max(0, len(self.filtered_cards) - 1)
+        self.session.remove_current_card()
+
+    def record_answer(self, correct, latency=None):
+        """
+        Record an answer to the current card and update its adaptive weight.
+        
+        Args:
+            correct (bool): Whether the answer was right
+            latency (float, optional): Seconds taken to answer, for analytics
+        """
+        self.session.record_answer(correct, latency)
+
+    def check_answer(self, user_input, latency=None):
+        """
+        Check an answer against the current card's term or definition and record the result.
+        
+        Args:
+            user_input (str): The text entered by the user
+            latency (float, optional): Seconds taken to answer, for analytics
+            
+        Returns:
+            bool: True if the answer is correct
+        """
+        return self.session.check_answer(user_input, latency)
+    
+    def get_choices(self, count=4):
+        """
+        Get multiple-choice options for the current card, drawn from cards
+        of the same section with a similar definition length.
+        
+        Args:
+            count (int): Number of options, including the right one
+            
+        Returns:
+            list: Card dicts with an added 'index' key, in random order
+        """
+        deck = self.session.deck
+        return [dict(deck.card(i), index=i) for i in self.session.choices(count)]
+    
+    def check_choice(self, card_index, latency=None):
+        """
+        Check a multiple-choice answer and record the result.
+        
+        Args:
+            card_index (int): 'index' of the chosen option
+            latency (float, optional): Seconds taken to answer, for analytics
+            
+        Returns:
+            bool: True if the chosen option is right
+        """
+        return self.session.check_choice(card_index, latency)
+    
+    def _new_session(self, deck):
+        """
+        Start a session over a deck, carrying over the study settings.
+        
+        Args:
+            deck (Deck): The deck to study
+        """
+        previous = self.session
+        self.session = StudySession(deck, previous.remove_on_correct, previous.adaptive)
+        self.session.rng = previous.rng
+        self.session.seed = previous.seed
+        if self.multiple_choice:
+            deck.length_order()
     
     def load_libdict(self, file_path):
         """
@@ -58,56 +208,102 @@ class FlashcardManager:
             bool: True if successfully loaded, False otherwise.
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            # Store the deck information
-            self.current_deck = {
-                'title': data.get('title', os.path.basename(file_path)),
-                'path': file_path,
-                'format_version': data.get('format_version', '1.0')
-            }
+            self.deck = Deck.load(file_path, self.cache)
+            self._new_session(self.deck)
             
-            # Reset cards list
-            self.cards = []
-            
-            # Process sections
-            sections = data.get('sections', {})
-            self.active_sections = {}
-            
-            for section_name, items in sections.items():
-                self.active_sections[section_name] = True  # Default all sections to active
-                
-                for item in items:
-                    card = {
-                        'term': self._normalize_word(item.get('term', '')),
-                        'definition': self._normalize_word(item.get('definition', '')),
-                        'section': section_name
-                    }
-                    self.cards.append(card)
-            
-            # Initialize with all sections active
-            self._apply_filters()
+            if self.journal is not None:
+                self.journal.close()
+            self.journal = DeckJournal(file_path)
             return True
         
         except Exception as e:
             print(f"Error loading .libdict file: {str(e)}")
             return False
     
-    def _apply_filters(self):
+    def load_libdicts(self, file_paths):
         """
-        Apply section filters to the cards list to create filtered_cards.
+        Load several .libdict files as one deck, e.g. to study stages 5
+        through 8 together. Sections are named after their file, as in
+        'stage7/nouns'. The decks are chained rather than merged, and the
+        combined deck is read-only.
+        
+        Args:
+            file_paths (list): Paths to the .libdict files, in study order
+            
+        Returns:
+            bool: True if successfully loaded, False otherwise.
         """
-        self.filtered_cards = [
-            card for card in self.cards
-            if self.active_sections.get(card['section'], True)
-        ]
+        if len(file_paths) == 1:
+            return self.load_libdict(file_paths[0])
         
-        # Reset the current index if needed
-        if self.filtered_cards:
-            self.current_index = min(self.current_index, len(self.filtered_cards) - 1)
-        else:
-            self.current_index = 0
+        try:
+            self.deck = UnionDeck.load(file_paths, self.cache)
+            self._new_session(self.deck)
+            
+            # Edits go to the individual files, so a union has no journal
+            if self.journal is not None:
+                self.journal.close()
+            self.journal = None
+            return True
+        
+        except Exception as e:
+            print(f"Error loading .libdict files: {str(e)}")
+            return False
+    
+    def reload_libdict(self):
+        """
+        Reload the current deck after its file changed, applying only the
+        differences so section toggles, card order and position survive.
+        
+        Cards are matched by (section, term, occurrence of that term in the
+        section). A match with a new definition or new display text
+        counts as a change; unmatched old cards are removed and unmatched
+        new cards are added at the end of the study order.
+        
+        Returns:
+            dict: Number of 'added', 'removed' and 'changed' cards, or None on failure
+        """
+        if self.deck is None:
+            return None
+        
+        file_path = self.deck.path
+        try:
+            if isinstance(self.deck, UnionDeck):
+                deck = UnionDeck.load(self.deck.paths, self.cache)
+            else:
+                deck = Deck.load(file_path, self.cache)
+        except Exception as e:
+            print(f"Error reloading .libdict file: {str(e)}")
+            return None
+        
+        if self.multiple_choice:
+            deck.length_order()
+        
+        mapping, added, changed = self.deck.diff(deck)
+        self.deck = deck
+        self.session.rebind(deck, mapping, added)
+        
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = DeckJournal(file_path)
+        
+        return {'added': len(added), 'removed': mapping.count(-1), 'changed': changed}
+    
+    def fork(self):
+        """
+        Create a manager for another study session over the loaded deck.
+        
+        The deck is shared rather than copied; only the study state (order,
+        position, toggles, settings, random state) is the new manager's own.
+        Forks are meant for studying; edits on them raise ValueError.
+        
+        Returns:
+            FlashcardManager: The new session
+        """
+        manager = FlashcardManager(cache=self.cache)
+        manager.deck = self.deck
+        manager.session = StudySession(self.session.deck)
+        return manager
     
     def toggle_section(self, section_name):
         """
@@ -119,11 +315,7 @@ class FlashcardManager:
         Returns:
             bool: New state of the section (True if active)
         """
-        if section_name in self.active_sections:
-            self.active_sections[section_name] = not self.active_sections[section_name]
-            self._apply_filters()
-            return self.active_sections[section_name]
-        return False
+        return self.session.toggle_section(section_name)
     
     def get_section_names(self):
         """
@@ -153,10 +345,7 @@ class FlashcardManager:
         Returns:
             dict: Current flashcard data or None if no cards
         """
-        if not self.filtered_cards:
-            return None
-        
-        return self.filtered_cards[self.current_index]
+        return self.session.get_current_card()
     
     def next_card(self):
         """
@@ -165,11 +354,7 @@ class FlashcardManager:
         Returns:
             dict: New current flashcard or None if no cards
         """
-        if not self.filtered_cards:
-            return None
-            
-        self.current_index = (self.current_index + 1) % len(self.filtered_cards)
-        return self.get_current_card()
+        return self.session.next_card()
     
     def previous_card(self):
         """
@@ -178,19 +363,74 @@ class FlashcardManager:
         Returns:
             dict: New current flashcard or None if no cards
         """
-        if not self.filtered_cards:
-            return None
-            
-        self.current_index = (self.current_index - 1) % len(self.filtered_cards)
-        return self.get_current_card()
+        return self.session.previous_card()
     
     def shuffle_cards(self):
         """
         Shuffle the filtered cards.
         """
-        if self.filtered_cards:
-            random.shuffle(self.filtered_cards)
-            self.current_index = 0
+        self.session.shuffle_cards()
+    
+    def browse_order(self, sort_column=None, descending=False):
+        """
+        Get the cards of the active sections in browsing order.
+        
+        Args:
+            sort_column (str, optional): 'term', 'definition' or 'section';
+                None for file order
+            descending (bool): Reverse the order
+            
+        Returns:
+            array: Deck card indices
+        """
+        deck = self.session.deck
+        if all(self.active_sections.get(name, True) for name in deck.sections):
+            order = deck.sort_order(sort_column)
+        elif sort_column in (None, 'section'):
+            # These orders keep sections contiguous, so whole ranges are kept or dropped
+            order = array('I')
+            for name in (deck.sections if sort_column is None else sorted(deck.sections)):
+                if self.active_sections.get(name, True):
+                    order.extend(deck.section_range(name))
+        else:
+            hidden = bytearray(len(deck))
+            for name in deck.sections:
+                if not self.active_sections.get(name, True):
+                    cards = deck.section_range(name)
+                    hidden[cards.start:cards.stop] = b'\x01' * len(cards)
+            order = array('I', [i for i in deck.sort_order(sort_column) if not hidden[i]])
+        
+        if descending:
+            order = order[::-1]
+        return order
+    
+    def get_cards(self, order, start, stop):
+        """
+        Get a slice of cards, e.g. the rows visible in a table.
+        
+        Args:
+            order (array): Card indices from browse_order
+            start (int): First position
+            stop (int): Position after the last one
+            
+        Returns:
+            list: Card dicts
+        """
+        deck = self.session.deck
+        return [deck.card(i) for i in order[start:stop]]
+    
+    def jump_to_card(self, card_index):
+        """
+        Make a card the current one in the study session.
+        
+        Args:
+            card_index (int): Deck index of the card
+            
+        Returns:
+            bool: True if the card is in the study order, False if it was
+                removed during this session
+        """
+        return self.session.jump_to(card_index)
     
     def get_deck_info(self):
         """
@@ -205,10 +445,10 @@ class FlashcardManager:
             'filtered_count': 0
         }
         
-        if self.current_deck:
-            result['title'] = self.current_deck['title']
-            result['card_count'] = len(self.cards)
-            result['filtered_count'] = len(self.filtered_cards)
+        if self.deck is not None:
+            result['title'] = self.deck.title
+            result['card_count'] = len(self.session.deck)
+            result['filtered_count'] = len(self.session.view)
             
         return result
     
@@ -239,8 +479,210 @@ class FlashcardManager:
         }
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            return output_path
+            return write_libdict(data, output_path)
         except Exception as e:
             raise Exception(f"Error creating .libdict file: {str(e)}")
+    
+    # --- Deck editing ---
+    
+    def _journal_edit(self, op):
+        """
+        Apply an edit to the deck, move the session onto the new deck and
+        record the edit in the journal, compacting once it grows large.
+        
+        Args:
+            op (dict): The edit operation
+            
+        Returns:
+            list: Indices of cards the edit added
+        """
+        if self.deck is None:
+            raise ValueError("No deck loaded")
+        if self.journal is None:
+            # Refuse before applying, so the deck is left as it was
+            raise ValueError("This deck is read-only here; edit it from the manager that loaded "
+                             "its file, not from a fork or a union of decks")
+        
+        deck, mapping, added = self.deck.apply_edit(op)
+        self.deck = deck
+        self.session.rebind(deck, mapping, added)
+        
+        self.journal.append(op)
+        if self.journal.op_count >= self.compact_threshold:
+            self.compact_deck()
+        return added
+    
+    def add_section(self, section_name):
+        """
+        Add an empty section to the loaded deck.
+        
+        Args:
+            section_name (str): Name of the new section
+            
+        Returns:
+            bool: True if the section was added, False if it already exists
+        """
+        if self.deck is None:
+            raise ValueError("No deck loaded")
+        if section_name in self.deck.sections:
+            return False
+        
+        self._journal_edit({'op': 'add_section', 'section': section_name})
+        return True
+    
+    def delete_section(self, section_name):
+        """
+        Delete a section and all of its cards from the loaded deck.
+        
+        Args:
+            section_name (str): Name of the section
+            
+        Returns:
+            bool: True if the section was deleted, False if it does not exist
+        """
+        if self.deck is None:
+            raise ValueError("No deck loaded")
+        if section_name not in self.deck.sections:
+            return False
+        
+        self._journal_edit({'op': 'delete_section', 'section': section_name})
+        return True
+    
+    def add_card(self, section_name, term, definition):
+        """
+        Add a card to the end of a section of the loaded deck.
+        
+        Args:
+            section_name (str): Section to add the card to
+            term (str): Term of the card
+            definition (str): Definition of the card
+            
+        Returns:
+            dict: The new card
+        """
+        added = self._journal_edit({
+            'op': 'add_card',
+            'section': section_name,
+            'term': term,
+            'definition': definition
+        })
+        return self.deck.card(added[0])
+    
+    def update_card(self, section_name, index, term=None, definition=None):
+        """
+        Change the term and/or definition of a card of the loaded deck.
+        
+        Args:
+            section_name (str): Section of the card
+            index (int): Position of the card within its section
+            term (str, optional): New term
+            definition (str, optional): New definition
+            
+        Returns:
+            dict: The updated card
+        """
+        op = {'op': 'update_card', 'section': section_name, 'index': index}
+        if term is not None:
+            op['term'] = term
+        if definition is not None:
+            op['definition'] = definition
+        
+        # Card indices do not move, so the study order and statistics carry over
+        self._journal_edit(op)
+        return self.deck.card(self.deck.section_range(section_name)[index])
+    
+    def delete_card(self, section_name, index):
+        """
+        Delete a card from the loaded deck.
+        
+        Args:
+            section_name (str): Section of the card
+            index (int): Position of the card within its section
+        """
+        self._journal_edit({'op': 'delete_card', 'section': section_name, 'index': index})
+    
+    def compact_deck(self):
+        """
+        Fold journaled edits into the deck file with an atomic rewrite.
+        
+        Returns:
+            str: Path to the deck file, or None if no deck is loaded or the
+                deck is a read-only union
+        """
+        if self.deck is None or self.journal is None:
+            return None
+        return compact_libdict(self.deck.path, self.journal)
+    
+    # --- Session snapshots ---
+    
+    def save_session(self, path=None):
+        """
+        Save the study session so it can be resumed later: the card order,
+        removed cards, current position, settings and random state.
+        
+        Args:
+            path (str, optional): Snapshot path, defaults to next to the deck
+            
+        Returns:
+            str: Path to the snapshot, or None if no deck is loaded or the
+                deck is a union without a path of its own
+        """
+        if self.deck is None or (path is None and self.deck.path is None):
+            return None
+        return self.session.save(path)
+    
+    def resume_session(self, path=None):
+        """
+        Restore a session saved by save_session onto the loaded deck.
+        
+        Args:
+            path (str, optional): Snapshot path, defaults to next to the deck
+            
+        Returns:
+            bool: True if the session was restored, False otherwise
+        """
+        if self.deck is None or (path is None and self.deck.path is None):
+            return False
+        return self.session.restore(path)
+    
+    # --- Answer statistics ---
+    
+    def enable_analytics(self):
+        """
+        Start collecting answer statistics for the loaded deck as a new
+        study session, continuing the history saved with save_analytics.
+        
+        Returns:
+            CardAnalytics: The statistics, or None if NumPy is not installed
+                or no deck is loaded
+        """
+        if self.deck is None:
+            return None
+        try:
+            from analytics import CardAnalytics, stats_path
+        except ImportError:
+            print("NumPy is not installed, answer statistics are disabled")
+            return None
+        
+        analytics = None
+        if self.deck.path is not None and os.path.exists(stats_path(self.deck.path)):
+            try:
+                analytics = CardAnalytics.load(self.deck)
+            except Exception as e:
+                print(f"Error loading answer statistics: {str(e)}")
+        if analytics is None:
+            analytics = CardAnalytics(self.deck)
+        analytics.start_session()
+        self.session.analytics = analytics
+        return analytics
+    
+    def save_analytics(self):
+        """
+        Save the answer statistics next to the deck.
+        
+        Returns:
+            str: Path to the statistics file, or None if none are collected
+        """
+        if self.deck is None or self.deck.path is None or self.session.analytics is None:
+            return None
+        return self.session.analytics.save(self.deck)
@@ -1,9 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
-from pdf_parser import PDFParser
+import time
+from pdf_parser import PDFParser, page_cache_path
+import importers
 from flashcard_manager import FlashcardManager
+from deck_cache import DeckCache
 from utils import center_window
+from snapshots import snapshot_path
+from deck_watcher import create_watcher
+from card_browser import CardTable
+from loop_monitor import LoopMonitor
 
 class VocabApp:
     """
@@ -11,7 +18,31 @@ class VocabApp:
     Manages the GUI interface and integrates the various components.
     """
     
-    def __init__(self, root):
+    WATCH_INTERVAL_MS = 1000  # How often a watched deck is checked for changes
+    PATH_SEPARATOR = "; "  # Between deck paths in the flashcard file entry
+    PDF_PAGE_TIMEOUT = 30  # Seconds before a page that hangs extraction is skipped
+    PDF_DOCUMENT_TIMEOUT = 600  # Seconds before the rest of a PDF is skipped
+    FEEDBACK_COLORS = {True: '#27AE60', False: '#E74C3C'}  # Rapid review feedback, by correctness
+    
+    # Callbacks timed by the event-loop monitor
+    MONITORED_HANDLERS = (
+        'browse_input_file', 'browse_output_location', 'convert_pdf',
+        'browse_flashcard_file', 'load_flashcards', 'toggle_remove_on_correct',
+        'toggle_adaptive', 'toggle_watch', '_poll_watcher', 'flip_card',
+        'on_flashcard_resize', 'check_answer', 'previous_card', 'shuffle_cards',
+        'next_card', 'show_statistics', 'toggle_multiple_choice', 'check_choice',
+        'toggle_rapid_review', '_show_prefetched_card',
+        'toggle_section', '_update_section_filters',
+        'show_current_card', 'refresh_browser', '_browse_fetch', '_browse_open'
+    )
+    
+    def __init__(self, root, monitor_threshold_ms=None):
+        """
+        Args:
+            root: Tk root window
+            monitor_threshold_ms (float, optional): Turn on the event-loop
+                monitor and log handlers and stalls longer than this
+        """
         self.root = root
         
         # Set app theme colors
@@ -23,8 +54,23 @@ class VocabApp:
         }
         
         # Initialize components
-        self.parser = PDFParser()
-        self.manager = FlashcardManager()
+        # Extract in a worker process so a malformed PDF cannot hang the window
+        self.parser = PDFParser(page_timeout=self.PDF_PAGE_TIMEOUT,
+                                document_timeout=self.PDF_DOCUMENT_TIMEOUT)
+        self.manager = FlashcardManager(cache=DeckCache())
+        self.watcher = None  # Watches the loaded deck file when enabled
+        self._watch_job = None
+        self._reload_pending = False
+        self._card_shown_at = None  # When the current card was shown, for answer times
+        self._browse_order = None  # Card indices shown in the browse tab, in row order
+        self._choices = []  # Options shown for the current card in multiple-choice mode
+        self._advance_job = None  # Pending switch to the prefetched card in rapid review
+        
+        # Time callbacks before the UI hands them to widgets
+        self.monitor = None
+        if monitor_threshold_ms is not None:
+            self.monitor = LoopMonitor(root, monitor_threshold_ms, on_update=self._show_loop_latency)
+            self.monitor.instrument(self, self.MONITORED_HANDLERS)
         
         # Create main application UI
         self.setup_styles()
@@ -33,6 +79,30 @@ class VocabApp:
         # Center the window on screen
         center_window(root)
         
+        if self.monitor:
+            self.monitor.start()
+        
+        # Keep the study session when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def on_close(self):
+        """Save the current study session and close the application"""
+        self._stop_watching()
+        self._save_session()
+        if self.monitor:
+            self.monitor.stop()
+            for name, calls, total_ms, max_ms in self.monitor.report():
+                print(f"{name}: {calls} calls, {total_ms:.0f} ms total, {max_ms:.0f} ms max")
+        self.root.destroy()
+    
+    def _save_session(self):
+        """Save the study session of the loaded deck, if any"""
+        try:
+            self.manager.save_session()
+            self.manager.save_analytics()
+        except Exception as e:
+            print(f"Error saving session: {str(e)}")
+        
     def setup_styles(self):
         """Configure ttk styles with our color scheme"""
         self.style = ttk.Style()
@@ -93,6 +163,11 @@ class VocabApp:
         self.notebook.add(self.study_tab, text="Flashcard Study")
         self._create_study_tab()
         
+        # Create browse tab
+        self.browse_tab = ttk.Frame(self.notebook, style='TFrame')
+        self.notebook.add(self.browse_tab, text="Browse Cards")
+        self._create_browse_tab()
+        
         # Create the status bar
         self.status_var = tk.StringVar()
         self.status_var.set("Ready")
@@ -103,6 +178,19 @@ class VocabApp:
         ttk.Label(status_frame, 
                   textvariable=self.status_var,
                   style='TLabel').pack(side=tk.LEFT)
+        
+        # Loop latency readout, only with the monitor on
+        self.loop_latency_var = tk.StringVar()
+        if self.monitor:
+            ttk.Label(status_frame,
+                      textvariable=self.loop_latency_var,
+                      style='TLabel').pack(side=tk.RIGHT)
+    
+    def _show_loop_latency(self, current_ms, max_ms):
+        """Show the event-loop latency in the status bar"""
+        text = f"Loop latency: {current_ms:.0f} ms (max {max_ms:.0f} ms)"
+        if self.loop_latency_var.get() != text:
+            self.loop_latency_var.set(text)
     
     def _create_converter_tab(self):
         """Create the PDF to .libdict converter tab"""
@@ -112,7 +200,7 @@ class VocabApp:
         input_frame.columnconfigure(1, weight=1)  # Make the entry column expandable
         
         ttk.Label(input_frame, 
-                  text="Input PDF:", 
+                  text="Input File:", 
                   style='TLabel').grid(row=0, column=0, padx=(0, 10), sticky="w")
         
         self.input_path_var = tk.StringVar()
@@ -140,12 +228,68 @@ class VocabApp:
                    text="Browse...", 
                    command=self.browse_output_location).grid(row=0, column=2, sticky="e")
         
+        # Import options for spreadsheets and flashcard-app exports
+        import_frame = ttk.Frame(self.converter_tab, style='TFrame')
+        import_frame.pack(fill=tk.X, pady=10)
+        
+        ttk.Label(import_frame, 
+                  text="Format:", 
+                  style='TLabel').grid(row=0, column=0, padx=(0, 10), sticky="w")
+        
+        self.input_format_var = tk.StringVar(value="Auto")
+        ttk.Combobox(import_frame,
+                     textvariable=self.input_format_var,
+                     values=["Auto", "PDF", "CSV", "TSV", "Anki", "Quizlet"],
+                     state="readonly",
+                     width=10).grid(row=0, column=1, padx=(0, 20), sticky="w")
+        
+        # Columns can be given as header names or 1-based numbers
+        self.term_column_var = tk.StringVar(value="1")
+        self.definition_column_var = tk.StringVar(value="2")
+        self.section_column_var = tk.StringVar(value="")
+        
+        for i, (label, var) in enumerate([("Term column:", self.term_column_var),
+                                          ("Definition column:", self.definition_column_var),
+                                          ("Section column:", self.section_column_var)]):
+            ttk.Label(import_frame, 
+                      text=label, 
+                      style='TLabel').grid(row=0, column=2 + i * 2, padx=(0, 5), sticky="w")
+            ttk.Entry(import_frame, 
+                      textvariable=var,
+                      width=12).grid(row=0, column=3 + i * 2, padx=(0, 15), sticky="w")
+        
+        # PDF options - only read part of a long PDF
+        pdf_frame = ttk.Frame(self.converter_tab, style='TFrame')
+        pdf_frame.pack(fill=tk.X, pady=10)
+        
+        ttk.Label(pdf_frame, 
+                  text="PDF pages:", 
+                  style='TLabel').grid(row=0, column=0, padx=(0, 5), sticky="w")
+        self.pdf_pages_var = tk.StringVar(value="")  # e.g. "1-3, 7, 10-"; empty for all
+        ttk.Entry(pdf_frame, 
+                  textvariable=self.pdf_pages_var,
+                  width=16).grid(row=0, column=1, padx=(0, 15), sticky="w")
+        
+        ttk.Label(pdf_frame, 
+                  text="Sections:", 
+                  style='TLabel').grid(row=0, column=2, padx=(0, 5), sticky="w")
+        self.pdf_sections_var = tk.StringVar(value="")  # e.g. "nouns, verbs"; empty for all
+        ttk.Entry(pdf_frame, 
+                  textvariable=self.pdf_sections_var,
+                  width=24).grid(row=0, column=3, padx=(0, 15), sticky="w")
+        
+        self.pdf_stop_early_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(pdf_frame, 
+                        text="Stop once these sections are complete",
+                        variable=self.pdf_stop_early_var,
+                        style='TCheckbutton').grid(row=0, column=4, sticky="w")
+        
         # Bottom section - Convert button
         button_frame = ttk.Frame(self.converter_tab, style='TFrame')
         button_frame.pack(fill=tk.X, pady=10)
         
         ttk.Button(button_frame, 
-                   text="Convert PDF to Flashcards", 
+                   text="Convert to Flashcards", 
                    style='Accent.TButton',
                    command=self.convert_pdf).pack(pady=10)
         
@@ -165,7 +309,7 @@ class VocabApp:
         load_frame.columnconfigure(1, weight=1)  # Make the entry column expandable
         
         ttk.Label(load_frame, 
-                  text="Flashcard File:", 
+                  text="Flashcard File(s):", 
                   style='TLabel').grid(row=0, column=0, padx=(0, 10), sticky="w")
         
         self.flashcard_path_var = tk.StringVar()
@@ -185,6 +329,37 @@ class VocabApp:
                         variable=self.remove_on_correct_var,
                         command=self.toggle_remove_on_correct,
                         style='TCheckbutton').pack(anchor=tk.W, pady=(0, 10))
+        self.adaptive_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.study_tab, 
+                        text="Adaptive order (show missed cards more often)",
+                        variable=self.adaptive_var,
+                        command=self.toggle_adaptive,
+                        style='TCheckbutton').pack(anchor=tk.W, pady=(0, 10))
+        self.watch_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.study_tab, 
+                        text="Reload automatically when the file changes",
+                        variable=self.watch_var,
+                        command=self.toggle_watch,
+                        style='TCheckbutton').pack(anchor=tk.W, pady=(0, 10))
+        self.multiple_choice_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.study_tab, 
+                        text="Multiple choice (pick the definition)",
+                        variable=self.multiple_choice_var,
+                        command=self.toggle_multiple_choice,
+                        style='TCheckbutton').pack(anchor=tk.W, pady=(0, 10))
+        rapid_frame = ttk.Frame(self.study_tab, style='TFrame')
+        rapid_frame.pack(anchor=tk.W, pady=(0, 10))
+        self.rapid_review_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(rapid_frame, 
+                        text="Rapid review (no pop-ups, next card after",
+                        variable=self.rapid_review_var,
+                        command=self.toggle_rapid_review,
+                        style='TCheckbutton').pack(side=tk.LEFT)
+        self.rapid_delay_var = tk.StringVar(value="600")
+        ttk.Spinbox(rapid_frame,
+                    from_=0, to=5000, increment=100, width=6,
+                    textvariable=self.rapid_delay_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(rapid_frame, text="ms)", style='TLabel').pack(side=tk.LEFT)
         # Section filters (only show when deck is loaded)
         self.filters_frame = ttk.Frame(self.study_tab, style='TFrame')
         self.filters_frame.pack(fill=tk.X, pady=10)
@@ -255,6 +430,26 @@ class VocabApp:
                                        cursor="hand2")  # Change cursor to indicate clickable
         self.definition_label.bind("<Button-1>", self.flip_card)  # Bind click to definition label
         
+        # Spare front label that the next card is drawn into in rapid review,
+        # so moving on only swaps which label is packed
+        self.next_term_var = tk.StringVar()
+        self.next_term_label = tk.Label(self.flashcard_frame,
+                                        textvariable=self.next_term_var,
+                                        bg='white',
+                                        fg=self.colors['text'],
+                                        font=('Helvetica', 24),
+                                        wraplength=400,
+                                        cursor="hand2")
+        self.next_term_label.bind("<Button-1>", self.flip_card)
+        
+        # Inline right/wrong feedback for rapid review
+        self.feedback_var = tk.StringVar()
+        self.feedback_label = tk.Label(card_frame,
+                                       textvariable=self.feedback_var,
+                                       bg=self.colors['secondary'],
+                                       font=('Helvetica', 12, 'bold'))
+        self.feedback_label.pack(fill=tk.X)
+        
         # Navigation buttons
         nav_frame = ttk.Frame(self.study_tab, style='TFrame')
         nav_frame.pack(fill=tk.X, pady=10)
@@ -262,13 +457,34 @@ class VocabApp:
         nav_frame.columnconfigure(1, weight=1)
         nav_frame.columnconfigure(2, weight=1)
         nav_frame.columnconfigure(3, weight=1)
+        nav_frame.columnconfigure(4, weight=1)
         
+        # Typed answer, replaced by option buttons in multiple-choice mode
+        self.answer_frame = ttk.Frame(self.study_tab, style='TFrame')
+        self.answer_frame.pack(fill=tk.X)
         self.answer_var = tk.StringVar()
-        ttk.Entry(self.study_tab, 
-                textvariable=self.answer_var).pack(fill=tk.X, pady=(10, 5))
-        ttk.Button(self.study_tab, 
+        self.answer_entry = ttk.Entry(self.answer_frame, 
+                                      textvariable=self.answer_var)
+        self.answer_entry.pack(fill=tk.X, pady=(10, 5))
+        self.answer_entry.bind("<Return>", lambda event: self.check_answer(self.answer_var.get()))
+        ttk.Button(self.answer_frame, 
                text="Check Answer", 
                command=lambda: self.check_answer(self.answer_var.get())).pack(pady=(0, 10))
+        
+        self.choices_frame = ttk.Frame(self.study_tab, style='TFrame')
+        self.choices_frame.columnconfigure(0, weight=1)
+        self.choices_frame.columnconfigure(1, weight=1)
+        self.choice_buttons = []
+        for k in range(4):
+            button = tk.Button(self.choices_frame,
+                               bg='white',
+                               fg=self.colors['text'],
+                               font=('Helvetica', 12),
+                               wraplength=350,
+                               command=lambda k=k: self.check_choice(k))
+            button.grid(row=k // 2, column=k % 2, padx=10, pady=5, sticky="nsew")
+            self.choice_buttons.append(button)
+        
         ttk.Button(nav_frame, 
                    text="Previous", 
                    command=self.previous_card).grid(row=0, column=0, padx=10, pady=5, sticky="ew")
@@ -285,10 +501,15 @@ class VocabApp:
                    text="Next", 
                    command=self.next_card).grid(row=0, column=3, padx=10, pady=5, sticky="ew")
         
+        ttk.Button(nav_frame, 
+                   text="Statistics", 
+                   command=self.show_statistics).grid(row=0, column=4, padx=10, pady=5, sticky="ew")
+        
         # Instructions label
-        ttk.Label(self.study_tab, 
-                  text="Click on a card to flip it",
-                  style='TLabel').pack(pady=(0, 10))
+        self.instructions_label = ttk.Label(self.study_tab, 
+                                            text="Click on a card to flip it",
+                                            style='TLabel')
+        self.instructions_label.pack(pady=(0, 10))
     
     def check_answer(self, user_input):
         """
@@ -298,41 +519,327 @@ class VocabApp:
             user_input (str): The text entered by the user.
         """
         current_card = self.manager.get_current_card()
-        if not current_card:
+        if not current_card or self._advance_job is not None:
             return
 
-        # Normalize the user's input and the card's term/definition
-        normalized_input = self.manager._normalize_word(user_input)
-        normalized_term = self.manager._normalize_word(current_card['term'])
-        normalized_definition = self.manager._normalize_word(current_card['definition'])
-
-        # Check if the input matches the term or definition
-        if normalized_input in (normalized_term, normalized_definition):
-            messagebox.showinfo("Correct!", "You answered correctly!")
-            
-            # Remove the card if the setting is enabled
-            if self.manager.remove_on_correct:
-                self.manager.remove_current_card()
-            
-            # Show the next card
-            self.manager.next_card()
-            self.show_current_card()
+        latency = None
+        if self._card_shown_at is not None:
+            latency = time.monotonic() - self._card_shown_at
+        
+        # Check if the input matches the term or definition (this also
+        # updates the card's weight for adaptive mode and the statistics)
+        if self.manager.check_answer(user_input, latency):
+            self._advance_after_correct()
+        elif self.rapid_review_var.get():
+            self._show_feedback(False, "Incorrect, try again")
+            self.answer_entry.select_range(0, tk.END)
         else:
             messagebox.showerror("Incorrect", "Try again!")
+    
+    def check_choice(self, position):
+        """
+        Check the multiple-choice option the user picked.
+        
+        Args:
+            position (int): Position of the option button
+        """
+        if position >= len(self._choices) or self._advance_job is not None:
+            return
+        
+        latency = None
+        if self._card_shown_at is not None:
+            latency = time.monotonic() - self._card_shown_at
+        
+        if self.manager.check_choice(self._choices[position]['index'], latency):
+            self._advance_after_correct()
+        else:
+            # Rule the wrong option out and let the user pick again
+            self.choice_buttons[position].configure(state=tk.DISABLED)
+            if self.rapid_review_var.get():
+                self._show_feedback(False, "Incorrect, try again")
+            else:
+                messagebox.showerror("Incorrect", "Try again!")
+    
+    def _advance_after_correct(self):
+        """Congratulate the user and move on after a correct answer"""
+        if self.rapid_review_var.get():
+            self._show_feedback(True, "Correct!")
+            self._prefetch_next_card()
+            return
+        
+        messagebox.showinfo("Correct!", "You answered correctly!")
+        
+        # Remove the card if the setting is enabled
+        if self.manager.remove_on_correct:
+            self.manager.remove_current_card()
+        
+        # Show the next card
+        self.manager.next_card()
+        self.show_current_card()
+    
+    # --- Rapid review ---
+    
+    def toggle_rapid_review(self):
+        """Switch between pop-up and inline answer feedback"""
+        if not self.rapid_review_var.get():
+            self.show_current_card()  # Drop any pending switch and feedback
+        self.answer_entry.focus_set()
+    
+    def _show_feedback(self, correct, text):
+        """Show right/wrong feedback below the card and around its edge"""
+        color = self.FEEDBACK_COLORS[correct]
+        self.feedback_var.set(text)
+        self.feedback_label.configure(fg=color)
+        self.flashcard_frame.configure(bg=color)
+    
+    def _clear_feedback(self):
+        """Remove rapid review feedback"""
+        self.feedback_var.set("")
+        self.flashcard_frame.configure(bg=self.colors['primary'])
+    
+    def _prefetch_next_card(self):
+        """
+        Move the session on and draw the next card into the hidden front
+        label while the feedback for this one is still showing.
+        """
+        if self.manager.remove_on_correct:
+            self.manager.remove_current_card()
+        card = self.manager.next_card()
+        self.next_term_var.set(card['term'] if card else "No cards available")
+        
+        try:
+            delay = max(0, int(self.rapid_delay_var.get()))
+        except ValueError:
+            delay = 0
+        self._advance_job = self.root.after(delay, self._show_prefetched_card)
+    
+    def _show_prefetched_card(self):
+        """Show the prefetched card by swapping the front labels"""
+        if self._advance_job is not None:
+            self.root.after_cancel(self._advance_job)
+            self._advance_job = None
+        
+        if not self.card_front:
+            self.definition_label.pack_forget()
+            self.card_front = True
+        else:
+            self.term_label.pack_forget()
+        self.next_term_label.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
+        self.term_label, self.next_term_label = self.next_term_label, self.term_label
+        self.term_var, self.next_term_var = self.next_term_var, self.term_var
+        
+        card = self.manager.get_current_card()
+        self.definition_var.set(card['definition'] if card else "")
+        self._card_shown_at = time.monotonic() if card else None
+        self._clear_feedback()
+        self.answer_var.set("")
+        if self.multiple_choice_var.get():
+            self._show_choices()
+
+    def show_statistics(self):
+        """Show answer statistics of the loaded deck in a separate window"""
+        analytics = self.manager.analytics
+        if analytics is None:
+            messagebox.showinfo("Statistics",
+                                "Load a deck to collect statistics. Statistics need NumPy "
+                                "(pip install numpy).")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Study Statistics")
+        window.configure(bg=self.colors['secondary'])
+        frame = ttk.Frame(window, style='TFrame', padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Totals and answer times
+        summary = analytics.summary()
+        lines = [f"{summary['reviews']} answers over {summary['sessions']} sessions, "
+                 f"{summary['cards_seen']} of {summary['cards']} cards seen"]
+        if summary['accuracy'] is not None:
+            lines.append(f"Accuracy: {summary['accuracy']:.0%}")
+        percentiles = analytics.latency_percentiles()
+        if percentiles:
+            lines.append("Answer time: " + ", ".join(f"p{p} {seconds:.1f}s" for p, seconds in percentiles.items()))
+        ttk.Label(frame, text="\n".join(lines), style='TLabel').pack(anchor=tk.W, pady=(0, 10))
+        
+        def add_table(title, columns, rows, height):
+            ttk.Label(frame, text=title, style='TLabel').pack(anchor=tk.W)
+            tree = ttk.Treeview(frame, columns=columns, show='headings', height=height)
+            for column in columns:
+                tree.heading(column, text=column)
+                tree.column(column, width=110, anchor=tk.W)
+            for row in rows:
+                tree.insert('', tk.END, values=row)
+            tree.pack(fill=tk.X, pady=(0, 10))
+        
+        def percent(value):
+            return f"{value:.0%}" if value is not None else "-"
+        
+        add_table("Sections", ("Section", "Cards", "Seen", "Answers", "Accuracy", "Avg. time"),
+                  [(s['section'].capitalize(), s['cards'], s['seen'], s['attempts'], percent(s['accuracy']),
+                    f"{s['mean_latency']:.1f}s" if s['mean_latency'] is not None else "-")
+                   for s in analytics.section_summary()], 6)
+        
+        deck = self.manager.deck
+        hardest = []
+        for i in analytics.hardest(10):
+            card = deck.card(int(i))
+            hardest.append((card['term'], card['definition'], card['section'].capitalize(),
+                            int(analytics.attempts[i]), percent(analytics.correct[i] / analytics.attempts[i])))
+        add_table("Hardest cards", ("Term", "Definition", "Section", "Answers", "Accuracy"), hardest, 10)
+        
+        sessions, accuracy, answers = analytics.learning_curve()
+        add_table("Learning curve (latest sessions)", ("Session", "Answers", "Accuracy"),
+                  [(int(n), int(count), percent(rate))
+                   for n, rate, count in list(zip(sessions, accuracy, answers))[-20:]], 8)
 
     def toggle_remove_on_correct(self):
         """
         Toggle the 'Remove on Correct' setting in the FlashcardManager.
         """
         self.manager.set_remove_on_correct(self.remove_on_correct_var.get())
+    
+    def toggle_adaptive(self):
+        """
+        Toggle adaptive card order in the FlashcardManager.
+        """
+        self.manager.set_adaptive(self.adaptive_var.get())
+    
+    def toggle_multiple_choice(self):
+        """Switch between typed answers and multiple-choice options"""
+        self.manager.set_multiple_choice(self.multiple_choice_var.get())
+        if self.multiple_choice_var.get():
+            self.answer_frame.pack_forget()
+            self.choices_frame.pack(fill=tk.X, pady=(10, 10), before=self.instructions_label)
+        else:
+            self.choices_frame.pack_forget()
+            self.answer_frame.pack(fill=tk.X, before=self.instructions_label)
+        self.show_current_card()
+    
+    def toggle_watch(self):
+        """
+        Start or stop watching the loaded deck file for changes.
+        """
+        self._stop_watching()
+        if self.watch_var.get():
+            self._start_watching()
+    
+    def _start_watching(self):
+        """Watch the loaded deck and poll it from the Tk event loop"""
+        deck = self.manager.current_deck
+        if not deck:
+            return
+        if deck['path'] is None:
+            self.status_var.set("Combined decks are not watched; reload them with Load")
+            return
+        
+        self.watcher = create_watcher(deck['path'])
+        self._reload_pending = False
+        self._watch_job = self.root.after(self.WATCH_INTERVAL_MS, self._poll_watcher)
+    
+    def _stop_watching(self):
+        """Stop watching the deck file"""
+        if self._watch_job is not None:
+            self.root.after_cancel(self._watch_job)
+            self._watch_job = None
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+    
+    def _poll_watcher(self):
+        """Apply changes to the watched deck, then check again later"""
+        self._watch_job = None
+        if self.watcher is None:
+            return
+        
+        if self.watcher.poll() or self._reload_pending:
+            changes = self.manager.reload_libdict()
+            # A half-written file fails to parse; retry on the next poll
+            self._reload_pending = changes is None
+            if changes:
+                self._refresh_after_reload(changes)
+        
+        self._watch_job = self.root.after(self.WATCH_INTERVAL_MS, self._poll_watcher)
+    
+    def _refresh_after_reload(self, changes):
+        """Update the display after the deck was reloaded in place"""
+        if self._advance_job is not None:
+            self._show_prefetched_card()
+        
+        deck_info = self.manager.get_deck_info()
+        self.deck_title_var.set(deck_info['title'])
+        self.card_count_var.set(f"Cards: {deck_info['filtered_count']}")
+        
+        if set(self.section_vars) != set(self.manager.get_section_names()):
+            self._update_section_filters()
+        
+        # Refresh the card text without flipping the card back over
+        card = self.manager.get_current_card()
+        if card:
+            self.term_var.set(card['term'])
+            self.definition_var.set(card['definition'])
+        else:
+            self.term_var.set("No cards available")
+            self.definition_var.set("")
+        if self.multiple_choice_var.get():
+            self._show_choices()
+        
+        self.refresh_browser(keep_position=True)
+        
+        self.status_var.set(f"Deck reloaded: {changes['added']} added, "
+                            f"{changes['removed']} removed, {changes['changed']} changed")
         
+    # --- Browse tab ---
+    
+    def _create_browse_tab(self):
+        """Create the table listing every card of the loaded deck"""
+        frame = ttk.Frame(self.browse_tab, style='TFrame', padding=20)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(frame,
+                  text="Double-click a card to study it. Click a column heading to sort.",
+                  style='TLabel').pack(anchor=tk.W, pady=(0, 10))
+        
+        self.card_table = CardTable(frame,
+                                    fetch=self._browse_fetch,
+                                    on_sort=self._browse_sort,
+                                    on_open=self._browse_open)
+        self.card_table.pack(fill=tk.BOTH, expand=True)
+    
+    def refresh_browser(self, keep_position=False):
+        """Show the cards of the active sections in the browse tab"""
+        self._browse_order = self.manager.browse_order(self.card_table.sort_column,
+                                                       self.card_table.descending)
+        self.card_table.set_row_count(len(self._browse_order), keep_position)
+    
+    def _browse_fetch(self, start, stop):
+        """Get the table rows between two positions"""
+        return [(card['term'], card['definition'], card['section'].capitalize())
+                for card in self.manager.get_cards(self._browse_order, start, stop)]
+    
+    def _browse_sort(self, column, descending):
+        """Reorder the browse table by a column"""
+        self.refresh_browser()
+    
+    def _browse_open(self, position):
+        """Study the card at a table position"""
+        if self.manager.jump_to_card(self._browse_order[position]):
+            self.notebook.select(self.study_tab)
+            self.show_current_card()
+        else:
+            self.status_var.set("That card was already removed from this session")
+    
     # --- Converter tab methods ---
     
     def browse_input_file(self):
         """Open file dialog to select input PDF file"""
         file_path = filedialog.askopenfilename(
-            title="Select PDF File",
-            filetypes=[("PDF Files", "*.pdf"), ("All Files", "*.*")]
+            title="Select File to Convert",
+            filetypes=[("Supported Files", "*.pdf *.csv *.tsv *.txt"),
+                       ("PDF Files", "*.pdf"),
+                       ("Spreadsheets", "*.csv *.tsv"),
+                       ("Anki/Quizlet Exports", "*.txt"),
+                       ("All Files", "*.*")]
         )
         
         if file_path:
@@ -358,13 +865,37 @@ class VocabApp:
         if file_path:
             self.output_path_var.set(file_path)
     
+    def _import_column(self, value):
+        """Turn a column field (header name or 1-based number) into an importer argument"""
+        value = value.strip()
+        if not value:
+            return None
+        if value.isdigit():
+            return max(int(value) - 1, 0)
+        return value
+    
+    def _import_file(self, input_path, output_path, file_format):
+        """Import a spreadsheet or flashcard-app export with the converter tab's column mapping"""
+        # Resolve "Auto" first, since the options accepted depend on the format
+        file_format = file_format or importers.detect_format(input_path)
+        if file_format == 'quizlet':
+            return importers.import_file(input_path, output_path, file_format)
+        
+        options = {
+            'term_column': self._import_column(self.term_column_var.get()),
+            'definition_column': self._import_column(self.definition_column_var.get())
+        }
+        if file_format in ('csv', 'tsv'):
+            options['section_column'] = self._import_column(self.section_column_var.get())
+        return importers.import_file(input_path, output_path, file_format, **options)
+    
     def convert_pdf(self):
-        """Convert PDF to .libdict flashcard format"""
+        """Convert a PDF, spreadsheet or flashcard-app export to .libdict flashcard format"""
         input_path = self.input_path_var.get().strip()
         output_path = self.output_path_var.get().strip()
         
         if not input_path:
-            messagebox.showerror("Error", "Please select an input PDF file.")
+            messagebox.showerror("Error", "Please select an input file.")
             return
         
         if not output_path:
@@ -372,18 +903,39 @@ class VocabApp:
             return
         
         try:
-            self.status_var.set("Converting PDF...")
+            file_format = self.input_format_var.get().lower()
+            if file_format == 'auto':
+                file_format = 'pdf' if input_path.lower().endswith('.pdf') else None
+            
+            self.status_var.set("Converting...")
             self.conversion_result_var.set("Processing...")
             self.root.update_idletasks()  # Force UI update
             
-            # Parse the PDF
-            vocabulary = self.parser.parse_pdf(input_path)
-            
-            # Save to .libdict format
-            output_file = self.parser.save_to_libdict(vocabulary, output_path)
+            warnings = []
+            if file_format == 'pdf':
+                # Parse the PDF, reading only the requested pages and reusing
+                # the cached output of pages unchanged since the last conversion
+                sections = [name.strip().lower() for name in self.pdf_sections_var.get().split(',')
+                            if name.strip()]
+                vocabulary = self.parser.parse_pdf(input_path,
+                                                   pages=self.pdf_pages_var.get().strip() or None,
+                                                   sections=sections or None,
+                                                   stop_early=self.pdf_stop_early_var.get(),
+                                                   page_cache=page_cache_path(output_path))
+                
+                warnings = vocabulary.warnings
+                
+                # Save to .libdict format
+                output_file = self.parser.save_to_libdict(vocabulary, output_path)
+            else:
+                # Stream rows from the spreadsheet or export straight into the deck
+                output_file = self._import_file(input_path, output_path, file_format)
             
             # Update UI
-            self.conversion_result_var.set(f"Conversion successful! File saved to:\n{output_file}")
+            result = f"Conversion successful! File saved to:\n{output_file}"
+            if warnings:
+                result += f"\n{len(warnings)} warning(s):\n" + "\n".join(warnings[:5])
+            self.conversion_result_var.set(result)
             self.status_var.set("Ready")
             
             # Ask if user wants to study this file now
@@ -401,20 +953,29 @@ class VocabApp:
     # --- Study tab methods ---
     
     def browse_flashcard_file(self):
-        """Open file dialog to select .libdict file"""
-        file_path = filedialog.askopenfilename(
-            title="Select Flashcard File",
+        """Open file dialog to select one or more .libdict files"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select Flashcard Files",
             filetypes=[("Flashcard Files", "*.libdict"), ("All Files", "*.*")]
         )
         
-        if file_path:
-            self.flashcard_path_var.set(file_path)
+        if file_paths:
+            # Several files are studied together as one deck
+            self.flashcard_path_var.set(self.PATH_SEPARATOR.join(file_paths))
+    
+    def _split_flashcard_paths(self, text):
+        """Split the flashcard file entry into deck paths, taking an existing file as a whole"""
+        for path in (text, text.strip()):
+            if path and os.path.isfile(path):
+                return [path]
+        return [path for path in text.split(self.PATH_SEPARATOR) if path.strip()]
     
     def load_flashcards(self):
-        """Load flashcards from a .libdict file"""
-        file_path = self.flashcard_path_var.get().strip()
+        """Load flashcards from one .libdict file, or several studied together"""
+        file_paths = self._split_flashcard_paths(self.flashcard_path_var.get())
+        file_path = file_paths[0] if len(file_paths) == 1 else None
         
-        if not file_path:
+        if not file_paths:
             messagebox.showerror("Error", "Please select a flashcard file.")
             return
         
@@ -422,10 +983,27 @@ class VocabApp:
             self.status_var.set("Loading flashcards...")
             self.root.update_idletasks()  # Force UI update
             
-            # Load the flashcard file
-            success = self.manager.load_libdict(file_path)
+            # Keep the session of the deck being replaced
+            self._save_session()
+            
+            # Load the flashcard file(s)
+            success = self.manager.load_libdicts(file_paths)
             
             if success:
+                # Offer to pick up where the last session left off
+                if (file_path and os.path.exists(snapshot_path(file_path)) and
+                        messagebox.askyesno("Resume Session",
+                                            "Resume your previous session with this deck?")):
+                    if self.manager.resume_session():
+                        self.remove_on_correct_var.set(self.manager.remove_on_correct)
+                        self.adaptive_var.set(self.manager.adaptive)
+                    else:
+                        messagebox.showinfo("Resume Session",
+                                            "The deck has changed since that session, starting fresh.")
+                
+                # Count this visit as a new session in the answer statistics
+                self.manager.enable_analytics()
+                
                 # Update deck info display
                 deck_info = self.manager.get_deck_info()
                 self.deck_title_var.set(deck_info['title'])
@@ -437,6 +1015,12 @@ class VocabApp:
                 
                 # Update section filters
                 self._update_section_filters()
+                self.refresh_browser()
+                
+                # Follow the new file if watching is on
+                self._stop_watching()
+                if self.watch_var.get():
+                    self._start_watching()
                 
                 self.status_var.set("Flashcards loaded successfully")
             else:
@@ -489,14 +1073,22 @@ class VocabApp:
         deck_info = self.manager.get_deck_info()
         self.card_count_var.set(f"Cards: {deck_info['filtered_count']}")
         self.show_current_card()
+        self.refresh_browser()
     
     def show_current_card(self):
         """Update the display with the current flashcard"""
+        # The session already moved on to any prefetched card
+        if self._advance_job is not None:
+            self.root.after_cancel(self._advance_job)
+            self._advance_job = None
+        self._clear_feedback()
+        
         card = self.manager.get_current_card()
         
         if card:
             self.term_var.set(card['term'])
             self.definition_var.set(card['definition'])
+            self._card_shown_at = time.monotonic()
             
             # Make sure we're showing the front
             if not self.card_front:
@@ -504,6 +1096,19 @@ class VocabApp:
         else:
             self.term_var.set("No cards available")
             self.definition_var.set("")
+        
+        if self.multiple_choice_var.get():
+            self._show_choices()
+    
+    def _show_choices(self):
+        """Fill the option buttons for the current card"""
+        self._choices = self.manager.get_choices(len(self.choice_buttons))
+        for k, button in enumerate(self.choice_buttons):
+            if k < len(self._choices):
+                button.configure(text=self._choices[k]['definition'], state=tk.NORMAL)
+                button.grid()
+            else:
+                button.grid_remove()
     
     def flip_card(self, event):
         """Flip the flashcard to show term or definition"""
@@ -520,6 +1125,10 @@ class VocabApp:
     
     def next_card(self):
         """Move to the next flashcard"""
+        if self._advance_job is not None:
+            # Skip the rest of the delay; the next card is already prefetched
+            self._show_prefetched_card()
+            return
         self.manager.next_card()
         self.show_current_card()
     
@@ -540,4 +1149,5 @@ class VocabApp:
         new_width = event.width - 20
         if new_width > 100:  # Ensure we don't get too small
             self.term_label.configure(wraplength=new_width)
+            self.next_term_label.configure(wraplength=new_width)
             self.definition_label.configure(wraplength=new_width)
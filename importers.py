@@ -0,0 +1,379 @@
+import csv
+import html
+import os
+import re
+from libdict_io import LibdictWriter
+
+# Section used for rows that do not name one
+DEFAULT_SECTION = 'vocabulary'
+
+# Header cells that mark the first row of a file as column names
+_HEADER_NAMES = {'term', 'definition', 'section', 'front', 'back', 'word',
+                 'meaning', 'translation', 'tags', 'tag', 'question', 'answer'}
+
+# Values accepted by Anki's "#separator:" header line
+_ANKI_SEPARATORS = {'tab': '\t', 'comma': ',', 'semicolon': ';', 'pipe': '|',
+                    'colon': ':', 'space': ' '}
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_HTML_BREAK_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+
+# Anki header lines naming columns that hold note metadata rather than fields
+_ANKI_COLUMN_HEADERS = ('guid column', 'notetype column', 'deck column', 'tags column')
+
+
+def _open_text(file_path):
+    # utf-8-sig drops the byte-order mark spreadsheet programs like to add
+    return open(file_path, 'r', encoding='utf-8-sig', newline='')
+
+
+def _sniff_delimiter(file_path, default):
+    """
+    Guess the delimiter of a delimited text file from its first few KB.
+
+    Args:
+        file_path (str): Path to the file
+        default (str): Delimiter to use when sniffing fails
+
+    Returns:
+        str: The delimiter
+    """
+    with _open_text(file_path) as f:
+        sample = f.read(8192)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=',\t;|').delimiter
+    except csv.Error:
+        return default
+
+
+def _resolve_column(column, header):
+    """
+    Turn a column given by index or header name into an index.
+
+    Args:
+        column (int or str): Zero-based index or header name
+        header (list): Header row, or None if the file has none
+
+    Returns:
+        int: Zero-based column index, or None if column is None
+    """
+    if column is None or isinstance(column, int):
+        return column
+    if isinstance(column, str) and column.isdigit():
+        return int(column)
+    if header is None:
+        raise ValueError(f"Column '{column}' given by name, but the file has no header row")
+
+    names = [name.strip().lower() for name in header]
+    if column.strip().lower() not in names:
+        raise ValueError(f"Column '{column}' not found in header: {', '.join(header)}")
+    return names.index(column.strip().lower())
+
+
+def iter_cards(rows, term_column=0, definition_column=1, section_column=None,
+               has_header=None, default_section=DEFAULT_SECTION, section_splitter=None):
+    """
+    Map rows of cells to (section, term, definition) tuples.
+
+    Args:
+        rows (iterable): Rows as lists of cell strings
+        term_column (int or str): Index or header name of the term column
+        definition_column (int or str): Index or header name of the definition column
+        section_column (int or str, optional): Index or header name of the section column
+        has_header (bool, optional): Whether the first row holds column names;
+            assumed when a column is given by name, otherwise guessed from
+            its contents when None
+        default_section (str): Section for rows without one
+        section_splitter (callable, optional): Turns a section cell into a
+            section name, e.g. picking the first of several Anki tags
+
+    Yields:
+        tuple: (section, term, definition)
+    """
+    rows = iter(rows)
+    header = None
+
+    first = next(rows, None)
+    if first is None:
+        return
+    if has_header is None:
+        named = any(isinstance(column, str) and not column.isdigit()
+                    for column in (term_column, definition_column, section_column))
+        has_header = named or any(cell.strip().lower() in _HEADER_NAMES for cell in first)
+    if has_header:
+        header = first
+    else:
+        rows = _prepend(first, rows)
+
+    term_index = _resolve_column(term_column, header)
+    definition_index = _resolve_column(definition_column, header)
+    section_index = _resolve_column(section_column, header)
+    needed = max(i for i in (term_index, definition_index, section_index) if i is not None)
+
+    for row in rows:
+        if len(row) <= needed:
+            row = row + [''] * (needed + 1 - len(row))
+
+        term = row[term_index].strip()
+        definition = row[definition_index].strip()
+        if not term or not definition:
+            continue
+
+        section = row[section_index].strip() if section_index is not None else ''
+        if section and section_splitter:
+            section = section_splitter(section)
+        yield section or default_section, term, definition
+
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+
+def write_cards(cards, output_path, title=None):
+    """
+    Stream (section, term, definition) tuples into a .libdict file.
+
+    Args:
+        cards (iterable): (section, term, definition) tuples
+        output_path (str): Path to save the .libdict file
+        title (str, optional): Deck title, defaults to the file name
+
+    Returns:
+        str: Path to the saved file
+    """
+    with LibdictWriter(output_path, title=title) as writer:
+        for section, term, definition in cards:
+            writer.add(section, term, definition)
+
+    print(f"Imported {writer.card_count} cards into {writer.output_path}")
+    return writer.output_path
+
+
+def import_delimited(file_path, output_path, delimiter=None, term_column=0,
+                     definition_column=1, section_column=None, has_header=None,
+                     default_section=DEFAULT_SECTION, title=None):
+    """
+    Import a CSV or TSV spreadsheet export into a .libdict file.
+
+    Rows are streamed with the csv module and written incrementally, so
+    files of any size import in constant memory.
+
+    Args:
+        file_path (str): Path to the CSV/TSV file
+        output_path (str): Path to save the .libdict file
+        delimiter (str, optional): Cell delimiter, guessed when omitted
+        term_column (int or str): Index or header name of the term column
+        definition_column (int or str): Index or header name of the definition column
+        section_column (int or str, optional): Index or header name of the section column
+        has_header (bool, optional): Whether the first row holds column names
+        default_section (str): Section for rows without one
+        title (str, optional): Deck title, defaults to the file name
+
+    Returns:
+        str: Path to the saved file
+    """
+    if delimiter is None:
+        default = '\t' if file_path.lower().endswith(('.tsv', '.txt')) else ','
+        delimiter = _sniff_delimiter(file_path, default)
+
+    try:
+        with _open_text(file_path) as f:
+            rows = csv.reader(f, delimiter=delimiter)
+            cards = iter_cards(rows, term_column, definition_column, section_column,
+                               has_header, default_section)
+            return write_cards(cards, output_path, title)
+    except (OSError, csv.Error, ValueError) as e:
+        raise Exception(f"Error importing {os.path.basename(file_path)}: {str(e)}")
+
+
+def _clean_anki_field(text, is_html):
+    if is_html:
+        text = html.unescape(_HTML_TAG_RE.sub('', _HTML_BREAK_RE.sub(' ', text)))
+    return text
+
+
+def _nth_field(n, metadata_columns):
+    """Index of the n-th note field, counting only columns that are not metadata"""
+    index = 0
+    while True:
+        if index not in metadata_columns:
+            if n == 0:
+                return index
+            n -= 1
+        index += 1
+
+
+def _anki_section(cell, from_deck):
+    if from_deck:
+        return cell.split('::')[-1].strip()  # Innermost deck of "Parent::Child"
+    tags = cell.split()
+    return tags[0] if tags else ''
+
+
+def import_anki(file_path, output_path, term_column=0, definition_column=1,
+                default_section=DEFAULT_SECTION, title=None):
+    """
+    Import an Anki "Notes in Plain Text" export into a .libdict file.
+
+    Honors the export's "#separator:", "#html:" and "#guid column:",
+    "#notetype column:", "#deck column:" and "#tags column:" header lines.
+    The first tag of each note becomes its section, or its deck when the
+    export has no tags column.
+
+    Args:
+        file_path (str): Path to the exported .txt file
+        output_path (str): Path to save the .libdict file
+        term_column (int): Index of the front field, not counting metadata columns
+        definition_column (int): Index of the back field, not counting metadata columns
+        default_section (str): Section for notes without tags
+        title (str, optional): Deck title, defaults to the file name
+
+    Returns:
+        str: Path to the saved file
+    """
+    delimiter = '\t'
+    is_html = False
+    metadata = {}  # Header name -> zero-based column index
+
+    try:
+        with _open_text(file_path) as f:
+            # Anki puts its settings in leading "#key:value" lines
+            first_line = ''
+            for line in f:
+                if not line.startswith('#'):
+                    first_line = line
+                    break
+                key, _, value = line[1:].strip().partition(':')
+                key = key.strip().lower()
+                value = value.strip()
+                if key == 'separator':
+                    delimiter = _ANKI_SEPARATORS.get(value.lower(), value[:1] or '\t')
+                elif key == 'html':
+                    is_html = value.lower() == 'true'
+                elif key in _ANKI_COLUMN_HEADERS and value.isdigit():
+                    metadata[key] = int(value) - 1
+
+            from_deck = 'tags column' not in metadata
+            section_column = metadata.get('tags column', metadata.get('deck column'))
+            metadata_columns = set(metadata.values())
+
+            rows = csv.reader(_prepend(first_line, f) if first_line else f, delimiter=delimiter)
+            rows = ([_clean_anki_field(cell, is_html) for cell in row] for row in rows)
+            cards = iter_cards(rows, _nth_field(term_column, metadata_columns),
+                               _nth_field(definition_column, metadata_columns), section_column,
+                               has_header=False, default_section=default_section,
+                               section_splitter=lambda cell: _anki_section(cell, from_deck))
+            return write_cards(cards, output_path, title)
+    except (OSError, csv.Error, ValueError) as e:
+        raise Exception(f"Error importing {os.path.basename(file_path)}: {str(e)}")
+
+
+def _iter_records(f, separator, chunk_size=65536):
+    """
+    Split a text stream on an arbitrary separator without reading it whole.
+
+    Args:
+        f (file): Text file object
+        separator (str): Record separator
+        chunk_size (int): Characters to read at a time
+
+    Yields:
+        str: One record
+    """
+    buffer = ''
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        records = buffer.split(separator)
+        buffer = records.pop()
+        yield from records
+    if buffer:
+        yield buffer
+
+
+def import_quizlet(file_path, output_path, term_separator='\t', card_separator='\n',
+                   section=DEFAULT_SECTION, title=None):
+    """
+    Import a Quizlet set export into a .libdict file.
+
+    Quizlet exports one card per record, with configurable separators
+    between term and definition and between cards. The default tab and
+    newline separators are read with the csv module.
+
+    Args:
+        file_path (str): Path to the exported text file
+        output_path (str): Path to save the .libdict file
+        term_separator (str): Separator between term and definition
+        card_separator (str): Separator between cards
+        section (str): Section to put the cards in
+        title (str, optional): Deck title, defaults to the file name
+
+    Returns:
+        str: Path to the saved file
+    """
+    try:
+        with _open_text(file_path) as f:
+            if card_separator in ('\n', '\r\n') and len(term_separator) == 1:
+                rows = csv.reader(f, delimiter=term_separator, quoting=csv.QUOTE_NONE)
+            else:
+                rows = (record.strip('\r\n').split(term_separator, 1)
+                        for record in _iter_records(f, card_separator))
+            cards = iter_cards(rows, has_header=False, default_section=section)
+            return write_cards(cards, output_path, title)
+    except (OSError, csv.Error, ValueError) as e:
+        raise Exception(f"Error importing {os.path.basename(file_path)}: {str(e)}")
+
+
+# Format name -> importer; all take (file_path, output_path, **options)
+IMPORTERS = {
+    'csv': lambda path, output, **options: import_delimited(path, output, delimiter=',', **options),
+    'tsv': lambda path, output, **options: import_delimited(path, output, delimiter='\t', **options),
+    'anki': import_anki,
+    'quizlet': import_quizlet
+}
+
+
+def detect_format(file_path):
+    """
+    Guess the import format of a file from its extension and first line.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        str: One of the IMPORTERS keys
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension == '.tsv':
+        return 'tsv'
+
+    with _open_text(file_path) as f:
+        first_line = f.readline()
+    if first_line.startswith(('#separator:', '#html:', '#tags column:', '#notetype')):
+        return 'anki'
+    return 'quizlet'
+
+
+def import_file(file_path, output_path, file_format=None, **options):
+    """
+    Import a spreadsheet or flashcard-app export, picking the importer
+    from the file when no format is given.
+
+    Args:
+        file_path (str): Path to the file to import
+        output_path (str): Path to save the .libdict file
+        file_format (str, optional): 'csv', 'tsv', 'anki' or 'quizlet'
+        **options: Passed through to the importer (column mapping etc.)
+
+    Returns:
+        str: Path to the saved file
+    """
+    file_format = file_format or detect_format(file_path)
+    if file_format not in IMPORTERS:
+        raise ValueError(f"Unknown import format '{file_format}'")
+    return IMPORTERS[file_format](file_path, output_path, **options)
@@ -0,0 +1,643 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+# Edits to a deck are appended to a side file next to it (deck.libdict.journal)
+# and folded back into the deck by compaction.
+JOURNAL_SUFFIX = '.journal'
+
+# Every rewrite of a deck gets a higher "generation" in its header, and each
+# journaled edit records the generation it was made against. Edits older than
+# the deck are already part of it (a crash can leave the journal behind after
+# compaction) and are skipped on replay.
+
+# Cards are saved with their normalized text (term_key, definition_key) so
+# loading skips normalize_word. Bump when normalize_word changes; keys
+# saved under another version are recomputed on load.
+NORMALIZER_VERSION = 1
+
+
+def normalize_word(word):
+    """
+    Normalize a word by removing text in parentheses and trimming whitespace.
+
+    Args:
+        word (str): The word to normalize.
+
+    Returns:
+        str: The normalized word.
+    """
+    return re.sub(r'\s*\(.*?\)', '', word).strip().lower()
+
+
+def keyed_card(item):
+    """
+    Add the normalized keys to a card.
+
+    Args:
+        item (dict): Card with 'term' and 'definition' display text
+
+    Returns:
+        dict: Copy of the card with 'term_key' and 'definition_key'
+    """
+    card = {key: value for key, value in item.items() if key not in ('term_key', 'definition_key')}
+    card['term_key'] = normalize_word(item.get('term', ''))
+    card['definition_key'] = normalize_word(item.get('definition', ''))
+    return card
+
+
+@contextmanager
+def atomic_write(output_path, newline=None, binary=False):
+    """
+    Open a temporary file next to output_path for writing and rename it over
+    output_path once the block finishes, so readers never see a partial file.
+
+    Args:
+        output_path (str): Final path of the file
+        newline (str, optional): Passed to open(); use '' for csv writers
+        binary (bool): Open the file in binary mode instead of UTF-8 text
+
+    Yields:
+        file: File object opened for writing
+    """
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(output_path) + '.',
+                                    suffix='.tmp',
+                                    dir=directory)
+    try:
+        if binary:
+            f = os.fdopen(fd, 'wb')
+        else:
+            f = os.fdopen(fd, 'w', encoding='utf-8', newline=newline)
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def journal_path(deck_path):
+    """
+    Get the path of the edit journal belonging to a deck.
+
+    Args:
+        deck_path (str): Path to the .libdict file
+
+    Returns:
+        str: Path to the journal file
+    """
+    return deck_path + JOURNAL_SUFFIX
+
+
+def write_libdict(data, output_path):
+    """
+    Atomically write a complete .libdict document and drop any stale journal,
+    since its edits refer to the content being replaced.
+
+    Every card is written with its display text and its normalized keys,
+    and the header records the NORMALIZER_VERSION the keys were made with.
+    The document gets a generation above every edit in the old journal, so
+    the journal is never replayed onto it even if removing it fails.
+
+    Args:
+        data (dict): The .libdict document
+        output_path (str): Path to save the file
+
+    Returns:
+        str: Path to the saved file
+    """
+    header = ('sections', 'generation', 'normalizer_version')
+    document = {key: value for key, value in data.items() if key not in header}
+    document['generation'] = next_generation(output_path, data.get('generation', 0))
+    document['normalizer_version'] = NORMALIZER_VERSION
+    document['sections'] = {section: [keyed_card(item) for item in items]
+                            for section, items in data.get('sections', {}).items()}
+
+    with atomic_write(output_path) as f:
+        json.dump(document, f, indent=2)
+
+    stale = journal_path(output_path)
+    if os.path.exists(stale):
+        os.remove(stale)
+    return output_path
+
+
+def apply_journal_op(sections, op):
+    """
+    Apply a single journaled edit to the raw sections of a .libdict document.
+
+    Args:
+        sections (dict): Section name -> list of {'term', 'definition'} items
+        op (dict): The edit, as written by DeckJournal.append
+    """
+    kind = op['op']
+    section = op['section']
+
+    if kind == 'add_section':
+        sections.setdefault(section, [])
+    elif kind == 'delete_section':
+        sections.pop(section, None)
+    elif kind == 'add_card':
+        sections.setdefault(section, []).append({
+            'term': op['term'],
+            'definition': op['definition']
+        })
+    elif kind == 'update_card':
+        item = sections[section][op['index']]
+        for field in ('term', 'definition'):
+            if field in op:
+                item[field] = op[field]
+                item.pop(field + '_key', None)  # Saved key is stale now
+    elif kind == 'delete_card':
+        del sections[section][op['index']]
+    else:
+        raise ValueError(f"Unknown journal operation: {kind}")
+
+
+class DeckJournal:
+    """
+    Append-only log of edits made to a .libdict file.
+
+    Each edit is one JSON object per line, stamped with the deck's
+    generation and flushed to disk before append() returns. A torn final
+    line left behind by a crash is ignored on replay and cut off before
+    the next append.
+    """
+
+    def __init__(self, deck_path, generation=None):
+        """
+        Args:
+            deck_path (str): Path to the .libdict file
+            generation (int, optional): Generation of the deck file, read
+                from its header when needed if omitted
+        """
+        self.deck_path = deck_path
+        self.path = journal_path(deck_path)
+        self._generation = generation
+        self._file = None
+        self.op_count = sum(1 for _ in self.read()) if os.path.exists(self.path) else 0
+
+    @property
+    def generation(self):
+        """Generation of the deck file the journal applies to."""
+        if self._generation is None:
+            self._generation = read_generation(self.deck_path) if os.path.exists(self.deck_path) else 0
+        return self._generation
+
+    @generation.setter
+    def generation(self, value):
+        self._generation = value
+
+    def read(self):
+        """
+        Iterate over the journaled edits in the order they were made,
+        skipping those already part of the deck file.
+
+        Yields:
+            dict: One edit operation
+        """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # Interrupted write, the edit never completed
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    break
+                if op.get('generation', 0) >= self.generation:
+                    yield op
+
+    def _drop_torn_line(self):
+        """
+        Cut an interrupted final write off the journal, so the next edit
+        starts on a line of its own instead of being glued onto it.
+        """
+        try:
+            f = open(self.path, 'rb+')
+        except FileNotFoundError:
+            return
+
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                step = min(4096, position)
+                f.seek(position - step)
+                newline = f.read(step).rfind(b'\n')
+                position -= step
+                if newline >= 0:
+                    position += newline + 1
+                    break
+            if position < end:
+                f.truncate(position)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def append(self, op):
+        """
+        Durably append an edit to the journal.
+
+        Args:
+            op (dict): The edit operation
+        """
+        if self._file is None:
+            self._drop_torn_line()
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+        op = dict(op, generation=self.generation)
+        self._file.write(json.dumps(op, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.op_count += 1
+
+    def close(self):
+        """Close the journal file handle if it is open."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        """Remove the journal once its edits are part of the deck file."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.op_count = 0
+
+
+def deck_hash(file_path):
+    """
+    Hash the content of a deck, including edits still in its journal.
+
+    Args:
+        file_path (str): Path to the .libdict file
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for path in (file_path, journal_path(file_path)):
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def read_libdict(file_path):
+    """
+    Read a .libdict document with any journaled edits applied.
+
+    Args:
+        file_path (str): Path to the .libdict file
+
+    Returns:
+        dict: The .libdict document
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    sections = data.setdefault('sections', {})
+    for op in DeckJournal(file_path, data.get('generation', 0)).read():
+        apply_journal_op(sections, op)
+    return data
+
+
+class _JSONStream:
+    """
+    Reads JSON values one at a time from a text file through a bounded
+    buffer, for walking large documents without loading them whole.
+    """
+
+    _WHITESPACE_RE = re.compile(r'\s*')
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, f, chunk_size=65536):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            self.pos = self._WHITESPACE_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def take(self, expected):
+        """Consume the next non-whitespace character, which must be one of expected."""
+        char = self.peek()
+        if not char or char not in expected:
+            raise ValueError(f"Malformed .libdict file: expected {expected!r}, found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number running into the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def read_generation(file_path):
+    """
+    Read the generation of a .libdict file from its header.
+
+    Files written by this module put the generation before the cards, so
+    only the first few lines are read; other files are read whole.
+
+    Args:
+        file_path (str): Path to the .libdict file
+
+    Returns:
+        int: The generation, 0 for files without one
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        stream = _JSONStream(f)
+        stream.take('{')
+        if stream.peek() == '}':
+            return 0
+
+        while True:
+            key = stream.value()
+            stream.take(':')
+            if key == 'sections':
+                break
+            value = stream.value()
+            if key == 'generation':
+                return value
+            if stream.take(',}') == '}':
+                return 0
+
+    # Header fields after the cards, e.g. in a hand-written file
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('generation', 0)
+
+
+def next_generation(file_path, generation=0):
+    """
+    Pick the generation for a rewrite of a deck: above the given one and
+    above every edit still in the deck's journal.
+
+    Args:
+        file_path (str): Path to the .libdict file
+        generation (int): Generation of the content being written
+
+    Returns:
+        int: The new generation
+    """
+    journaled = (op.get('generation', 0) for op in DeckJournal(file_path, 0).read())
+    return max(generation, max(journaled, default=0)) + 1
+
+
+def iter_libdict(file_path):
+    """
+    Stream the cards of a .libdict file without loading the whole document.
+
+    Memory use is bounded by the largest single card. Decks with pending
+    journaled edits are read whole so that the edits apply; compact them
+    first to keep streaming.
+
+    Args:
+        file_path (str): Path to the .libdict file
+
+    Yields:
+        tuple: (section name, {'term', 'definition'} item) in file order
+    """
+    if os.path.exists(journal_path(file_path)):
+        for section, items in read_libdict(file_path).get('sections', {}).items():
+            for item in items:
+                yield section, item
+        return
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        stream = _JSONStream(f)
+        stream.take('{')
+        if stream.peek() == '}':
+            return
+
+        while True:
+            key = stream.value()
+            stream.take(':')
+            if key != 'sections':
+                stream.value()
+            else:
+                stream.take('{')
+                if stream.peek() == '}':
+                    stream.take('}')
+                else:
+                    while True:
+                        section = stream.value()
+                        stream.take(':')
+                        stream.take('[')
+                        if stream.peek() == ']':
+                            stream.take(']')
+                        else:
+                            while True:
+                                yield section, stream.value()
+                                if stream.take(',]') == ']':
+                                    break
+                        if stream.take(',}') == '}':
+                            break
+
+            if stream.take(',}') == '}':
+                return
+
+
+def compact_libdict(file_path, journal=None):
+    """
+    Fold a deck's journal into the deck file with an atomic rewrite.
+
+    Args:
+        file_path (str): Path to the .libdict file
+        journal (DeckJournal, optional): Open journal for the file, if any
+
+    Returns:
+        str: Path to the compacted file
+    """
+    if journal is not None:
+        journal.close()
+
+    data = read_libdict(file_path)
+    write_libdict(data, file_path)
+
+    if journal is not None:
+        journal.op_count = 0
+        journal.generation = None  # Read again from the rewritten deck
+    return file_path
+
+
+class LibdictWriter:
+    """
+    Writes a .libdict file incrementally, one card at a time.
+
+    Cards are spooled to a temporary file per section and stitched into the
+    final document on close(), so memory use does not grow with the number
+    of cards. The output matches json.dump(..., indent=2) of the same data
+    and replaces the target atomically.
+
+    Usage:
+        with LibdictWriter('deck.libdict', title='Deck') as writer:
+            writer.add('nouns', 'pestis, pestis', 'pest')
+    """
+
+    MAX_OPEN_SPOOLS = 32
+
+    def __init__(self, output_path, title=None, sections=None):
+        """
+        Args:
+            output_path (str): Path to save the .libdict file
+            title (str, optional): Deck title, defaults to the file name
+            sections (list, optional): Sections to create up front, in order
+        """
+        if not output_path.endswith('.libdict'):
+            output_path += '.libdict'
+
+        self.output_path = output_path
+        self.title = title or os.path.basename(output_path).replace('.libdict', '')
+        self.card_count = 0
+        self._spool_dir = tempfile.mkdtemp(prefix='libdict-')
+        self._sections = {}  # Section name -> [spool path, card count]
+        self._open_spools = {}  # Section name -> file, oldest first
+
+        for section in sections or []:
+            self.add_section(section)
+
+    def add_section(self, section):
+        """
+        Make sure a section exists, even if it stays empty.
+
+        Args:
+            section (str): Section name
+        """
+        if section not in self._sections:
+            path = os.path.join(self._spool_dir, f"{len(self._sections)}.part")
+            self._sections[section] = [path, 0]
+
+    def _spool(self, section):
+        spool = self._open_spools.pop(section, None)
+        if spool is None:
+            if len(self._open_spools) >= self.MAX_OPEN_SPOOLS:
+                oldest = next(iter(self._open_spools))
+                self._open_spools.pop(oldest).close()
+            spool = open(self._sections[section][0], 'a', encoding='utf-8')
+        self._open_spools[section] = spool  # Re-insert as most recently used
+        return spool
+
+    def add(self, section, term, definition):
+        """
+        Append a card to a section.
+
+        Args:
+            section (str): Section name
+            term (str): Term of the card
+            definition (str): Definition of the card
+        """
+        self.add_section(section)
+        entry = self._sections[section]
+        item = json.dumps(keyed_card({'term': term, 'definition': definition}), indent=2)
+
+        spool = self._spool(section)
+        if entry[1]:
+            spool.write(',\n')
+        spool.write('      ' + item.replace('\n', '\n      '))
+        entry[1] += 1
+        self.card_count += 1
+
+    def _discard_spools(self):
+        for spool in self._open_spools.values():
+            spool.close()
+        self._open_spools.clear()
+        shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+    def close(self):
+        """
+        Assemble the spooled sections into the output file.
+
+        Returns:
+            str: Path to the saved file
+        """
+        for spool in self._open_spools.values():
+            spool.close()
+        self._open_spools.clear()
+
+        try:
+            generation = next_generation(self.output_path)
+            with atomic_write(self.output_path) as f:
+                f.write('{\n')
+                f.write('  "format_version": "1.0",\n')
+                f.write(f'  "title": {json.dumps(self.title)},\n')
+                f.write(f'  "generation": {generation},\n')
+                f.write(f'  "normalizer_version": {NORMALIZER_VERSION},\n')
+                if not self._sections:
+                    f.write('  "sections": {}\n}')
+                else:
+                    f.write('  "sections": {\n')
+                    for i, (section, (path, count)) in enumerate(self._sections.items()):
+                        f.write(f'    {json.dumps(section)}: ')
+                        if count:
+                            f.write('[\n')
+                            with open(path, 'r', encoding='utf-8') as part:
+                                shutil.copyfileobj(part, f)
+                            f.write('\n    ]')
+                        else:
+                            f.write('[]')
+                        f.write(',\n' if i < len(self._sections) - 1 else '\n')
+                    f.write('  }\n}')
+        finally:
+            self._discard_spools()
+
+        stale = journal_path(self.output_path)
+        if os.path.exists(stale):
+            os.remove(stale)
+        return self.output_path
+
+    def abort(self):
+        """Discard everything written so far without touching the output file."""
+        self._discard_spools()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
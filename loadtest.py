@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import json
+import time
+from deck_server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class Client:
+    """Minimal keep-alive HTTP/1.1 JSON client for the deck server."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, body=None):
+        """
+        Send one request and wait for its response.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+            body (dict, optional): JSON body
+
+        Returns:
+            tuple: (status, decoded JSON response)
+        """
+        data = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ', 2)[1])
+        length = 0
+        for line in lines[1:]:
+            key, _, value = line.partition(':')
+            if key.strip().lower() == 'content-length':
+                length = int(value)
+        payload = await self.reader.readexactly(length)
+        return status, json.loads(payload) if payload else None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def run_client(host, port, deck, requests, latencies, errors):
+    """
+    Run one simulated learner: open a session, then alternate answers and
+    card moves the way the study tab does.
+    """
+    client = Client(host, port)
+    await client.connect()
+    try:
+        status, state = await client.request('POST', '/sessions', {'deck': deck, 'remove_on_correct': False})
+        if status != 201:
+            errors.append(state)
+            return
+        session = f"/sessions/{state['session']}"
+
+        for i in range(requests):
+            card = state.get('card') or {}
+            step = i % 4
+            if step == 0:
+                # Right answer every other round, wrong otherwise
+                answer = card.get('definition', '') if i % 8 == 0 else 'wrong'
+                request = ('POST', session + '/check', {'answer': answer})
+            elif step == 1:
+                request = ('POST', session + '/next', None)
+            elif step == 2:
+                request = ('GET', session, None)
+            else:
+                request = ('POST', session + '/previous', None) if i % 40 else ('POST', session + '/shuffle', None)
+
+            start = time.perf_counter()
+            status, response = await client.request(*request)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(response)
+            elif response:
+                state = response
+        await client.request('DELETE', session)
+    finally:
+        client.close()
+
+
+def percentile(sorted_values, fraction):
+    """
+    Get a percentile from sorted values (nearest rank).
+
+    Args:
+        sorted_values (list): Values in ascending order
+        fraction (float): Percentile as a fraction, e.g. 0.99
+
+    Returns:
+        float: The value, or 0.0 if there are none
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+async def load_test(host, port, deck, clients, requests):
+    """
+    Run concurrent clients against a deck server.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        deck (str): Deck name to open sessions on
+        clients (int): Number of concurrent learners
+        requests (int): Requests per learner, after creating its session
+
+    Returns:
+        dict: Request count, errors, elapsed seconds, rate and latency percentiles
+    """
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, deck, requests, latencies, errors)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'elapsed': elapsed,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': (latencies[-1] if latencies else 0.0) * 1000
+    }
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Load-test a running deck server.")
+    arg_parser.add_argument('--deck', required=True, help="Deck name inside the server's deck directory")
+    arg_parser.add_argument('--host', default=DEFAULT_HOST)
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument('--clients', type=int, default=50, help="Concurrent learners")
+    arg_parser.add_argument('--requests', type=int, default=200, help="Requests per learner")
+    args = arg_parser.parse_args()
+
+    result = asyncio.run(load_test(args.host, args.port, args.deck, args.clients, args.requests))
+    print(f"{result['requests']} requests from {args.clients} clients in {result['elapsed']:.2f}s")
+    print(f"  {result['rps']:.0f} requests/s")
+    print(f"  p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms")
+    if result['errors']:
+        print(f"  {result['errors']} error responses")
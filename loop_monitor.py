@@ -0,0 +1,151 @@
+import functools
+import time
+
+
+class LoopMonitor:
+    """
+    Measures how responsive the Tk event loop is and finds the handlers
+    that block it.
+
+    A timer is scheduled with root.after() every interval; the delay between
+    when it should fire and when it actually fires is the loop latency, i.e.
+    how long a click or key press would have waited. Wrapped handlers are
+    timed on every call, and any call or loop stall longer than the
+    threshold is logged.
+    """
+
+    def __init__(self, root, threshold_ms=100, interval_ms=100, on_update=None, log=print):
+        """
+        Args:
+            root: Tk root window
+            threshold_ms (float): Handler duration or loop latency worth logging
+            interval_ms (int): How often the loop latency is sampled
+            on_update (callable, optional): on_update(current_ms, max_ms)
+                called after each sample
+            log (callable): Receives one message per slow handler or stall
+        """
+        self.root = root
+        self.threshold = threshold_ms / 1000
+        self.interval_ms = interval_ms
+        self.on_update = on_update
+        self.log = log
+
+        self.current_ms = 0.0  # Latency of the last sample
+        self.max_ms = 0.0  # Largest latency since start or reset_max()
+        self.handler_stats = {}  # Handler name -> [calls, total seconds, max seconds]
+        self._stack = []  # Names of the wrapped handlers currently running
+        self._since_tick = {}  # Handler name -> [calls, seconds] since the last sample
+        self._expected = None
+        self._job = None
+
+    # --- Loop latency ---
+
+    def start(self):
+        """Start sampling the loop latency."""
+        if self._job is None:
+            self._schedule()
+
+    def stop(self):
+        """Stop sampling the loop latency."""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def reset_max(self):
+        """Forget the largest latency seen so far."""
+        self.max_ms = self.current_ms
+
+    def _schedule(self):
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self._job = self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        drift = max(0.0, time.perf_counter() - self._expected)
+        self.current_ms = drift * 1000
+        self.max_ms = max(self.max_ms, self.current_ms)
+
+        if drift >= self.threshold:
+            self.log(f"Event loop blocked for {self.current_ms:.0f} ms "
+                     f"({self._describe_since_tick()})")
+        self._since_tick.clear()
+
+        if self.on_update:
+            self.on_update(self.current_ms, self.max_ms)
+        self._schedule()
+
+    def _describe_since_tick(self):
+        if not self._since_tick:
+            return "outside monitored handlers"
+        # Name the handlers that took the most time, with their call counts,
+        # so a storm of short calls is as visible as one long call
+        busiest = sorted(self._since_tick.items(), key=lambda item: -item[1][1])[:3]
+        return "during " + ", ".join(f"{name} x{calls} {seconds * 1000:.0f} ms"
+                                     for name, (calls, seconds) in busiest)
+
+    # --- Handler timing ---
+
+    def wrap(self, func, name=None):
+        """
+        Time every call of a handler.
+
+        Args:
+            func (callable): The handler
+            name (str, optional): Name used in logs, defaults to the function's
+
+        Returns:
+            callable: Wrapped handler with the same signature
+        """
+        name = name or getattr(func, '__name__', repr(func))
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            self._stack.append(name)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._stack.pop()
+                self._count(name, elapsed)
+
+        return timed
+
+    def _count(self, name, elapsed):
+        stats = self.handler_stats.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+
+        # Only outermost calls count towards a stall, so nested handlers
+        # are not added twice
+        if not self._stack:
+            recent = self._since_tick.setdefault(name, [0, 0.0])
+            recent[0] += 1
+            recent[1] += elapsed
+
+        if elapsed >= self.threshold:
+            caller = f" (inside {self._stack[-1]})" if self._stack else ""
+            self.log(f"Slow handler {name}{caller}: {elapsed * 1000:.0f} ms")
+
+    def instrument(self, obj, names):
+        """
+        Replace methods of an object with timed versions. Must run before
+        the methods are handed to widgets as callbacks.
+
+        Args:
+            obj: Object whose methods are wrapped
+            names (iterable): Method names
+        """
+        for name in names:
+            setattr(obj, name, self.wrap(getattr(obj, name), name))
+
+    def report(self):
+        """
+        Get per-handler timings, slowest total first.
+
+        Returns:
+            list: (name, calls, total ms, max ms) tuples
+        """
+        rows = [(name, calls, total * 1000, longest * 1000)
+                for name, (calls, total, longest) in self.handler_stats.items()]
+        return sorted(rows, key=lambda row: -row[2])
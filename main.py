@@ -1,5 +1,7 @@
 import sys
 import os
+import argparse
+import multiprocessing
 import tkinter as tk
 
 
@@ -23,6 +25,13 @@ def main():
     - literal-gargoyle
     """
 
+    arg_parser = argparse.ArgumentParser(description="Vocabulary flashcard study tool.")
+    arg_parser.add_argument('--monitor', nargs='?', type=float, const=100, metavar='MS',
+                            default=os.environ.get('LIBDICT_MONITOR_MS'),
+                            help="Log GUI handlers and event-loop stalls longer than MS "
+                                 "milliseconds (default 100) and show loop latency in the status bar")
+    args, _ = arg_parser.parse_known_args()
+
     root = tk.Tk()
     root.title("libdict")
     
@@ -40,10 +49,12 @@ def main():
         print(f"Icon file not found: {icon_path}")
 
     # Initialize the application
-    app = VocabApp(root)
+    app = VocabApp(root, monitor_threshold_ms=float(args.monitor) if args.monitor is not None else None)
     
     # Start the Tkinter event loop
     root.mainloop()
 
 if __name__ == "__main__":
+    # PDF extraction runs in worker processes, which frozen builds must support
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
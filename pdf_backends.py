@@ -0,0 +1,1303 @@
+import base64
+import binascii
+import difflib
+import hashlib
+import multiprocessing
+import re
+import time
+import unicodedata
+import zlib
+from collections import namedtuple
+
+
+class UnsupportedPDFError(Exception):
+    """
+    Raised when a backend cannot extract text from a particular PDF,
+    e.g. the built-in extractor meeting encryption or an unknown filter.
+    """
+
+
+class PageExtractionError(Exception):
+    """
+    Raised when one page could not be extracted but the rest of the
+    document can still be read, e.g. the isolated worker crashed on it.
+    """
+
+    def __init__(self, message, page_number=None):
+        super().__init__(message)
+        self.page_number = page_number
+
+
+class ExtractionTimeoutError(PageExtractionError):
+    """
+    Raised when extraction ran out of time. budget is 'page' when one page
+    took too long, or 'document' when the time for the whole file is used up.
+    """
+
+    def __init__(self, message, page_number=None, budget='page'):
+        super().__init__(message, page_number)
+        self.budget = budget
+
+
+class ExtractedDocument:
+    """
+    An open PDF as seen by an extraction backend.
+    Pages are addressed by zero-based page number.
+    """
+
+    backend = None  # Name of the backend that opened the document
+    warnings = ()  # Problems met while opening, such as backends that failed first
+
+    @property
+    def page_count(self):
+        """int: Number of pages in the document."""
+        raise NotImplementedError
+
+    def extract_text(self, page_number):
+        """
+        Extract the text of one page.
+
+        Args:
+            page_number (int): Zero-based page number
+
+        Returns:
+            str: Text of the page, one output line per text line
+        """
+        raise NotImplementedError
+
+    def page_fingerprint(self, page_number):
+        """
+        Hash what a page's text is extracted from: its content streams and
+        the fonts they use. Unchanged pages keep their fingerprint, so their
+        earlier parse output can be reused without extracting them again.
+
+        Args:
+            page_number (int): Zero-based page number
+
+        Returns:
+            str: Hex digest, or None if the backend cannot tell cheaply
+        """
+        return None
+
+    def close(self):
+        """Release any resources held by the document."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ExtractionBackend:
+    """
+    Base class for PDF text-extraction backends.
+
+    Subclasses set a unique `name`, report whether their library can be
+    imported and open PDFs as ExtractedDocument objects.
+    """
+
+    name = None
+
+    @classmethod
+    def is_available(cls):
+        """
+        Check whether the backend can be used in this environment.
+
+        Returns:
+            bool: True if the backend's dependencies are installed
+        """
+        return True
+
+    def open(self, pdf_path):
+        """
+        Open a PDF for text extraction.
+
+        Args:
+            pdf_path (str): Path to the PDF file
+
+        Returns:
+            ExtractedDocument: The opened document
+        """
+        raise NotImplementedError
+
+
+# --- Library backends ---
+
+def _feed_pypdf2_object(digest, value, depth=0):
+    """Add a PyPDF2 object to a hash, skipping embedded font programs and images."""
+    if hasattr(value, 'get_object'):
+        value = value.get_object()
+    if depth > 16 or value is None:
+        return
+    if isinstance(value, dict) and value.get('/Subtype') == '/Image':
+        digest.update(b'image ')  # Images hold no text
+        return
+    if hasattr(value, 'get_data'):
+        digest.update(value.get_data())
+    if isinstance(value, dict):
+        digest.update(b'<<')
+        for key in sorted(value):
+            if key == '/FontDescriptor':
+                continue
+            digest.update(str(key).encode('utf-8', 'replace') + b' ')
+            _feed_pypdf2_object(digest, value[key], depth + 1)
+        digest.update(b'>>')
+    elif isinstance(value, list):
+        digest.update(b'[')
+        for item in value:
+            _feed_pypdf2_object(digest, item, depth + 1)
+        digest.update(b']')
+    else:
+        digest.update(repr(value).encode('utf-8', 'replace') + b' ')
+
+
+class _PyPDF2Document(ExtractedDocument):
+    backend = 'pypdf2'
+
+    def __init__(self, pdf_path):
+        from PyPDF2 import PdfReader
+        self.reader = PdfReader(pdf_path)
+
+    @property
+    def page_count(self):
+        return len(self.reader.pages)
+
+    def extract_text(self, page_number):
+        return self.reader.pages[page_number].extract_text()
+
+    def page_fingerprint(self, page_number):
+        page = self.reader.pages[page_number]
+        digest = hashlib.sha256()
+        contents = page.get_contents()
+        digest.update(contents.get_data() if contents is not None else b'')
+        digest.update(repr(page.get('/Rotate')).encode())
+        resources = page.get('/Resources')
+        resources = resources.get_object() if resources is not None else {}
+        _feed_pypdf2_object(digest, resources.get('/Font'))
+        # Form XObjects drawn with Do carry text of their own, along with
+        # their own fonts and nested forms
+        _feed_pypdf2_object(digest, resources.get('/XObject'))
+        return digest.hexdigest()
+
+
+class PyPDF2Backend(ExtractionBackend):
+    """Extraction through PyPDF2, the default backend."""
+
+    name = 'pypdf2'
+
+    @classmethod
+    def is_available(cls):
+        try:
+            import PyPDF2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def open(self, pdf_path):
+        return _PyPDF2Document(pdf_path)
+
+
+class _PyMuPDFDocument(ExtractedDocument):
+    backend = 'pymupdf'
+
+    def __init__(self, pdf_path):
+        import fitz
+        self.doc = fitz.open(pdf_path)
+
+    @property
+    def page_count(self):
+        return self.doc.page_count
+
+    def extract_text(self, page_number):
+        return self.doc[page_number].get_text()
+
+    def page_fingerprint(self, page_number):
+        page = self.doc[page_number]
+        digest = hashlib.sha256(page.read_contents())
+        digest.update(repr(page.rotation).encode())
+        for font in page.get_fonts():
+            xref = font[0]
+            digest.update(self.doc.xref_object(xref, compressed=True).encode())
+            kind, value = self.doc.xref_get_key(xref, 'ToUnicode')
+            if kind == 'xref':
+                digest.update(self.doc.xref_stream(int(value.split()[0])) or b'')
+        return digest.hexdigest()
+
+    def close(self):
+        self.doc.close()
+
+
+class PyMuPDFBackend(ExtractionBackend):
+    """Extraction through PyMuPDF (MuPDF bindings), used when installed."""
+
+    name = 'pymupdf'
+
+    @classmethod
+    def is_available(cls):
+        try:
+            import fitz  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def open(self, pdf_path):
+        return _PyMuPDFDocument(pdf_path)
+
+
+class _PdfiumDocument(ExtractedDocument):
+    backend = 'pdfium'
+
+    def __init__(self, pdf_path):
+        import pypdfium2
+        self.doc = pypdfium2.PdfDocument(pdf_path)
+
+    @property
+    def page_count(self):
+        return len(self.doc)
+
+    def extract_text(self, page_number):
+        page = self.doc[page_number]
+        try:
+            textpage = page.get_textpage()
+            try:
+                return textpage.get_text_range().replace('\r\n', '\n')
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+
+    def close(self):
+        self.doc.close()
+
+
+class PdfiumBackend(ExtractionBackend):
+    """Extraction through pypdfium2 (PDFium bindings), used when installed."""
+
+    name = 'pdfium'
+
+    @classmethod
+    def is_available(cls):
+        try:
+            import pypdfium2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def open(self, pdf_path):
+        return _PdfiumDocument(pdf_path)
+
+
+# --- Built-in content-stream extractor ---
+#
+# Enough of the PDF object model to find the pages of a simple text PDF,
+# decode their content streams and turn the text-showing operators into
+# lines. Anything beyond that (encryption, image-only filters, fonts
+# without a usable encoding) raises UnsupportedPDFError.
+
+_Ref = namedtuple('_Ref', 'num gen')
+
+
+class _Name(str):
+    """A PDF name object (stored without the leading slash)."""
+
+
+class _Op(str):
+    """A PDF keyword: an operator, or a delimiter such as '<<' or '['."""
+
+
+class _Stream:
+    def __init__(self, attrs, raw):
+        self.attrs = attrs
+        self.raw = raw
+
+
+_TOKEN_RE = re.compile(rb"""
+    (?P<skip>[\s\x00]+|%[^\r\n]*)
+  | /(?P<name>[^\s\x00()<>\[\]{}/%]*)
+  | (?P<delim><<|>>|[\[\]{}])
+  | <(?P<hex>[0-9A-Fa-f\s]*)>
+  | (?P<string>\()
+  | (?P<regular>[^\s\x00()<>\[\]{}/%]+)
+""", re.VERBOSE)
+_NUMBER_RE = re.compile(rb'[+-]?(?:\d+\.?\d*|\.\d+)$')
+_SIMPLE_STRING_RE = re.compile(rb'\(([^()\\]*)\)')
+_NAME_ESCAPE_RE = re.compile(rb'#([0-9A-Fa-f]{2})')
+_STRING_ESCAPES = {
+    ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b',
+    ord('f'): b'\f', ord('('): b'(', ord(')'): b')', ord('\\'): b'\\'
+}
+_EOF = object()
+
+
+class _Lexer:
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def _literal_string(self, pos):
+        # Fast path for strings without escapes or nested parentheses
+        match = _SIMPLE_STRING_RE.match(self.data, pos)
+        if match:
+            self.pos = match.end()
+            return match.group(1)
+
+        data = self.data
+        out = bytearray()
+        depth = 1
+        pos += 1
+        while pos < len(data):
+            c = data[pos]
+            if c == 0x5C:  # backslash
+                pos += 1
+                if pos >= len(data):
+                    break
+                c = data[pos]
+                if c in _STRING_ESCAPES:
+                    out += _STRING_ESCAPES[c]
+                elif 0x30 <= c <= 0x37:
+                    digits = data[pos:pos + 3]
+                    count = 1
+                    while count < len(digits) and 0x30 <= digits[count] <= 0x37:
+                        count += 1
+                    out.append(int(digits[:count], 8) & 0xFF)
+                    pos += count - 1
+                elif c == 0x0D:
+                    if data[pos + 1:pos + 2] == b'\n':
+                        pos += 1
+                elif c != 0x0A:
+                    out.append(c)
+            elif c == 0x28:
+                depth += 1
+                out.append(c)
+            elif c == 0x29:
+                depth -= 1
+                if depth == 0:
+                    pos += 1
+                    break
+                out.append(c)
+            else:
+                out.append(c)
+            pos += 1
+        self.pos = pos
+        return bytes(out)
+
+    def next_token(self):
+        data = self.data
+        while True:
+            match = _TOKEN_RE.match(data, self.pos)
+            if match is None:
+                if self.pos >= len(data):
+                    return _EOF
+                # Stray byte such as an unmatched ')': skip it
+                self.pos += 1
+                continue
+
+            kind = match.lastgroup
+            if kind == 'skip':
+                self.pos = match.end()
+                continue
+            if kind == 'string':
+                return self._literal_string(match.start())
+
+            self.pos = match.end()
+            value = match.group(kind)
+            if kind == 'name':
+                if b'#' in value:
+                    value = _NAME_ESCAPE_RE.sub(lambda m: bytes([int(m.group(1), 16)]), value)
+                return _Name(value.decode('latin-1'))
+            if kind == 'hex':
+                digits = re.sub(rb'\s+', b'', value)
+                if len(digits) % 2:
+                    digits += b'0'
+                return binascii.unhexlify(digits)
+            if kind == 'regular' and _NUMBER_RE.match(value):
+                if b'.' in value:
+                    return float(value)
+                return int(value)
+            return _Op(value.decode('latin-1'))
+
+    def parse(self, allow_refs=True):
+        return self.build(self.next_token(), allow_refs)
+
+    def build(self, token, allow_refs=True):
+        if type(token) is _Op:
+            if token == '<<':
+                attrs = {}
+                while True:
+                    key = self.next_token()
+                    if key is _EOF or (type(key) is _Op and key == '>>'):
+                        return attrs
+                    attrs[key] = self.parse(allow_refs)
+            if token == '[':
+                items = []
+                while True:
+                    item = self.next_token()
+                    if item is _EOF or (type(item) is _Op and item == ']'):
+                        return items
+                    items.append(self.build(item, allow_refs))
+            if token == 'true':
+                return True
+            if token == 'false':
+                return False
+            if token == 'null':
+                return None
+            return token
+
+        if allow_refs and type(token) is int:
+            # "num gen R" is an indirect reference
+            saved = self.pos
+            gen = self.next_token()
+            if type(gen) is int:
+                keyword = self.next_token()
+                if type(keyword) is _Op and keyword == 'R':
+                    return _Ref(token, gen)
+            self.pos = saved
+        return token
+
+
+def _decode_stream(stream):
+    filters = stream.attrs.get('Filter') or []
+    params = stream.attrs.get('DecodeParms') or []
+    if not isinstance(filters, list):
+        filters = [filters]
+    if not isinstance(params, list):
+        params = [params]
+
+    data = stream.raw
+    for i, name in enumerate(filters):
+        param = params[i] if i < len(params) else None
+        if isinstance(param, dict) and param.get('Predictor', 1) > 1:
+            raise UnsupportedPDFError("Stream predictors are not supported")
+
+        if name in ('FlateDecode', 'Fl'):
+            decompressor = zlib.decompressobj()
+            try:
+                data = decompressor.decompress(data)
+            except zlib.error as e:
+                raise UnsupportedPDFError(f"Corrupt FlateDecode stream: {e}")
+        elif name in ('ASCIIHexDecode', 'AHx'):
+            digits = re.sub(rb'\s+', b'', data.split(b'>', 1)[0])
+            if len(digits) % 2:
+                digits += b'0'
+            data = binascii.unhexlify(digits)
+        elif name in ('ASCII85Decode', 'A85'):
+            data = re.sub(rb'\s+', b'', data)
+            if data.startswith(b'<~'):
+                data = data[2:]
+            data = base64.a85decode(data.split(b'~>', 1)[0])
+        else:
+            raise UnsupportedPDFError(f"Unsupported stream filter: {name}")
+    return data
+
+
+# Glyph names from /Differences arrays that are not a plain letter, a
+# uniXXXX name or a Latin letter with a diacritic suffix
+_GLYPH_NAMES = {
+    'space': ' ', 'exclam': '!', 'quotedbl': '"', 'numbersign': '#',
+    'dollar': '$', 'percent': '%', 'ampersand': '&', 'quotesingle': "'",
+    'parenleft': '(', 'parenright': ')', 'asterisk': '*', 'plus': '+',
+    'comma': ',', 'hyphen': '-', 'period': '.', 'slash': '/',
+    'colon': ':', 'semicolon': ';', 'less': '<', 'equal': '=',
+    'greater': '>', 'question': '?', 'at': '@', 'bracketleft': '[',
+    'backslash': '\\', 'bracketright': ']', 'underscore': '_',
+    'quoteleft': '‘', 'quoteright': '’', 'quotedblleft': '“',
+    'quotedblright': '”', 'endash': '–', 'emdash': '—',
+    'bullet': '•', 'ellipsis': '…', 'nbspace': ' ',
+    'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4',
+    'five': '5', 'six': '6', 'seven': '7', 'eight': '8', 'nine': '9',
+    'fi': 'fi', 'fl': 'fl', 'ff': 'ff'
+}
+_DIACRITIC_GLYPH_RE = re.compile(
+    r'^([A-Za-z])(acute|grave|macron|circumflex|dieresis|tilde|cedilla|ring|breve|caron)$')
+_BASE_ENCODINGS = {
+    'WinAnsiEncoding': 'cp1252',
+    'MacRomanEncoding': 'mac_roman',
+    'StandardEncoding': 'latin-1',
+    'PDFDocEncoding': 'latin-1'
+}
+
+
+def _glyph_to_unicode(glyph):
+    if glyph in _GLYPH_NAMES:
+        return _GLYPH_NAMES[glyph]
+    if len(glyph) == 1:
+        return glyph
+    if glyph.startswith('uni') and len(glyph) == 7:
+        try:
+            return chr(int(glyph[3:], 16))
+        except ValueError:
+            return ''
+    match = _DIACRITIC_GLYPH_RE.match(glyph)
+    if match:
+        letter, mark = match.groups()
+        case = 'CAPITAL' if letter.isupper() else 'SMALL'
+        mark = 'DIAERESIS' if mark == 'dieresis' else 'RING ABOVE' if mark == 'ring' else mark.upper()
+        try:
+            return unicodedata.lookup(f"LATIN {case} LETTER {letter.upper()} WITH {mark}")
+        except KeyError:
+            return ''
+    return ''
+
+
+class _FontDecoder:
+    """Maps the bytes of a font's text strings to Unicode."""
+
+    def __init__(self, pdf, font):
+        self.cmap = None
+        self.code_lengths = (1,)
+        self.table = None
+
+        to_unicode = pdf.resolve(font.get('ToUnicode'))
+        if isinstance(to_unicode, _Stream):
+            self._load_cmap(_decode_stream(to_unicode))
+        elif font.get('Subtype') == 'Type0':
+            raise UnsupportedPDFError("Composite font without a ToUnicode map")
+
+        if font.get('Subtype') != 'Type0':
+            self._load_encoding(pdf, pdf.resolve(font.get('Encoding')))
+
+    def _load_encoding(self, pdf, encoding):
+        base = encoding
+        differences = []
+        if isinstance(encoding, dict):
+            base = encoding.get('BaseEncoding')
+            differences = pdf.resolve(encoding.get('Differences')) or []
+
+        codec = _BASE_ENCODINGS.get(base, 'cp1252')
+        table = [bytes([i]).decode(codec, errors='replace') for i in range(256)]
+
+        code = 0
+        for item in differences:
+            if isinstance(item, int):
+                code = item
+            elif isinstance(item, _Name):
+                if 0 <= code < 256:
+                    table[code] = _glyph_to_unicode(item) or table[code]
+                code += 1
+        self.table = table
+
+    def _load_cmap(self, data):
+        lexer = _Lexer(data)
+        cmap = {}
+        lengths = set()
+        operands = []
+
+        while True:
+            token = lexer.next_token()
+            if token is _EOF:
+                break
+            if type(token) is not _Op or token in ('[', '<<'):
+                operands.append(lexer.build(token, allow_refs=False))
+                continue
+
+            if token == 'endcodespacerange':
+                lengths.update(len(lo) for lo in operands[0::2] if isinstance(lo, bytes))
+            elif token == 'endbfchar':
+                for src, dst in zip(operands[0::2], operands[1::2]):
+                    if isinstance(src, bytes) and isinstance(dst, bytes):
+                        cmap[src] = dst.decode('utf-16-be', errors='replace')
+                        lengths.add(len(src))
+            elif token == 'endbfrange':
+                for lo, hi, dst in zip(operands[0::3], operands[1::3], operands[2::3]):
+                    if not (isinstance(lo, bytes) and isinstance(hi, bytes)):
+                        continue
+                    width = len(lo)
+                    start = int.from_bytes(lo, 'big')
+                    end = int.from_bytes(hi, 'big')
+                    if end - start > 0xFFFF:
+                        continue
+                    lengths.add(width)
+                    for offset in range(end - start + 1):
+                        code = (start + offset).to_bytes(width, 'big')
+                        if isinstance(dst, list):
+                            if offset < len(dst) and isinstance(dst[offset], bytes):
+                                cmap[code] = dst[offset].decode('utf-16-be', errors='replace')
+                        elif isinstance(dst, bytes) and dst:
+                            value = int.from_bytes(dst, 'big') + offset
+                            target = value.to_bytes(len(dst), 'big')
+                            cmap[code] = target.decode('utf-16-be', errors='replace')
+            operands = []
+
+        self.cmap = cmap
+        self.code_lengths = tuple(sorted(lengths)) or (1,)
+
+    def decode(self, data):
+        if self.cmap is None:
+            return ''.join(map(self.table.__getitem__, data))
+
+        cmap = self.cmap
+        table = self.table
+        if len(self.code_lengths) == 1:
+            width = self.code_lengths[0]
+            out = []
+            for i in range(0, len(data), width):
+                code = data[i:i + width]
+                text = cmap.get(code)
+                if text is None and table is not None and width == 1:
+                    text = table[code[0]]
+                out.append(text or '')
+            return ''.join(out)
+
+        out = []
+        i = 0
+        while i < len(data):
+            for width in self.code_lengths:
+                code = data[i:i + width]
+                if code in cmap:
+                    out.append(cmap[code])
+                    break
+            else:
+                width = self.code_lengths[0]
+                if table is not None and width == 1:
+                    out.append(table[data[i]])
+            i += width
+        return ''.join(out)
+
+
+class _SimplePDF(ExtractedDocument):
+    """A PDF opened by the built-in extractor."""
+
+    backend = 'simple'
+
+    _OBJ_HEADER_RE = re.compile(rb'(?<![0-9])(\d+)\s+(\d+)\s+obj\b')
+    _ROOT_RE = re.compile(rb'/Root\s+(\d+)\s+(\d+)\s+R')
+
+    def __init__(self, pdf_path):
+        with open(pdf_path, 'rb') as f:
+            self.data = f.read()
+
+        if not self.data.lstrip().startswith(b'%PDF'):
+            raise UnsupportedPDFError("Not a PDF file")
+        if b'/Encrypt' in self.data:
+            raise UnsupportedPDFError("Encrypted PDFs are not supported")
+
+        # Later definitions win, which matches incremental updates
+        self._offsets = {}
+        for match in self._OBJ_HEADER_RE.finditer(self.data):
+            self._offsets[int(match.group(1))] = match.end()
+
+        self._cache = {}
+        self._compressed = None
+        self._fonts = {}
+
+        roots = self._ROOT_RE.findall(self.data)
+        if not roots:
+            raise UnsupportedPDFError("No document catalog found")
+        catalog = self.resolve(_Ref(int(roots[-1][0]), int(roots[-1][1])))
+        if not isinstance(catalog, dict):
+            raise UnsupportedPDFError("Unreadable document catalog")
+        self.pages = self._collect_pages(catalog.get('Pages'))
+
+    # Object access
+
+    def _parse_at(self, offset):
+        lexer = _Lexer(self.data, offset)
+        value = lexer.parse()
+        if isinstance(value, dict):
+            keyword = lexer.next_token()
+            if type(keyword) is _Op and keyword == 'stream':
+                start = lexer.pos
+                if self.data[start:start + 2] == b'\r\n':
+                    start += 2
+                elif self.data[start:start + 1] in (b'\n', b'\r'):
+                    start += 1
+
+                length = self.resolve(value.get('Length'))
+                end = None
+                if isinstance(length, int):
+                    tail = self.data[start + length:start + length + 32].lstrip()
+                    if tail.startswith(b'endstream'):
+                        end = start + length
+                if end is None:
+                    end = self.data.find(b'endstream', start)
+                    if end < 0:
+                        raise UnsupportedPDFError("Unterminated stream")
+                    end = len(self.data[start:end].rstrip(b'\r\n')) + start
+                return _Stream(value, self.data[start:end])
+        return value
+
+    def _index_object_streams(self):
+        self._compressed = {}
+        for num, offset in list(self._offsets.items()):
+            if b'/ObjStm' not in self.data[offset:offset + 256]:
+                continue
+            stream = self.resolve(_Ref(num, 0))
+            if not isinstance(stream, _Stream) or stream.attrs.get('Type') != 'ObjStm':
+                continue
+
+            content = _decode_stream(stream)
+            first = stream.attrs.get('First', 0)
+            header = _Lexer(content[:first])
+            for _ in range(stream.attrs.get('N', 0)):
+                obj_num = header.next_token()
+                obj_offset = header.next_token()
+                if not (isinstance(obj_num, int) and isinstance(obj_offset, int)):
+                    break
+                self._compressed.setdefault(obj_num, (content, first + obj_offset))
+
+    def resolve(self, value):
+        """Follow indirect references until reaching a direct object."""
+        while isinstance(value, _Ref):
+            num = value.num
+            if num in self._cache:
+                value = self._cache[num]
+                continue
+
+            if num in self._offsets:
+                resolved = self._parse_at(self._offsets[num])
+            else:
+                if self._compressed is None:
+                    self._index_object_streams()
+                if num not in self._compressed:
+                    return None
+                content, offset = self._compressed[num]
+                resolved = _Lexer(content, offset).parse()
+
+            self._cache[num] = resolved
+            value = resolved
+        return value
+
+    def _collect_pages(self, root):
+        pages = []
+        stack = [(root, None, 0)]
+        while stack:
+            node, resources, depth = stack.pop()
+            node = self.resolve(node)
+            if not isinstance(node, dict) or depth > 64:
+                continue
+            resources = node.get('Resources', resources)
+
+            kids = self.resolve(node.get('Kids'))
+            if node.get('Type') == 'Pages' or (kids and node.get('Type') != 'Page'):
+                for kid in reversed(kids or []):
+                    stack.append((kid, resources, depth + 1))
+            else:
+                pages.append((node, resources))
+        return pages
+
+    # Text extraction
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    def _font_decoders(self, resources):
+        fonts = self.resolve((self.resolve(resources) or {}).get('Font')) or {}
+        decoders = {}
+        for name, ref in fonts.items():
+            key = ref.num if isinstance(ref, _Ref) else id(ref)
+            if key not in self._fonts:
+                font = self.resolve(ref)
+                self._fonts[key] = _FontDecoder(self, font) if isinstance(font, dict) else None
+            decoders[name] = self._fonts[key]
+        return decoders
+
+    def page_content(self, page_number):
+        """
+        Get the decoded content stream of a page.
+
+        Args:
+            page_number (int): Zero-based page number
+
+        Returns:
+            bytes: The page's content, all content streams concatenated
+        """
+        page, _ = self.pages[page_number]
+        contents = self.resolve(page.get('Contents'))
+        if not isinstance(contents, list):
+            contents = [contents]
+
+        parts = []
+        for item in contents:
+            stream = self.resolve(item)
+            if isinstance(stream, _Stream):
+                parts.append(_decode_stream(stream))
+        return b'\n'.join(parts)
+
+    def page_fingerprint(self, page_number):
+        _, resources = self.pages[page_number]
+        digest = hashlib.sha256(self.page_content(page_number))
+        fonts = self.resolve((self.resolve(resources) or {}).get('Font')) or {}
+        self._feed_object(digest, fonts)
+        return digest.hexdigest()
+
+    def _feed_object(self, digest, value, depth=0):
+        """Add a resolved object to a hash, skipping embedded font programs."""
+        value = self.resolve(value)
+        if depth > 16:
+            return
+        if isinstance(value, _Stream):
+            self._feed_object(digest, value.attrs, depth + 1)
+            digest.update(_decode_stream(value))
+        elif isinstance(value, dict):
+            digest.update(b'<<')
+            for key in sorted(value):
+                if key == 'FontDescriptor':
+                    continue
+                digest.update(key.encode('utf-8', 'replace') + b' ')
+                self._feed_object(digest, value[key], depth + 1)
+            digest.update(b'>>')
+        elif isinstance(value, list):
+            digest.update(b'[')
+            for item in value:
+                self._feed_object(digest, item, depth + 1)
+            digest.update(b']')
+        else:
+            digest.update(repr(value).encode('utf-8', 'replace') + b' ')
+
+    def extract_text(self, page_number):
+        _, resources = self.pages[page_number]
+        decoders = self._font_decoders(resources)
+        lexer = _Lexer(self.page_content(page_number))
+
+        lines = []
+        line = []
+        last_y = None
+        font = None
+        font_size = 12.0
+        leading = 0.0
+        tm = tlm = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+        operands = []
+
+        def move(tx, ty):
+            a, b, c, d, e, f = tlm
+            return (a, b, c, d, a * tx + c * ty + e, b * tx + d * ty + f)
+
+        def show(text):
+            nonlocal last_y, line
+            y = tm[5]
+            tolerance = max(1.0, 0.3 * font_size * abs(tm[3]))
+            if last_y is not None and abs(y - last_y) > tolerance:
+                lines.append(''.join(line))
+                line = []
+            last_y = y
+            if font is not None:
+                line.append(font.decode(text))
+
+        while True:
+            token = lexer.next_token()
+            if token is _EOF:
+                break
+            if type(token) is not _Op or token in ('[', '<<', 'true', 'false', 'null'):
+                operands.append(lexer.build(token, allow_refs=False))
+                continue
+
+            if token == 'BT':
+                tm = tlm = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+            elif token == 'Tf' and len(operands) >= 2:
+                font = decoders.get(operands[-2])
+                font_size = float(operands[-1]) if isinstance(operands[-1], (int, float)) else font_size
+            elif token == 'TL' and operands:
+                leading = operands[-1]
+            elif token == 'Tm' and len(operands) >= 6:
+                tm = tlm = tuple(float(x) for x in operands[-6:])
+            elif token in ('Td', 'TD') and len(operands) >= 2:
+                if token == 'TD':
+                    leading = -operands[-1]
+                tm = tlm = move(operands[-2], operands[-1])
+            elif token == 'T*':
+                tm = tlm = move(0, -leading)
+            elif token == 'Tj' and operands and isinstance(operands[-1], bytes):
+                show(operands[-1])
+            elif token in ("'", '"') and operands and isinstance(operands[-1], bytes):
+                tm = tlm = move(0, -leading)
+                show(operands[-1])
+            elif token == 'TJ' and operands and isinstance(operands[-1], list):
+                for item in operands[-1]:
+                    if isinstance(item, bytes):
+                        show(item)
+                    elif isinstance(item, (int, float)) and item < -250:
+                        # Wide negative kerning separates words
+                        if line and not line[-1].endswith(' '):
+                            line.append(' ')
+            elif token == 'BI':
+                # Skip inline image data up to the EI keyword
+                end = re.compile(rb'\sEI(?=[\s\x00]|$)').search(lexer.data, lexer.pos)
+                lexer.pos = end.end() if end else len(lexer.data)
+            operands = []
+
+        lines.append(''.join(line))
+        return '\n'.join(lines)
+
+
+class SimpleTextBackend(ExtractionBackend):
+    """
+    Built-in, dependency-free extractor for simple text PDFs such as the
+    word-processor vocabulary lists we mostly convert. Reads content
+    streams directly and only tracks enough text state to break lines.
+    """
+
+    name = 'simple'
+
+    def open(self, pdf_path):
+        return _SimplePDF(pdf_path)
+
+
+class AutoBackend(ExtractionBackend):
+    """
+    Picks the fastest backend that can handle each file: installed native
+    libraries first, then the built-in extractor, then PyPDF2.
+    """
+
+    name = 'auto'
+    preference = ('pymupdf', 'pdfium', 'simple', 'pypdf2')
+
+    def open(self, pdf_path):
+        last_error = None
+        failures = []
+        for name in self.preference:
+            backend_class = BACKENDS[name]
+            if not backend_class.is_available():
+                continue
+            try:
+                document = backend_class().open(pdf_path)
+            except UnsupportedPDFError as e:
+                last_error = e
+                continue
+            except Exception as e:
+                # Damaged files make native libraries raise their own errors;
+                # the next backend may still read them
+                last_error = e
+                failures.append(f"The {name} backend could not open the file: {str(e)}")
+                print(failures[-1])
+                continue
+            document.warnings = failures
+            return document
+        raise UnsupportedPDFError(f"No backend could open {pdf_path}: {last_error}")
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (PyPDF2Backend, PyMuPDFBackend, PdfiumBackend, SimpleTextBackend, AutoBackend)
+}
+DEFAULT_BACKEND = 'pypdf2'
+
+
+def available_backends():
+    """
+    Get the names of the backends usable in this environment.
+
+    Returns:
+        list: Backend names, excluding 'auto'
+    """
+    return [name for name, backend in BACKENDS.items()
+            if name != 'auto' and backend.is_available()]
+
+
+def get_backend(backend=None):
+    """
+    Resolve a backend name (or instance) to a backend instance.
+
+    Args:
+        backend (str or ExtractionBackend, optional): Backend to use,
+            defaults to PyPDF2
+
+    Returns:
+        ExtractionBackend: The backend
+    """
+    if isinstance(backend, ExtractionBackend):
+        return backend
+
+    name = backend or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    if not BACKENDS[name].is_available():
+        raise ValueError(f"PDF backend '{name}' is not installed")
+    return BACKENDS[name]()
+
+
+# --- Isolated extraction ---
+
+def _extraction_worker(conn, backend, pdf_path):
+    """
+    Serve extraction requests for one document in a worker process.
+
+    Args:
+        conn: Pipe end requests come in and replies go out on
+        backend (ExtractionBackend): Backend to open the document with
+        pdf_path (str): Path to the PDF file
+    """
+    try:
+        document = backend.open(pdf_path)
+    except UnsupportedPDFError as e:
+        conn.send(('unsupported', str(e)))
+        return
+    except Exception as e:
+        conn.send(('error', str(e)))
+        return
+    conn.send(('ok', (document.page_count, document.backend, list(document.warnings))))
+
+    with document:
+        while True:
+            try:
+                op, page_number = conn.recv()
+            except (EOFError, OSError):
+                break
+            if op == 'close':
+                break
+            try:
+                if op == 'text':
+                    value = document.extract_text(page_number)
+                else:
+                    value = document.page_fingerprint(page_number)
+                conn.send(('ok', value))
+            except Exception as e:
+                conn.send(('error', str(e)))
+
+
+class _IsolatedDocument(ExtractedDocument):
+    """
+    A document extracted by a worker process that is killed when a page
+    takes too long. The next request starts a fresh worker, so pages that
+    already came back are kept and only the slow page is lost.
+    """
+
+    def __init__(self, backend, pdf_path, page_timeout, document_timeout, open_timeout=None):
+        self._inner = backend
+        self.pdf_path = pdf_path
+        self.page_timeout = page_timeout
+        self.open_timeout = open_timeout
+        self.deadline = time.monotonic() + document_timeout if document_timeout else None
+        self.restarts = 0  # Workers killed after a timeout or crash
+        self._process = None
+        self._conn = None
+        self._page_count, self.backend, self.warnings = self._start()
+
+    def _wait_time(self, page_number, limit):
+        wait = limit
+        if self.deadline is not None:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                raise ExtractionTimeoutError("Document time budget used up", page_number, 'document')
+            wait = remaining if wait is None else min(wait, remaining)
+        return wait
+
+    def _start(self, page_number=None):
+        # Spawn rather than fork, so the worker never inherits a Tk interpreter
+        context = multiprocessing.get_context('spawn')
+        self._conn, child = context.Pipe()
+        self._process = context.Process(target=_extraction_worker,
+                                        args=(child, self._inner, self.pdf_path),
+                                        daemon=True)
+        self._process.start()
+        child.close()
+
+        # Opening has its own limit, so a slow open is not charged to a page
+        status, value = self._receive(page_number, self.open_timeout, opening=True)
+        if status == 'unsupported':
+            self._stop()
+            raise UnsupportedPDFError(value)
+        if status == 'error':
+            self._stop()
+            raise Exception(value)
+        return value
+
+    def _receive(self, page_number, limit, opening=False):
+        wait = self._wait_time(page_number, limit)
+        what = "Opening the document" if opening else f"Page {page_number + 1}"
+        try:
+            ready = self._conn.poll(wait)
+            reply = self._conn.recv() if ready else None
+        except (EOFError, OSError):
+            self._kill()
+            raise PageExtractionError(f"Extraction worker crashed: {what.lower()} failed", page_number)
+
+        if reply is None:
+            self._kill()
+            if wait != limit:
+                raise ExtractionTimeoutError(f"{what} ran past the document's time budget",
+                                             page_number, 'document')
+            # Without an open document no further page can be read either
+            raise ExtractionTimeoutError(f"{what} took longer than {wait:.1f}s", page_number,
+                                         'document' if opening else 'page')
+        return reply
+
+    def _request(self, op, page_number):
+        if self._process is None:
+            self._start(page_number)
+        self._conn.send((op, page_number))
+        status, value = self._receive(page_number, self.page_timeout)
+        if status == 'error':
+            raise Exception(value)
+        return value
+
+    def _kill(self):
+        self.restarts += 1
+        self._process.kill()
+        self._stop()
+
+    def _stop(self):
+        self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+    @property
+    def page_count(self):
+        return self._page_count
+
+    def extract_text(self, page_number):
+        return self._request('text', page_number)
+
+    def page_fingerprint(self, page_number):
+        return self._request('fingerprint', page_number)
+
+    def close(self):
+        if self._process is None:
+            return
+        try:
+            self._conn.send(('close', None))
+        except OSError:
+            pass
+        self._process.join(1)
+        if self._process.is_alive():
+            self._process.kill()
+        self._stop()
+
+
+class IsolatedBackend(ExtractionBackend):
+    """
+    Runs another backend in a worker process with a time budget per page
+    and per document, so a PDF that makes the extractor spin cannot hang
+    the caller.
+
+    A page over budget raises ExtractionTimeoutError from extract_text();
+    the worker is killed and a new one opens the document again for the
+    next page. Opening is timed separately from pages, against
+    open_timeout and the document budget. Once the document budget is used
+    up, every further page raises too.
+    """
+
+    name = 'isolated'
+
+    def __init__(self, backend=None, page_timeout=30, document_timeout=None, open_timeout=None):
+        """
+        Args:
+            backend (str or ExtractionBackend, optional): Backend doing the
+                extraction, defaults to PyPDF2
+            page_timeout (float, optional): Seconds allowed per page, None for no limit
+            document_timeout (float, optional): Seconds allowed for the whole
+                document, None for no limit
+            open_timeout (float, optional): Seconds allowed for each opening
+                of the document, None to only limit it by the document budget
+        """
+        self.backend = get_backend(backend)
+        self.page_timeout = page_timeout
+        self.document_timeout = document_timeout
+        self.open_timeout = open_timeout
+
+    def open(self, pdf_path):
+        return _IsolatedDocument(self.backend, pdf_path, self.page_timeout, self.document_timeout,
+                                 self.open_timeout)
+
+
+# --- Benchmark ---
+
+def benchmark_backends(pdf_path, backends=None, repeat=3):
+    """
+    Run every available backend over a PDF and compare speed and output.
+
+    Output differences are measured against PyPDF2 (or the first backend
+    when PyPDF2 is missing): a line-level similarity ratio and the number
+    of vocabulary entries PDFParser finds in each backend's text.
+
+    Args:
+        pdf_path (str): Path to a sample PDF
+        backends (list, optional): Backend names, defaults to all available
+        repeat (int): Timed runs per backend; the fastest is reported
+
+    Returns:
+        list: One dict per backend with 'backend', 'seconds', 'pages',
+            'pages_per_second', 'chars', 'similarity', 'entries',
+            'diff' and 'error' keys
+    """
+    from pdf_parser import PDFParser
+    import contextlib
+    import io
+
+    names = backends or available_backends()
+    parser = PDFParser()
+    results = []
+    texts = {}
+
+    for name in names:
+        result = {'backend': name, 'seconds': None, 'pages': 0, 'pages_per_second': None,
+                  'chars': 0, 'similarity': None, 'entries': None, 'diff': [], 'error': None}
+        try:
+            backend = get_backend(name)
+            best = None
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                with backend.open(pdf_path) as document:
+                    pages = [document.extract_text(i) for i in range(document.page_count)]
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            text = '\n'.join(pages)
+            texts[name] = text
+            result.update(seconds=best,
+                          pages=len(pages),
+                          pages_per_second=len(pages) / best if best else float('inf'),
+                          chars=len(text))
+            with contextlib.redirect_stdout(io.StringIO()):
+                vocabulary = parser._process_text(text)
+            result['entries'] = sum(len(entries) for entries in vocabulary.values())
+        except Exception as e:
+            result['error'] = str(e)
+        results.append(result)
+
+    reference = 'pypdf2' if 'pypdf2' in texts else next(iter(texts), None)
+    if reference is not None:
+        ref_lines = [re.sub(r'\s+', ' ', l).strip() for l in texts[reference].split('\n')]
+        for result in results:
+            if result['backend'] not in texts:
+                continue
+            lines = [re.sub(r'\s+', ' ', l).strip() for l in texts[result['backend']].split('\n')]
+            result['similarity'] = difflib.SequenceMatcher(None, ref_lines, lines, autojunk=False).ratio()
+            result['diff'] = [l for l in difflib.unified_diff(ref_lines, lines, reference,
+                                                              result['backend'], lineterm='')]
+    return results
+
+
+def format_benchmark(results):
+    """
+    Format benchmark results as a plain-text table.
+
+    Args:
+        results (list): Output of benchmark_backends
+
+    Returns:
+        str: The table
+    """
+    rows = [f"{'backend':<10} {'seconds':>9} {'pages/s':>10} {'chars':>9} {'similar':>8} {'entries':>8}"]
+    for r in results:
+        if r['error']:
+            rows.append(f"{r['backend']:<10} error: {r['error']}")
+            continue
+        rows.append(f"{r['backend']:<10} {r['seconds']:>9.4f} {r['pages_per_second']:>10.1f} "
+                    f"{r['chars']:>9} {r['similarity']:>8.1%} {r['entries']:>8}")
+    return '\n'.join(rows)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Benchmark PDF text-extraction backends.")
+    arg_parser.add_argument('pdf', help="Sample PDF file")
+    arg_parser.add_argument('--benchmark', action='store_true',
+                            help="Run every available backend and compare them (the default)")
+    arg_parser.add_argument('--backends', help="Comma-separated backend names")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="Timed runs per backend")
+    arg_parser.add_argument('--show-diff', action='store_true',
+                            help="Print line differences against the reference backend")
+    args = arg_parser.parse_args()
+
+    results = benchmark_backends(args.pdf,
+                                 args.backends.split(',') if args.backends else None,
+                                 args.repeat)
+    print(format_benchmark(results))
+    if args.show_diff:
+        for r in results:
+            if r['diff']:
+                print('\n'.join(r['diff']))
@@ -1,7 +1,95 @@
-import re
+import hashlib
 import json
+import re
 import os
-from PyPDF2 import PdfReader
+from libdict_io import atomic_write, write_libdict
+from pdf_backends import get_backend, IsolatedBackend, PageExtractionError, ExtractionTimeoutError
+
+# Per-page parse output is kept next to the generated deck (deck.libdict.pages)
+PAGE_CACHE_SUFFIX = '.pages'
+# Bump when _process_lines changes how text turns into entries
+PAGE_CACHE_VERSION = 1
+
+def parse_page_ranges(spec):
+    """
+    Parse a page selection such as "1-3, 7, 10-".
+    
+    Args:
+        spec (str): Comma-separated page numbers and ranges, 1-based and
+            inclusive; a range without an end runs to the last page
+        
+    Returns:
+        list: (first, last) tuples, last is None for open-ended ranges
+    """
+    ranges = []
+    for part in spec.replace(';', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        match = re.fullmatch(r'(\d+)\s*(?:-\s*(\d*))?', part)
+        if not match:
+            raise ValueError(f"Invalid page range: '{part}'")
+        first = int(match.group(1))
+        if match.group(2) is None:
+            last = first
+        else:
+            last = int(match.group(2)) if match.group(2) else None
+        if first < 1 or (last is not None and last < first):
+            raise ValueError(f"Invalid page range: '{part}'")
+        ranges.append((first, last))
+    return ranges
+
+
+def page_cache_path(output_path):
+    """
+    Get the page cache path for a generated deck.
+    
+    Args:
+        output_path (str): Path of the .libdict file
+        
+    Returns:
+        str: Path to the page cache
+    """
+    if not output_path.endswith('.libdict'):
+        output_path += '.libdict'
+    return output_path + PAGE_CACHE_SUFFIX
+
+
+def select_pages(pages, page_count):
+    """
+    Turn a page selection into the zero-based page indices to read.
+    
+    Args:
+        pages (str or list): Spec for parse_page_ranges, or a list of page
+            numbers and (first, last) tuples; None or empty selects every page
+        page_count (int): Number of pages in the document
+        
+    Returns:
+        list: Sorted, unique zero-based page indices within the document
+    """
+    if not pages:
+        return list(range(page_count))
+    if isinstance(pages, str):
+        pages = parse_page_ranges(pages)
+    
+    selected = set()
+    for item in pages:
+        first, last = (item, item) if isinstance(item, int) else item
+        last = page_count if last is None else min(last, page_count)
+        selected.update(range(first - 1, last))
+    return sorted(selected)
+
+
+class ParseResult(dict):
+    """
+    Parsed vocabulary (section name -> entries), plus warnings about pages
+    that had to be skipped, e.g. because their extraction timed out.
+    """
+    
+    def __init__(self, vocabulary, warnings=()):
+        super().__init__(vocabulary)
+        self.warnings = list(warnings)
+
 
 class PDFParser:
     """
@@ -9,7 +97,23 @@ class PDFParser:
     and converts them to the .libdict format.
     """
     
-    def __init__(self):
+    def __init__(self, backend=None, page_timeout=None, document_timeout=None, open_timeout=None):
+        """
+        Args:
+            backend (str or ExtractionBackend, optional): Text-extraction
+                backend, e.g. 'pypdf2' (default), 'pymupdf', 'pdfium',
+                'simple' or 'auto'. See pdf_backends.
+            page_timeout (float, optional): Extract in a worker process and
+                skip pages that take longer than this many seconds
+            document_timeout (float, optional): Extract in a worker process
+                and skip the remaining pages after this many seconds
+            open_timeout (float, optional): Seconds allowed for opening the
+                document in the worker; limited by document_timeout if omitted
+        """
+        self.backend = get_backend(backend)
+        if page_timeout is not None or document_timeout is not None:
+            self.backend = IsolatedBackend(self.backend, page_timeout, document_timeout, open_timeout)
+        
         # Define section patterns to identify different parts of the vocabulary
         self.section_patterns = {
             'nouns': r'^Nouns\s*:',
@@ -23,28 +127,93 @@ class PDFParser:
         # Pattern to match vocabulary entries - this will be more complex
         # and is handled in the _process_text method
         
-    def parse_pdf(self, pdf_path):
+    def parse_pdf(self, pdf_path, pages=None, sections=None, stop_early=False, page_cache=None):
         """
         Parse a PDF file to extract vocabulary entries.
         
         Args:
             pdf_path (str): Path to the PDF file
+            pages (str or list, optional): Pages to read, as a spec like
+                "1-3, 7, 10-" or a list of page numbers and (first, last)
+                ranges, 1-based and inclusive. Other pages are never extracted.
+            sections (iterable, optional): Only keep these sections
+            stop_early (bool): Stop reading pages once every requested
+                section has been found and a later section header closed it
+            page_cache (str, optional): Path of the page cache kept with
+                the generated deck (see page_cache_path). Pages whose
+                content and incoming section match a cached page reuse its
+                entries instead of being extracted and parsed again; the
+                cache is then rewritten for the next conversion.
             
         Returns:
-            dict: Parsed vocabulary data organized by sections
+            ParseResult: Parsed vocabulary data organized by sections, with
+                a warning for each page that was skipped
         """
         try:
             print(f"Starting to parse PDF: {pdf_path}")
-            reader = PdfReader(pdf_path)
-            text = ""
+            wanted = set(sections) if sections else None
+            if wanted:
+                unknown = wanted - set(self.section_patterns)
+                if unknown:
+                    raise ValueError(f"Unknown section(s): {', '.join(sorted(unknown))}")
             
-            # Extract text from all pages
-            for i, page in enumerate(reader.pages):
-                page_text = page.extract_text()
-                print(f"Page {i+1} contains {len(page_text)} characters")
-                text += page_text + "\n"
+            vocabulary = self._empty_vocabulary()
+            current_section = None
+            found = []
+            warnings = []
             
-            result = self._process_text(text)
+            with self.backend.open(pdf_path) as document:
+                warnings.extend(document.warnings)
+                page_indices = select_pages(pages, document.page_count)
+                cached = self._load_page_cache(page_cache, document.backend) if page_cache else {}
+                records = []
+                reused = 0
+                
+                # Extract and process one page at a time so reading can stop early
+                for position, i in enumerate(page_indices):
+                    try:
+                        fingerprint = document.page_fingerprint(i) if page_cache else None
+                        record = cached.get((fingerprint, current_section)) if fingerprint else None
+                        if record is None:
+                            page_text = document.extract_text(i)
+                            print(f"Page {i+1} contains {len(page_text)} characters")
+                            record = self._parse_page(page_text, current_section)
+                            record['hash'] = fingerprint
+                        else:
+                            reused += 1
+                    except PageExtractionError as e:
+                        # Skip the page; the next one continues in the same section
+                        if isinstance(e, ExtractionTimeoutError) and e.budget == 'document':
+                            skipped = len(page_indices) - position
+                            warnings.append(f"Stopped at page {i+1}, {skipped} page(s) not read: {str(e)}")
+                            print(warnings[-1])
+                            break
+                        warnings.append(f"Skipped page {i+1}: {str(e)}")
+                        print(warnings[-1])
+                        continue
+                    
+                    # Splice the page's entries in; the result is the same as parsing all text at once
+                    for section, entries in record['entries'].items():
+                        vocabulary[section].extend({'term': term, 'definition': definition}
+                                                   for term, definition in entries)
+                    found.extend(record['found'])
+                    current_section = record['exit']
+                    if fingerprint:
+                        records.append(record)
+                    
+                    if stop_early and wanted and wanted <= set(found) and current_section not in wanted:
+                        print(f"All requested sections closed by page {i+1}, stopping")
+                        break
+                
+                if page_cache:
+                    print(f"Reused {reused} of {len(records)} pages from the page cache")
+                    self._save_page_cache(page_cache, document.backend, records, cached,
+                                          2 * document.page_count)
+            
+            if wanted:
+                vocabulary = {section: entries for section, entries in vocabulary.items()
+                              if section in wanted}
+            result = ParseResult(vocabulary, warnings)
             
             # Print a summary of what was found
             total_entries = sum(len(entries) for entries in result.values())
@@ -58,18 +227,96 @@ class PDFParser:
             print(error_msg)
             raise Exception(error_msg)
     
-    def _process_text(self, text):
+    def _parse_page(self, page_text, current_section):
         """
-        Process extracted text to identify vocabulary entries.
+        Parse the text of one page on its own.
         
         Args:
-            text (str): Extracted text from PDF
+            page_text (str): Extracted text of the page
+            current_section (str): Section the previous page ended in
             
         Returns:
-            dict: Organized vocabulary data
+            dict: 'enter' (current_section), 'exit' (section the page ends in),
+                'found' (section headers on the page) and 'entries'
+                (section -> [term, definition] pairs)
+        """
+        page_vocabulary = self._empty_vocabulary()
+        found = []
+        exit_section = self._process_lines(page_text.split('\n'), page_vocabulary, current_section, found)
+        return {
+            'enter': current_section,
+            'exit': exit_section,
+            'found': found,
+            'entries': {section: [[entry['term'], entry['definition']] for entry in entries]
+                        for section, entries in page_vocabulary.items() if entries}
+        }
+    
+    def _page_cache_key(self, backend):
         """
-        lines = text.split('\n')
-        vocabulary = {
+        Describe everything besides page content that parse output depends on.
+        
+        Args:
+            backend (str): Name of the backend that extracted the text
+            
+        Returns:
+            dict: Cache header fields
+        """
+        patterns = json.dumps(self.section_patterns, sort_keys=True).encode('utf-8')
+        return {
+            'version': PAGE_CACHE_VERSION,
+            'backend': backend,
+            'patterns': hashlib.sha256(patterns).hexdigest()
+        }
+    
+    def _load_page_cache(self, path, backend):
+        """
+        Load cached per-page parse output.
+        
+        Args:
+            path (str): Path of the page cache
+            backend (str): Name of the backend extracting the document
+            
+        Returns:
+            dict: (page fingerprint, incoming section) -> page record; empty
+                if there is no usable cache
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('key') != self._page_cache_key(backend):
+                return {}
+            return {(record['hash'], record['enter']): record for record in data['pages']}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+    
+    def _save_page_cache(self, path, backend, records, previous, limit):
+        """
+        Write the page cache, keeping older records for pages not read this time.
+        
+        Args:
+            path (str): Path of the page cache
+            backend (str): Name of the backend that extracted the document
+            records (list): Records of the pages read now, in page order
+            previous (dict): Records loaded from the old cache
+            limit (int): Maximum number of records to keep
+        """
+        keys = {(record['hash'], record['enter']) for record in records}
+        kept = records + [record for key, record in previous.items() if key not in keys]
+        try:
+            with atomic_write(path) as f:
+                json.dump({'key': self._page_cache_key(backend), 'pages': kept[:max(limit, len(records))]},
+                          f, ensure_ascii=False)
+        except OSError as e:
+            print(f"Error writing page cache: {str(e)}")
+    
+    def _empty_vocabulary(self):
+        """
+        Get the empty section lists vocabulary is collected into.
+        
+        Returns:
+            dict: Section name -> empty list
+        """
+        return {
             'nouns': [],
             'adjectives': [],
             'verbs': [],
@@ -77,9 +324,34 @@ class PDFParser:
             'prepositions': [],
             'conjunctions': []
         }
+    
+    def _process_text(self, text):
+        """
+        Process extracted text to identify vocabulary entries.
         
-        current_section = None
+        Args:
+            text (str): Extracted text from PDF
+            
+        Returns:
+            dict: Organized vocabulary data
+        """
+        vocabulary = self._empty_vocabulary()
+        self._process_lines(text.split('\n'), vocabulary)
+        return vocabulary
+    
+    def _process_lines(self, lines, vocabulary, current_section=None, found=None):
+        """
+        Process lines of extracted text, adding vocabulary entries as they are recognized.
         
+        Args:
+            lines (list): Lines of text
+            vocabulary (dict): Section name -> entries, extended in place
+            current_section (str, optional): Section the previous lines ended in
+            found (list, optional): Section headers seen are appended here
+            
+        Returns:
+            str: Section the lines end in
+        """
         for line in lines:
             line = line.strip()
             if not line:
@@ -92,6 +364,8 @@ class PDFParser:
                 if match:
                     current_section = section
                     section_found = True
+                    if found is not None:
+                        found.append(section)
                     print(f"Found section header: '{line}' -> {section}")
                     break
                     
@@ -199,7 +473,7 @@ class PDFParser:
                             'definition': definition
                         })
         
-        return vocabulary
+        return current_section
     
     def save_to_libdict(self, vocabulary, output_path):
         """
@@ -225,8 +499,6 @@ class PDFParser:
         
         # Save to JSON file
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            return output_path
+            return write_libdict(data, output_path)
         except Exception as e:
             raise Exception(f"Error saving .libdict file: {str(e)}")
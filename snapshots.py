@@ -0,0 +1,141 @@
+import json
+import struct
+import sys
+from array import array
+from libdict_io import atomic_write
+
+# Study sessions are saved next to their deck (deck.libdict.session)
+SNAPSHOT_SUFFIX = '.session'
+SNAPSHOT_VERSION = 1
+
+_MAGIC = b'LDSESS'
+_HEADER_LENGTH = struct.Struct('<I')
+
+
+def snapshot_path(deck_path):
+    """
+    Get the default snapshot path for a deck.
+
+    Args:
+        deck_path (str): Path to the .libdict file
+
+    Returns:
+        str: Path to the snapshot file
+    """
+    return deck_path + SNAPSHOT_SUFFIX
+
+
+def write_snapshot(path, header, arrays):
+    """
+    Write a session snapshot: a small JSON header followed by packed arrays.
+
+    Arrays are stored raw and little-endian, so reading one back is a
+    single frombytes() call rather than a replay of the session.
+
+    Args:
+        path (str): Path of the snapshot file
+        header (dict): JSON-serializable session fields
+        arrays (dict): Name -> array.array or bytes/bytearray (bitmaps)
+
+    Returns:
+        str: Path to the written file
+    """
+    layout = []
+    blobs = []
+    for name, values in arrays.items():
+        if isinstance(values, array):
+            if sys.byteorder != 'little':
+                values = array(values.typecode, values)
+                values.byteswap()
+            layout.append([name, values.typecode, values.itemsize, len(values)])
+            blobs.append(values.tobytes())
+        else:
+            layout.append([name, 'bytes', 1, len(values)])
+            blobs.append(bytes(values))
+
+    header = dict(header, version=SNAPSHOT_VERSION, arrays=layout)
+    encoded = json.dumps(header, ensure_ascii=False).encode('utf-8')
+
+    with atomic_write(path, binary=True) as f:
+        f.write(_MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(encoded)))
+        f.write(encoded)
+        for blob in blobs:
+            f.write(blob)
+    return path
+
+
+def read_snapshot(path):
+    """
+    Read a session snapshot written by write_snapshot.
+
+    Args:
+        path (str): Path of the snapshot file
+
+    Returns:
+        tuple: (header dict, dict of name -> array.array or bytes)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if not data.startswith(_MAGIC):
+        raise ValueError("Not a libdict session snapshot")
+    offset = len(_MAGIC)
+    (length,) = _HEADER_LENGTH.unpack_from(data, offset)
+    offset += _HEADER_LENGTH.size
+    header = json.loads(data[offset:offset + length].decode('utf-8'))
+    offset += length
+
+    if header.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {header.get('version')}")
+
+    arrays = {}
+    for name, typecode, itemsize, count in header.pop('arrays'):
+        size = itemsize * count
+        blob = data[offset:offset + size]
+        if len(blob) != size:
+            raise ValueError("Truncated session snapshot")
+        offset += size
+
+        if typecode == 'bytes':
+            arrays[name] = blob
+            continue
+        values = array(typecode)
+        if values.itemsize != itemsize:
+            raise ValueError(f"Snapshot array '{name}' uses an incompatible item size")
+        values.frombytes(blob)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        arrays[name] = values
+    return header, arrays
+
+
+def pack_bits(flags, count):
+    """
+    Pack an iterable of set bit positions into a bitmap.
+
+    Args:
+        flags (iterable): Positions of set bits
+        count (int): Number of bits in the bitmap
+
+    Returns:
+        bytearray: The bitmap, least significant bit first
+    """
+    bitmap = bytearray((count + 7) // 8)
+    for i in flags:
+        bitmap[i >> 3] |= 1 << (i & 7)
+    return bitmap
+
+
+def bit_is_set(bitmap, i):
+    """
+    Test one bit of a bitmap made by pack_bits.
+
+    Args:
+        bitmap (bytes): The bitmap
+        i (int): Bit position
+
+    Returns:
+        bool: True if the bit is set
+    """
+    return bool(bitmap[i >> 3] & (1 << (i & 7)))
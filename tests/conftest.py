@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the repository, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libdict_io import write_libdict  # noqa: E402
+
+
+@pytest.fixture
+def make_deck(tmp_path):
+    """
+    Factory writing .libdict files into the test's temporary directory.
+
+    make_deck(name='deck', sections=None) returns the path of name.libdict;
+    sections maps section names to lists of (term, definition) pairs and
+    defaults to a single noun.
+    """
+    def make(name='deck', sections=None):
+        if sections is None:
+            sections = {'nouns': [('Haus (n.)', 'house')]}
+        path = str(tmp_path / f'{name}.libdict')
+        write_libdict({'format_version': '1.0', 'title': name,
+                       'sections': {section: [{'term': term, 'definition': definition}
+                                              for term, definition in cards]
+                                    for section, cards in sections.items()}}, path)
+        return path
+    return make
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from adaptive import CardStats, FenwickTree
+from deck import Deck, StudySession
+
+
+def check_tree(tree, weights):
+    assert tree.weights == weights
+    for count in range(len(weights) + 1):
+        assert tree.prefix_sum(count) == pytest.approx(sum(weights[:count]))
+    for position, weight in enumerate(weights):
+        if weight:
+            # Every point of a position's cumulative range finds that position
+            start = sum(weights[:position])
+            assert tree.find(start) == position
+            assert tree.find(start + weight * 0.999) == position
+
+
+def test_fenwick_tree_follows_append_pop_and_set():
+    rng = random.Random(7)
+    weights = [rng.choice((0, 0.5, 1, 3)) for _ in range(13)]
+    tree = FenwickTree(weights)
+    check_tree(tree, weights)
+
+    for _ in range(200):
+        op = rng.random()
+        if op < 0.4:
+            weights.append(rng.choice((0, 0.25, 2, 5)))
+            tree.append(weights[-1])
+        elif op < 0.6 and weights:
+            assert tree.pop() == weights.pop()
+        elif weights:
+            position = rng.randrange(len(weights))
+            weights[position] = rng.choice((0, 1, 4))
+            tree.set(position, weights[position])
+        check_tree(tree, weights)
+    assert len(tree) == len(weights)
+
+
+def test_sampling_follows_the_weights():
+    weights = [1, 2, 0, 5, 2]
+    tree = FenwickTree(weights)
+    rng = random.Random(3)
+    draws = 40000
+    counts = [0] * len(weights)
+    for _ in range(draws):
+        counts[tree.sample(rng)] += 1
+
+    assert counts[2] == 0
+    for count, weight in zip(counts, weights):
+        assert count / draws == pytest.approx(weight / sum(weights), abs=0.01)
+    assert FenwickTree([0, 0]).sample(rng) is None and FenwickTree().sample(rng) is None
+
+
+def test_card_stats_weight_tracks_the_error_rate():
+    stats = CardStats()
+    assert stats.weight == pytest.approx(CardStats.MIN_WEIGHT + 0.5)
+
+    for correct in (False, False, True):
+        stats.record(correct)
+    assert (stats.attempts, stats.misses) == (3, 2)
+    assert stats.weight == pytest.approx(CardStats.MIN_WEIGHT + 3 / 5)
+
+    mastered = CardStats()
+    for _ in range(50):
+        mastered.record(True)
+    assert CardStats.MIN_WEIGHT < mastered.weight < stats.weight
+
+
+def test_adaptive_removal_keeps_sampler_and_view_in_sync(make_deck):
+    words = [(f'Wort{i}', f'word{i}') for i in range(8)]
+    session = StudySession(Deck.load(make_deck(sections={'nouns': words})),
+                           remove_on_correct=True, adaptive=True, seed=5)
+    for position in (1, 4, 6):
+        session.current_index = position
+        session.record_answer(False)
+
+    expected = set(range(8))
+    while session.view:
+        removed = session.current_card_index()
+        session.remove_current_card()
+        expected.discard(removed)
+        assert sorted(session.view) == sorted(expected)
+        assert session._sampler.weights == [session._card_weight(i) for i in session.view]
+        check_tree(session._sampler, session._sampler.weights)
+        if session.view:
+            assert 0 <= session.current_index < len(session.view)
+            session.next_card()
+    assert session.next_card() is None
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from analytics import CardAnalytics
+from deck import Deck
+from flashcard_manager import FlashcardManager
+
+SECTIONS = {'nouns': [('Apfel', 'apple'), ('Birne', 'pear'), ('Kirsche', 'cherry')],
+            'verbs': [('gehen', 'to go'), ('sagen', 'to say')]}
+
+
+def answer(manager, term, *results):
+    deck = manager.deck
+    assert manager.session.jump_to(deck.display_terms.index(term))
+    for correct in results:
+        manager.record_answer(correct, latency=1.5)
+
+
+def counters(analytics, deck):
+    """Attempts and correct answers by term, for cards answered at least once"""
+    return {deck.display_terms[i]: (int(analytics.attempts[i]), int(analytics.correct[i]))
+            for i in np.flatnonzero(analytics.attempts)}
+
+
+def test_remap_after_edits_keeps_counters_on_their_cards(make_deck):
+    manager = FlashcardManager()
+    assert manager.load_libdict(make_deck(sections=SECTIONS))
+    analytics = manager.enable_analytics()
+    answer(manager, 'Apfel', False)
+    answer(manager, 'Kirsche', True, True)
+    answer(manager, 'sagen', False, True)
+
+    manager.delete_card('nouns', 0)
+    manager.add_card('nouns', 'Pflaume', 'plum')
+    manager.add_section('adjectives')
+    manager.add_card('adjectives', 'gross', 'big')
+
+    deck = manager.deck
+    assert len(analytics.attempts) == len(deck)
+    assert counters(analytics, deck) == {'Kirsche': (2, 2), 'sagen': (2, 1)}
+    assert sorted(deck.display_terms[i] for i in analytics.reviews['card']) == ['Kirsche'] * 2 + ['sagen'] * 2
+    assert [row['section'] for row in analytics.section_summary()] == list(deck.sections)
+
+
+def test_load_realigns_with_a_reordered_deck(make_deck):
+    path = make_deck(sections=SECTIONS)
+    manager = FlashcardManager()
+    assert manager.load_libdict(path)
+    manager.enable_analytics()
+    answer(manager, 'Apfel', False, False)
+    answer(manager, 'Birne', True)
+    answer(manager, 'gehen', True, False)
+    manager.save_analytics()
+
+    make_deck(sections={'verbs': [('sagen', 'to say'), ('gehen', 'to go')],
+                        'nouns': [('Kirsche', 'cherry'), ('Apfel', 'apple')]})
+    deck = Deck.load(path)
+    analytics = CardAnalytics.load(deck)
+    assert len(analytics.attempts) == len(deck)
+    assert counters(analytics, deck) == {'Apfel': (2, 0), 'gehen': (2, 1)}
+    assert sorted(deck.display_terms[i] for i in analytics.reviews['card']) == ['Apfel'] * 2 + ['gehen'] * 2
+    assert analytics.session == 1
+
+
+def test_hardest_returns_the_true_top_k():
+    deck = Deck('T', None, '1.0', ('nouns',), tuple(f'w{i}' for i in range(200)),
+                tuple(f'd{i}' for i in range(200)), (0, 200))
+    analytics = CardAnalytics(deck)
+    rng = random.Random(11)
+    # Few distinct counts, so many cards tie on error rate
+    analytics.attempts[:] = [rng.choice((0, 1, 2, 4, 6)) for _ in range(200)]
+    analytics.correct[:] = [rng.randint(0, attempts) for attempts in analytics.attempts]
+
+    rates = analytics.error_rates()
+    candidates = [i for i in range(200) if analytics.attempts[i] >= 2]
+    ranked = sorted(candidates, key=lambda i: (-rates[i], -analytics.attempts[i], i))
+    for k in (1, 5, 17, 60, len(candidates), 500):
+        assert list(analytics.hardest(k)) == ranked[:k]
+    assert len(analytics.hardest(0)) == 0
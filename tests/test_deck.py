@@ -0,0 +1,149 @@
+import pytest
+
+from deck import Deck, StudySession, UnionDeck
+
+
+@pytest.fixture
+def union(make_deck):
+    first = make_deck('stage5', {'nouns': [('Haus', 'house'), ('Baum', 'tree')], 'verbs': []})
+    empty = make_deck('empty', {})
+    second = make_deck('stage6', {'verbs': [('gehen', 'to go')], 'nouns': [('Katze', 'cat')]})
+    return UnionDeck.load([first, empty, second])
+
+
+def test_union_maps_indices_to_parts(union):
+    assert len(union) == 4
+    assert union.sections == ('stage5/nouns', 'stage5/verbs', 'stage6/verbs', 'stage6/nouns')
+    assert union.offsets == (0, 2, 2, 4)
+    assert [union.locate(i) for i in range(4)] == [(0, 0), (0, 1), (2, 0), (2, 1)]
+    assert union.terms[-1] == 'katze' and union.terms[1:3] == ('baum', 'gehen')
+    assert union.card(2) == {'term': 'gehen', 'definition': 'to go', 'section': 'stage6/verbs'}
+    assert list(union.section_range('stage6/nouns')) == [3]
+    with pytest.raises(IndexError):
+        union.terms[4]
+
+
+def test_union_sessions_and_edits(union):
+    session = StudySession(union)
+    session.toggle_section('stage5/nouns')
+    assert list(session.view) == [2, 3]
+    assert session.check_answer('to go')
+    with pytest.raises(ValueError):
+        union.apply_edit({'op': 'add_section', 'section': 'x'})
+
+
+def test_union_names_must_be_unique(make_deck):
+    path = make_deck('stage5', {'nouns': [('Haus', 'house')]})
+    deck = Deck.load(path)
+    assert UnionDeck([deck, deck]).sections == ('stage5/nouns', 'stage5-2/nouns')
+    with pytest.raises(ValueError):
+        UnionDeck([deck, deck], names=['a', 'a'])
+
+
+def make_choice_deck(sections=2, cards=30):
+    names = [f"s{k}" for k in range(sections)]
+    terms = [f"term{i}" for i in range(sections * cards)]
+    definitions = [f"definition {i} " + "x" * (i % 7) for i in range(sections * cards)]
+    starts = [k * cards for k in range(sections + 1)]
+    return Deck('choices', None, '1.0', names, terms, definitions, starts)
+
+
+def test_length_order_keeps_sections_apart():
+    deck = make_choice_deck()
+    order, rank = deck.length_order()
+    assert sorted(order) == list(range(len(deck)))
+    assert all(order[rank[i]] == i for i in range(len(deck)))
+    assert set(order[:30]) == set(range(30))
+    lengths = [len(deck.definitions[i]) for i in order[:30]]
+    assert lengths == sorted(lengths)
+    assert deck.length_order() is deck.length_order()
+
+
+def test_choices_are_distinct_and_from_the_section():
+    deck = make_choice_deck()
+    session = StudySession(deck, seed=1)
+    for _ in range(200):
+        index = session.current_card_index()
+        options = session.choices(4)
+        assert len(options) == 4 and index in options
+        assert len({deck.definitions[i] for i in options}) == 4
+        assert {deck.section_of(i) for i in options} == {deck.section_of(index)}
+        assert session.check_choice(index) and not session.check_choice(next(i for i in options if i != index))
+        session.next_card()
+
+
+def test_choices_borrow_from_other_sections_when_small():
+    deck = Deck('small', None, '1.0', ['a', 'b'], ['x', 'y', 'z', 'w'], ['one', 'two', 'three', 'four'], [0, 1, 4])
+    session = StudySession(deck, seed=3)
+    assert sorted(session.choices(4)) == [0, 1, 2, 3]
+    assert StudySession(Deck.empty()).choices() == []
+
+
+def test_keys_are_saved_and_display_text_kept(make_deck):
+    import json
+    path = make_deck('deck', {'nouns': [('Haus (n.)', 'House'), ('Baum', 'tree')]})
+    with open(path, encoding='utf-8') as f:
+        raw = json.load(f)
+    assert raw['normalizer_version'] == 1
+    assert raw['sections']['nouns'][0] == {'term': 'Haus (n.)', 'definition': 'House',
+                                           'term_key': 'haus', 'definition_key': 'house'}
+
+    deck = Deck.load(path)
+    assert deck.terms == ('haus', 'baum')
+    assert deck.card(0) == {'term': 'Haus (n.)', 'definition': 'House', 'section': 'nouns'}
+    assert StudySession(deck).check_answer('HAUS (der)')
+
+
+def test_saved_keys_skip_normalizing(monkeypatch, make_deck):
+    import deck as deck_module
+    path = make_deck('deck', {'nouns': [('Haus (n.)', 'house')]})
+    calls = []
+    monkeypatch.setattr(deck_module, 'normalize_word', lambda word: calls.append(word) or word)
+    Deck.load(path)
+    assert calls == []
+
+
+def test_keys_of_other_normalizer_versions_are_recomputed(tmp_path):
+    import json
+    path = tmp_path / 'old.libdict'
+    path.write_text(json.dumps({'normalizer_version': 0, 'sections': {'nouns': [
+        {'term': 'Haus (n.)', 'definition': 'House', 'term_key': 'stale', 'definition_key': 'stale'}]}}),
+        encoding='utf-8')
+    assert Deck.load(str(path)).terms == ('haus',)
+
+    path.write_text(json.dumps({'sections': {'nouns': [{'term': 'Haus (n.)', 'definition': 'House'}]}}),
+                    encoding='utf-8')
+    deck = Deck.load(str(path))
+    assert deck.terms == ('haus',) and deck.card(0)['term'] == 'Haus (n.)'
+
+
+def test_apply_edit_keeps_display_text():
+    deck = Deck('edits', None, '1.0', ['nouns', 'verbs'], ['haus', 'gehen'], ['house', 'to go'], [0, 1, 2],
+                ['Haus (n.)', 'gehen'], ['House', 'to go'])
+
+    updated, mapping, added = deck.apply_edit({'op': 'update_card', 'section': 'verbs', 'index': 0,
+                                               'definition': 'To Walk (v)'})
+    assert mapping is None and added == []
+    assert updated.definitions == ('house', 'to walk')
+    assert updated.card(1) == {'term': 'gehen', 'definition': 'To Walk (v)', 'section': 'verbs'}
+    assert updated.card(0)['term'] == 'Haus (n.)'
+
+    grown, mapping, added = updated.apply_edit({'op': 'add_card', 'section': 'nouns',
+                                                'term': 'Baum (m)', 'definition': 'tree'})
+    assert added == [1] and list(mapping) == [0, 2]
+    assert grown.terms == ('haus', 'baum', 'gehen')
+    assert [grown.card(i)['term'] for i in range(3)] == ['Haus (n.)', 'Baum (m)', 'gehen']
+
+    shrunk, mapping, added = grown.apply_edit({'op': 'delete_section', 'section': 'nouns'})
+    assert list(mapping) == [-1, -1, 0] and shrunk.display_terms == ('gehen',)
+
+
+def test_diff_counts_display_changes():
+    old = Deck('old', None, '1.0', ['nouns'], ['haus', 'baum'], ['house', 'tree'], [0, 2],
+               ['Haus', 'Baum'], ['house', 'tree'])
+    new = Deck('new', None, '1.0', ['nouns'], ['haus', 'baum', 'katze'], ['house', 'tree', 'cat'], [0, 3],
+               ['Haus (n.)', 'Baum'], ['house', 'tree'])
+    mapping, added, changed = old.diff(new)
+    assert list(mapping) == [0, 1] and added == [2] and changed == 1
+
+    assert old.diff(old)[2] == 0
@@ -0,0 +1,93 @@
+import os
+
+from deck import Deck
+from deck_cache import DeckCache
+from libdict_io import DeckJournal
+
+
+def count_parses(monkeypatch, after=None):
+    """Count Deck.parse calls, optionally running after(path) once a file has been read"""
+    calls = []
+    parse = Deck.parse
+
+    def counting(file_path):
+        calls.append(file_path)
+        entry = parse(file_path)
+        if after:
+            after(file_path)
+        return entry
+
+    monkeypatch.setattr(Deck, 'parse', staticmethod(counting))
+    return calls
+
+
+def test_cache_hit_skips_parsing(tmp_path, make_deck, monkeypatch):
+    path = make_deck()
+    cache = DeckCache(str(tmp_path / 'cache'))
+    calls = count_parses(monkeypatch)
+
+    first = Deck.load(path, cache)
+    second = Deck.load(path, cache)
+
+    assert len(calls) == 1
+    assert second.terms == first.terms and second.card(0) == first.card(0)
+
+
+def test_rewritten_deck_is_parsed_again(tmp_path, make_deck, monkeypatch):
+    path = make_deck()
+    cache = DeckCache(str(tmp_path / 'cache'))
+    Deck.load(path, cache)
+
+    make_deck('deck', {'nouns': [('Baum', 'tree')]})
+    calls = count_parses(monkeypatch)
+    assert Deck.load(path, cache).terms == ('baum',)
+    assert len(calls) == 1
+
+
+def test_journal_append_invalidates_entry(tmp_path, make_deck):
+    path = make_deck()
+    cache = DeckCache(str(tmp_path / 'cache'))
+    Deck.load(path, cache)
+
+    journal = DeckJournal(path)
+    journal.append({'op': 'add_card', 'section': 'nouns', 'term': 'Baum', 'definition': 'tree'})
+    journal.close()
+
+    assert Deck.load(path, cache).terms == ('haus', 'baum')
+
+
+def test_change_during_parse_is_not_cached_as_current(tmp_path, make_deck, monkeypatch):
+    path = make_deck()
+    cache = DeckCache(str(tmp_path / 'cache'))
+    rewritten = []
+
+    def rewrite(file_path):
+        if not rewritten:
+            rewritten.append(file_path)
+            make_deck('deck', {'nouns': [('Baum', 'tree'), ('Katze', 'cat')]})
+
+    count_parses(monkeypatch, after=rewrite)
+    assert Deck.load(path, cache).terms == ('haus',)  # Parsed before the rewrite
+    assert Deck.load(path, cache).terms == ('baum', 'katze')
+
+
+def test_eviction_keeps_recent_entries_within_bound(tmp_path, make_deck):
+    cache_dir = str(tmp_path / 'cache')
+    paths = [make_deck(f'deck{k}', {'nouns': [(f'term{i}', f'definition {i}') for i in range(200)]})
+             for k in range(3)]
+    Deck.load(paths[0], DeckCache(cache_dir))
+    entry_size = sum(os.path.getsize(os.path.join(cache_dir, name)) for name in os.listdir(cache_dir))
+
+    cache = DeckCache(cache_dir, max_bytes=int(entry_size * 2.5))
+    for k, path in enumerate(paths):
+        Deck.load(path, cache)
+        entry = cache._entry_path(path)
+        os.utime(entry, (1000 + k, 1000 + k))  # Load order, in whole seconds
+    cache.evict()
+
+    assert not os.path.exists(cache._entry_path(paths[0]))
+    assert all(os.path.exists(cache._entry_path(path)) for path in paths[1:])
+    assert sum(os.path.getsize(os.path.join(cache_dir, name)) for name in os.listdir(cache_dir)) <= cache.max_bytes
+
+    cache.clear()
+    assert os.listdir(cache_dir) == []
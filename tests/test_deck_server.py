@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+
+from deck_server import DeckServer
+
+
+class MemoryWriter:
+    """Collects what the server writes instead of sending it"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def request(method, path, body=None, headers=None):
+    raw = json.dumps(body).encode('utf-8') if body is not None else b''
+    headers = dict({'Content-Length': str(len(raw))}, **(headers or {}))
+    head = f"{method} {path} HTTP/1.1\r\n"
+    head += ''.join(f"{key}: {value}\r\n" for key, value in headers.items())
+    return head.encode('latin-1') + b'\r\n' + raw
+
+
+def serve(server, *requests):
+    """Run one connection carrying the given raw requests; returns [(status, payload)]"""
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b''.join(requests))
+        reader.feed_eof()
+        writer = MemoryWriter()
+        await server._serve_connection(reader, writer)
+        assert writer.closed
+        return bytes(writer.data)
+
+    data = asyncio.run(run())
+    responses = []
+    while data:
+        head, _, rest = data.partition(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        length = int(next(line.split(':')[1] for line in lines if line.startswith('Content-Length')))
+        responses.append((int(lines[0].split(' ')[1]), json.loads(rest[:length])))
+        data = rest[length:]
+    return responses
+
+
+def test_sessions_are_routed_over_one_connection(make_deck, tmp_path):
+    make_deck('stage5', {'nouns': [('Haus', 'house'), ('Baum', 'tree')]})
+    server = DeckServer(str(tmp_path))
+
+    [(status, created)] = serve(server, request('POST', '/sessions', {'deck': 'stage5'}))
+    assert status == 201 and created['card_count'] == 2
+    session = created['session']
+
+    responses = serve(server,
+                      request('GET', '/decks'),
+                      request('POST', f'/sessions/{session}/check', {'answer': 'house'}),
+                      request('POST', f'/sessions/{session}/next'),
+                      request('PUT', f'/sessions/{session}'),
+                      request('POST', f'/sessions/{session}/jump'),
+                      request('DELETE', f'/sessions/{session}'),
+                      request('GET', f'/sessions/{session}'))
+    assert [status for status, _ in responses] == [200, 200, 200, 405, 404, 200, 404]
+    assert responses[0][1] == {'loaded': ['stage5.libdict'], 'available': ['stage5.libdict']}
+    assert responses[1][1]['correct'] is True and responses[1][1]['position'] == 1
+    assert responses[2][1]['position'] == 0
+
+
+def test_bad_requests_get_client_errors(make_deck, tmp_path):
+    make_deck('stage5')
+    server = DeckServer(str(tmp_path))
+
+    responses = serve(server,
+                      request('POST', '/sessions', {'deck': '../stage5'}),
+                      request('POST', '/sessions', {'deck': 'missing'}),
+                      request('POST', '/sessions', {'deck': 'stage5', 'seed': 'x'}),
+                      request('POST', '/sessions', headers={'Content-Length': '2'}) + b'{]',
+                      request('POST', '/sessions', headers={'Content-Length': '2'}) + b'[]',
+                      request('GET', '/nowhere'))
+    assert [status for status, _ in responses] == [400, 404, 400, 400, 400, 404]
+    assert all('error' in payload for _, payload in responses)
+
+
+def test_invalid_content_length_is_rejected_and_closes(tmp_path):
+    server = DeckServer(str(tmp_path))
+    for length in ('abc', '-5', str(DeckServer.MAX_BODY + 1)):
+        # The request after the bad one is never answered
+        responses = serve(server, request('GET', '/decks', headers={'Content-Length': length}),
+                          request('GET', '/decks'))
+        assert [status for status, _ in responses] == [413 if length.isdigit() else 400]
+
+
+def test_changed_deck_is_reloaded_for_new_sessions(make_deck, tmp_path):
+    path = make_deck('stage5')
+    server = DeckServer(str(tmp_path))
+    [(_, first)] = serve(server, request('POST', '/sessions', {'deck': 'stage5'}))
+    assert first['card_count'] == 1
+
+    make_deck('stage5', {'nouns': [('Haus', 'house'), ('Baum', 'tree')]})
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    responses = serve(server, request('POST', '/sessions', {'deck': 'stage5'}),
+                      request('GET', f"/sessions/{first['session']}"))
+    assert responses[0][1]['card_count'] == 2
+    assert responses[1][1]['card_count'] == 1  # Running sessions keep their deck
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from deck_watcher import WATCHERS, InotifyWatcher, PollingWatcher, create_watcher
+from libdict_io import DeckJournal, journal_path
+
+
+def touch_later(path):
+    """Move a file's modification time forward, as coarse clocks may not"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.parametrize('backend', [
+    'polling',
+    pytest.param('inotify', marks=pytest.mark.skipif(not InotifyWatcher.is_available(),
+                                                     reason="inotify is not available")),
+])
+def test_watcher_sees_rewrites_and_journal_edits(make_deck, backend):
+    path = make_deck()
+    watcher = create_watcher(path, backend)
+    assert isinstance(watcher, WATCHERS[backend])
+    try:
+        assert not watcher.poll()
+
+        make_deck(sections={'nouns': [('Haus (n.)', 'house'), ('Baum', 'tree')]})
+        touch_later(path)
+        assert watcher.poll()
+        assert not watcher.poll()
+
+        journal = DeckJournal(path)
+        journal.append({'op': 'add_card', 'section': 'nouns', 'term': 'Katze', 'definition': 'cat'})
+        journal.close()
+        assert watcher.poll()
+
+        os.remove(journal_path(path))
+        assert watcher.poll()
+        assert not watcher.poll()
+    finally:
+        watcher.close()
+
+
+def test_polling_watcher_ignores_other_files(make_deck, tmp_path):
+    path = make_deck()
+    watcher = PollingWatcher(path)
+    make_deck('other')
+    (tmp_path / 'notes.txt').write_text('unrelated')
+    assert not watcher.poll()
@@ -0,0 +1,39 @@
+import pytest
+
+import exporters
+import importers
+from flashcard_manager import FlashcardManager
+from libdict_io import read_libdict
+
+SECTIONS = {
+    'nouns': [('Haus (n.)', 'house'), ('Weg, Wege', 'way, path'), ('"Quote"', 'a\ttab')],
+    'verbs': [('gehen', 'to go; to walk'), ('sagen', 'to say "hi"')],
+}
+
+
+def cards(path):
+    return {name: [(item['term'], item['definition']) for item in items]
+            for name, items in read_libdict(path)['sections'].items()}
+
+
+@pytest.mark.parametrize('file_format', exporters.EXPORT_FORMATS)
+def test_exported_files_import_to_the_same_cards(make_deck, tmp_path, file_format):
+    path = make_deck(sections=SECTIONS)
+    exported = str(tmp_path / f'deck.{file_format}')
+    exporters.export_libdict(path, exported, file_format)
+
+    options = {} if file_format == 'anki' else {'section_column': 'section'}
+    imported = importers.import_file(exported, str(tmp_path / 'imported.libdict'), file_format, **options)
+    assert cards(imported) == cards(path)
+
+
+def test_deck_export_matches_file_export(make_deck, tmp_path):
+    path = make_deck(sections=SECTIONS)
+    manager = FlashcardManager()
+    assert manager.load_libdict(path)
+    from_deck, from_file = str(tmp_path / 'a.csv'), str(tmp_path / 'b.csv')
+
+    exporters.export_deck(manager, from_deck)
+    exporters.export_libdict(path, from_file)
+    with open(from_deck, encoding='utf-8') as a, open(from_file, encoding='utf-8') as b:
+        assert a.read() == b.read()
@@ -0,0 +1,125 @@
+import pytest
+
+from flashcard_manager import FlashcardManager
+from libdict_io import read_libdict
+
+
+def test_edits_survive_automatic_compaction(make_deck):
+    path = make_deck()
+    manager = FlashcardManager()
+    assert manager.load_libdict(path)
+    manager.compact_threshold = 2
+
+    for word in ('Baum', 'Katze', 'Hund', 'Maus', 'Vogel'):
+        manager.add_card('nouns', word, word.lower())
+    manager.delete_card('nouns', 0)
+    manager.journal.close()
+
+    expected = ['Baum', 'Katze', 'Hund', 'Maus', 'Vogel']
+    assert [item['term'] for item in read_libdict(path)['sections']['nouns']] == expected
+    reloaded = FlashcardManager()
+    assert reloaded.load_libdict(path)
+    assert [reloaded.deck.card(i)['term'] for i in range(len(reloaded.deck))] == expected
+
+
+def test_load_several_decks(make_deck):
+    first = make_deck('stage5')
+    second = make_deck('stage6', {'verbs': [('gehen', 'to go')]})
+    manager = FlashcardManager()
+
+    assert manager.load_libdicts([first, second])
+    assert manager.journal is None
+    assert manager.deck.paths == (first, second)
+    assert manager.get_deck_info()['filtered_count'] == 2
+
+    assert manager.load_libdicts([first])
+    assert manager.deck.path == first and manager.journal is not None
+
+
+def test_multiple_choice_builds_length_index_on_load(make_deck):
+    path = make_deck()
+    manager = FlashcardManager()
+    manager.set_multiple_choice(True)
+
+    assert manager.load_libdict(path)
+    assert 'length' in manager.deck._sort_orders
+    assert manager.reload_libdict() is not None
+    assert 'length' in manager.deck._sort_orders
+
+    choices = manager.get_choices()
+    assert [choice['term'] for choice in choices] == ['Haus (n.)']
+    assert manager.check_choice(choices[0]['index'])
+
+
+def test_reload_reports_display_text_changes(make_deck):
+    path = make_deck()
+    manager = FlashcardManager()
+    assert manager.load_libdict(path)
+
+    make_deck('deck', {'nouns': [('Haus (n., das)', 'house')]})
+    assert manager.reload_libdict() == {'added': 0, 'removed': 0, 'changed': 1}
+    assert manager.get_current_card()['term'] == 'Haus (n., das)'
+
+
+def test_reload_keeps_current_card_and_answers_when_cards_are_inserted(make_deck):
+    path = make_deck(sections={'nouns': [('Apfel', 'apple'), ('Birne', 'pear'), ('Kirsche', 'cherry')]})
+    manager = FlashcardManager()
+    assert manager.load_libdict(path)
+    session = manager.session
+    session.record_answer(True)
+    session.remove_current_card()
+    session.record_answer(False)
+    assert manager.get_current_card()['term'] == 'Birne'
+
+    make_deck(sections={'nouns': [('Erdbeere', 'strawberry'), ('Apfel', 'apple'), ('Pflaume', 'plum'),
+                                  ('Birne', 'pear'), ('Kirsche', 'cherry')]})
+    assert manager.reload_libdict() == {'added': 2, 'removed': 0, 'changed': 0}
+
+    assert manager.get_current_card()['term'] == 'Birne'
+    assert list(session.view) == [3, 4, 0, 2]  # Apfel stays removed, new cards go last
+    assert {i: (stats.attempts, stats.misses) for i, stats in session.card_stats.items()} == {1: (1, 0), 3: (1, 1)}
+
+
+def test_journaled_edits_keep_display_text(make_deck):
+    path = make_deck()
+    manager = FlashcardManager()
+    assert manager.load_libdict(path)
+    manager.update_card('nouns', 0, term='Heim (n.)')
+    manager.add_card('nouns', 'Baum (m)', 'Tree')
+    manager.compact_deck()
+
+    saved = read_libdict(path)['sections']['nouns']
+    assert [(item['term'], item['term_key']) for item in saved] == [('Heim (n.)', 'heim'), ('Baum (m)', 'baum')]
+    reloaded = FlashcardManager()
+    assert reloaded.load_libdict(path)
+    assert reloaded.deck.terms == ('heim', 'baum')
+    assert reloaded.get_current_card()['term'] == 'Heim (n.)'
+
+
+def test_edits_on_a_fork_are_refused(make_deck):
+    path = make_deck()
+    manager = FlashcardManager()
+    assert manager.load_libdict(path)
+    fork = manager.fork()
+    deck, view = fork.deck, list(fork.session.view)
+
+    for edit in (lambda: fork.add_card('nouns', 'Baum', 'tree'),
+                 lambda: fork.update_card('nouns', 0, term='Heim'),
+                 lambda: fork.delete_card('nouns', 0),
+                 lambda: fork.add_section('verbs')):
+        with pytest.raises(ValueError):
+            edit()
+    assert fork.deck is deck and manager.deck is deck
+    assert list(fork.session.view) == view
+
+    manager.add_card('nouns', 'Baum', 'tree')
+    assert len(manager.deck) == 2 and len(fork.deck) == 1
+
+
+def test_edits_on_a_union_are_refused(make_deck):
+    manager = FlashcardManager()
+    assert manager.load_libdicts([make_deck('a'), make_deck('b')])
+    deck = manager.deck
+    with pytest.raises(ValueError):
+        manager.add_card('a/nouns', 'Baum', 'tree')
+    assert manager.deck is deck
@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+from gui import VocabApp
+
+
+def split(text):
+    return VocabApp._split_flashcard_paths(SimpleNamespace(PATH_SEPARATOR=VocabApp.PATH_SEPARATOR), text)
+
+
+def test_split_joined_paths(tmp_path):
+    first, second = str(tmp_path / 'stage5.libdict'), str(tmp_path / 'stage6.libdict')
+    assert split(VocabApp.PATH_SEPARATOR.join([first, second])) == [first, second]
+    assert split('') == []
+    assert split('   ') == []
+
+
+def test_existing_file_is_not_split(tmp_path):
+    odd = tmp_path / 'latin; stage 5.libdict'
+    odd.write_text('{}', encoding='utf-8')
+    assert split(str(odd)) == [str(odd)]
+
+    spaced = tmp_path / ' deck.libdict '
+    spaced.write_text('{}', encoding='utf-8')
+    assert split(str(spaced)) == [str(spaced)]
+
+
+def test_surrounding_whitespace_of_one_path_is_ignored(tmp_path):
+    deck = tmp_path / 'deck.libdict'
+    deck.write_text('{}', encoding='utf-8')
+    assert split(f"  {deck}\n") == [str(deck)]
+
+
+def test_only_the_exact_separator_splits(tmp_path):
+    text = str(tmp_path / 'a;b.libdict')
+    assert split(text) == [text]
@@ -0,0 +1,125 @@
+import json
+from types import SimpleNamespace
+
+import importers
+from gui import VocabApp
+
+
+class FakeVar:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def converter_tab(term='', definition='', section=''):
+    """Stand-in for the converter tab's column fields"""
+    return SimpleNamespace(term_column_var=FakeVar(term),
+                           definition_column_var=FakeVar(definition),
+                           section_column_var=FakeVar(section),
+                           _import_column=lambda value: VocabApp._import_column(None, value))
+
+
+def read_sections(path):
+    with open(path, encoding='utf-8') as f:
+        return {name: [(card['term'], card['definition']) for card in cards]
+                for name, cards in json.load(f)['sections'].items()}
+
+
+def test_detect_format(tmp_path):
+    anki = tmp_path / 'notes.txt'
+    anki.write_text('#separator:tab\n#html:false\nHaus\thouse\n', encoding='utf-8')
+    quizlet = tmp_path / 'set.txt'
+    quizlet.write_text('Haus\thouse\n', encoding='utf-8')
+
+    assert importers.detect_format(str(tmp_path / 'cards.csv')) == 'csv'
+    assert importers.detect_format(str(tmp_path / 'cards.TSV')) == 'tsv'
+    assert importers.detect_format(str(anki)) == 'anki'
+    assert importers.detect_format(str(quizlet)) == 'quizlet'
+
+
+def test_auto_import_of_quizlet_ignores_column_fields(tmp_path):
+    source = tmp_path / 'set.txt'
+    source.write_text('Haus\thouse\nKatze\tcat\n', encoding='utf-8')
+    output = tmp_path / 'set.libdict'
+
+    VocabApp._import_file(converter_tab('1', '2'), str(source), str(output), None)
+
+    assert read_sections(output) == {importers.DEFAULT_SECTION: [('Haus', 'house'), ('Katze', 'cat')]}
+
+
+def test_auto_import_of_csv_keeps_section_column(tmp_path):
+    source = tmp_path / 'cards.csv'
+    source.write_text('word,meaning,chapter\nHaus,house,nouns\ngehen,to go,verbs\n', encoding='utf-8')
+    output = tmp_path / 'cards.libdict'
+
+    VocabApp._import_file(converter_tab('word', 'meaning', 'chapter'), str(source), str(output), None)
+
+    assert read_sections(output) == {'nouns': [('Haus', 'house')], 'verbs': [('gehen', 'to go')]}
+
+
+def test_named_columns_imply_a_header(tmp_path):
+    source = tmp_path / 'german.csv'
+    source.write_text('Wort,Bedeutung\nHaus,house\nBaum,tree\n', encoding='utf-8')
+    output = tmp_path / 'german.libdict'
+
+    importers.import_file(str(source), str(output), term_column='Wort', definition_column='Bedeutung')
+
+    assert read_sections(output) == {importers.DEFAULT_SECTION: [('Haus', 'house'), ('Baum', 'tree')]}
+
+
+def test_unknown_header_without_names_is_a_card(tmp_path):
+    source = tmp_path / 'plain.csv'
+    source.write_text('Wort,Bedeutung\nHaus,house\n', encoding='utf-8')
+    output = tmp_path / 'plain.libdict'
+
+    importers.import_file(str(source), str(output))
+
+    assert read_sections(output) == {importers.DEFAULT_SECTION: [('Wort', 'Bedeutung'), ('Haus', 'house')]}
+
+
+def test_anki_html_line_breaks(tmp_path):
+    source = tmp_path / 'notes.txt'
+    source.write_text('#separator:tab\n#html:true\n'
+                      'Haus<br>das<BR/>n.\thouse<br />home\n', encoding='utf-8')
+    output = tmp_path / 'notes.libdict'
+
+    importers.import_file(str(source), str(output))
+
+    assert read_sections(output) == {importers.DEFAULT_SECTION: [('Haus das n.', 'house home')]}
+
+
+def test_anki_metadata_columns(tmp_path):
+    source = tmp_path / 'notes.txt'
+    source.write_text('#separator:tab\n#html:false\n#guid column:1\n#notetype column:2\n'
+                      '#deck column:3\n#tags column:6\n'
+                      'a1b2\tBasic\tGerman::Nouns\tHaus\thouse\tnouns stage5\n'
+                      'c3d4\tBasic\tGerman::Verbs\tgehen\tto go\t\n', encoding='utf-8')
+    output = tmp_path / 'notes.libdict'
+
+    importers.import_file(str(source), str(output))
+
+    assert read_sections(output) == {'nouns': [('Haus', 'house')], importers.DEFAULT_SECTION: [('gehen', 'to go')]}
+
+
+def test_anki_deck_column_names_sections_without_tags(tmp_path):
+    source = tmp_path / 'notes.txt'
+    source.write_text('#separator:tab\n#guid column:1\n#deck column:2\n'
+                      'a1b2\tGerman::Nouns\tHaus\thouse\n'
+                      'c3d4\tGerman::Verbs\tgehen\tto go\n', encoding='utf-8')
+    output = tmp_path / 'notes.libdict'
+
+    importers.import_file(str(source), str(output))
+
+    assert read_sections(output) == {'Nouns': [('Haus', 'house')], 'Verbs': [('gehen', 'to go')]}
+
+
+def test_anki_metadata_column_between_fields(tmp_path):
+    source = tmp_path / 'notes.txt'
+    source.write_text('#separator:comma\n#notetype column:2\nHaus,Basic,house\n', encoding='utf-8')
+    output = tmp_path / 'notes.libdict'
+
+    importers.import_file(str(source), str(output))
+
+    assert read_sections(output) == {importers.DEFAULT_SECTION: [('Haus', 'house')]}
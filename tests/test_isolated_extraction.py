@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from pdf_backends import ExtractedDocument, ExtractionBackend, ExtractionTimeoutError, IsolatedBackend
+from pdf_parser import PDFParser
+
+
+class SleepyDocument(ExtractedDocument):
+    backend = 'sleepy'
+
+    def __init__(self, pages, slow_pages, delay):
+        self.pages = pages
+        self.slow_pages = slow_pages
+        self.delay = delay
+
+    @property
+    def page_count(self):
+        return self.pages
+
+    def extract_text(self, page_number):
+        if page_number in self.slow_pages:
+            time.sleep(self.delay)
+        return f"Nouns:\npestis{page_number}, pestis{page_number} plague"
+
+    def page_fingerprint(self, page_number):
+        return str(page_number)
+
+
+class SleepyBackend(ExtractionBackend):
+    """Stub backend whose opening and chosen pages take a while"""
+
+    name = 'sleepy'
+
+    def __init__(self, pages=4, slow_pages=(), delay=5.0, open_delay=0.0):
+        self.pages = pages
+        self.slow_pages = set(slow_pages)
+        self.delay = delay
+        self.open_delay = open_delay
+
+    def open(self, pdf_path):
+        time.sleep(self.open_delay)
+        return SleepyDocument(self.pages, self.slow_pages, self.delay)
+
+
+def test_slow_page_is_skipped_and_slow_open_is_not_charged_to_pages():
+    backend = IsolatedBackend(SleepyBackend(slow_pages={1}, open_delay=1.0), page_timeout=0.5)
+    with backend.open('unused.pdf') as document:
+        assert document.extract_text(0).startswith('Nouns')
+        with pytest.raises(ExtractionTimeoutError) as error:
+            document.extract_text(1)
+        assert error.value.budget == 'page' and error.value.page_number == 1
+        assert document.restarts == 1
+
+        # The worker is respawned and the document opened again (1 s), then the page gets its own 0.5 s
+        assert 'pestis2' in document.extract_text(2)
+        assert document.restarts == 1
+
+
+def test_open_timeout_limits_opening():
+    backend = IsolatedBackend(SleepyBackend(open_delay=5.0), page_timeout=10, open_timeout=0.5)
+    with pytest.raises(ExtractionTimeoutError) as error:
+        backend.open('unused.pdf')
+    assert error.value.budget == 'document'
+
+
+def test_parse_skips_slow_pages_and_stops_at_document_budget():
+    parser = PDFParser(SleepyBackend(pages=20, slow_pages={1} | set(range(3, 20)), delay=30), page_timeout=0.5,
+                       document_timeout=3)
+    result = parser.parse_pdf('unused.pdf')
+
+    assert [entry['term'].rstrip(',') for entry in result['nouns']] == ['pestis0', 'pestis2']
+    assert any(warning.startswith('Skipped page 2') for warning in result.warnings)
+    assert result.warnings[-1].startswith('Stopped at page')
+    assert len(result.warnings) < 18
+
+
+def test_document_budget_stops_extraction():
+    backend = IsolatedBackend(SleepyBackend(slow_pages={0}, delay=30), page_timeout=None, document_timeout=1.0)
+    with backend.open('unused.pdf') as document:
+        start = time.monotonic()
+        with pytest.raises(ExtractionTimeoutError) as error:
+            document.extract_text(0)
+        assert error.value.budget == 'document'
+        assert time.monotonic() - start < 5
+        with pytest.raises(ExtractionTimeoutError):
+            document.extract_text(1)
@@ -0,0 +1,130 @@
+import json
+import shutil
+
+import libdict_io
+from libdict_io import (DeckJournal, LibdictWriter, compact_libdict, iter_libdict, journal_path, read_libdict,
+                        write_libdict)
+
+
+def terms(path):
+    return {name: [item['term'] for item in items] for name, items in read_libdict(path)['sections'].items()}
+
+
+def test_journal_replays_edits(make_deck):
+    path = make_deck()
+    journal = DeckJournal(path)
+    journal.append({'op': 'add_card', 'section': 'nouns', 'term': 'Baum', 'definition': 'tree'})
+    journal.append({'op': 'update_card', 'section': 'nouns', 'index': 0, 'term': 'Heim'})
+    journal.append({'op': 'add_section', 'section': 'verbs'})
+    journal.close()
+
+    assert terms(path) == {'nouns': ['Heim', 'Baum'], 'verbs': []}
+    assert DeckJournal(path).op_count == 3
+
+
+def test_append_after_torn_write(make_deck):
+    path = make_deck()
+    journal = DeckJournal(path)
+    journal.append({'op': 'add_card', 'section': 'nouns', 'term': 'Baum', 'definition': 'tree'})
+    journal.close()
+    with open(journal_path(path), 'a', encoding='utf-8') as f:
+        f.write('{"op": "add_card", "section": "nou')  # Crash in the middle of a write
+
+    assert terms(path) == {'nouns': ['Haus (n.)', 'Baum']}
+
+    journal = DeckJournal(path)
+    journal.append({'op': 'add_card', 'section': 'nouns', 'term': 'Katze', 'definition': 'cat'})
+    journal.append({'op': 'add_card', 'section': 'nouns', 'term': 'Hund', 'definition': 'dog'})
+    journal.close()
+
+    assert terms(path) == {'nouns': ['Haus (n.)', 'Baum', 'Katze', 'Hund']}
+
+
+def test_torn_write_without_complete_lines(make_deck):
+    path = make_deck()
+    with open(journal_path(path), 'w', encoding='utf-8') as f:
+        f.write('{"op": "add_')
+
+    journal = DeckJournal(path)
+    journal.append({'op': 'add_card', 'section': 'nouns', 'term': 'Baum', 'definition': 'tree'})
+    journal.close()
+
+    assert terms(path) == {'nouns': ['Haus (n.)', 'Baum']}
+
+
+def test_journal_left_behind_by_compaction_is_not_replayed(tmp_path, make_deck):
+    path = make_deck()
+    journal = DeckJournal(path)
+    journal.append({'op': 'add_card', 'section': 'nouns', 'term': 'Baum', 'definition': 'tree'})
+    journal.append({'op': 'delete_card', 'section': 'nouns', 'index': 0})
+    shutil.copy(journal_path(path), str(tmp_path / 'saved'))
+
+    compact_libdict(path, journal)
+    # Crash after the deck was replaced but before the journal was removed
+    shutil.copy(str(tmp_path / 'saved'), journal_path(path))
+
+    assert terms(path) == {'nouns': ['Baum']}
+    assert DeckJournal(path).op_count == 0
+
+    journal.append({'op': 'add_card', 'section': 'nouns', 'term': 'Katze', 'definition': 'cat'})
+    journal.close()
+    assert terms(path) == {'nouns': ['Baum', 'Katze']}
+
+    compact_libdict(path)
+    assert terms(path) == {'nouns': ['Baum', 'Katze']}
+
+
+def test_rewrite_skips_leftover_journal(tmp_path, make_deck):
+    path = make_deck()
+    journal = DeckJournal(path)
+    journal.append({'op': 'add_card', 'section': 'nouns', 'term': 'Baum', 'definition': 'tree'})
+    journal.close()
+    shutil.copy(journal_path(path), str(tmp_path / 'saved'))
+
+    with LibdictWriter(path, title='New') as writer:
+        writer.add('verbs', 'gehen', 'to go')
+    shutil.copy(str(tmp_path / 'saved'), journal_path(path))
+
+    assert terms(path) == {'verbs': ['gehen']}
+
+
+def test_generation_is_read_from_header(tmp_path, make_deck):
+    path = make_deck()
+    assert libdict_io.read_generation(path) == 1
+    compact_libdict(path)
+    assert libdict_io.read_generation(path) == 2
+
+    hand_written = tmp_path / 'hand.libdict'
+    hand_written.write_text(json.dumps({'sections': {}, 'generation': 7}), encoding='utf-8')
+    assert libdict_io.read_generation(str(hand_written)) == 7
+    hand_written.write_text(json.dumps({'title': 'x', 'sections': {}}), encoding='utf-8')
+    assert libdict_io.read_generation(str(hand_written)) == 0
+
+
+def test_writer_matches_write_libdict(tmp_path):
+    written = str(tmp_path / 'a.libdict')
+    streamed = str(tmp_path / 'b.libdict')
+    write_libdict({'format_version': '1.0', 'title': 'T',
+                   'sections': {'nouns': [{'term': 'Haus (n.)', 'definition': 'house'}], 'verbs': []}}, written)
+    with LibdictWriter(streamed, title='T', sections=['nouns', 'verbs']) as writer:
+        writer.add('nouns', 'Haus (n.)', 'house')
+
+    with open(written, encoding='utf-8') as a, open(streamed, encoding='utf-8') as b:
+        assert json.load(a) == json.load(b)
+
+
+def test_streamed_cards_match_read_libdict(tmp_path):
+    path = str(tmp_path / 'deck.libdict')
+    with LibdictWriter(path, title='T', sections=['empty']) as writer:
+        for i in range(5):
+            writer.add('nouns' if i % 2 else 'verbs', f'Wort {i} "ä"', f'word {i},\n{{}}')
+        writer.add('mixed: [x]', 'Haus (n.)', 'house')
+
+    def flattened():
+        return [(name, item) for name, items in read_libdict(path)['sections'].items() for item in items]
+
+    assert list(iter_libdict(path)) == flattened() and len(flattened()) == 6
+    journal = DeckJournal(path)
+    journal.append({'op': 'add_card', 'section': 'empty', 'term': 'Baum', 'definition': 'tree'})
+    journal.close()
+    assert list(iter_libdict(path)) == flattened() and len(flattened()) == 7
@@ -0,0 +1,133 @@
+import zlib
+
+import pytest
+
+from pdf_backends import (BACKENDS, AutoBackend, ExtractionBackend, PyPDF2Backend,
+                          SimpleTextBackend)
+from pdf_parser import PDFParser
+
+needs_pypdf2 = pytest.mark.skipif(not PyPDF2Backend.is_available(), reason="PyPDF2 is not installed")
+
+
+def stream(data, extra=b''):
+    return b'<< /Length %d %s>>\nstream\n%s\nendstream' % (len(data), extra, data)
+
+
+def save_pdf(path, objects):
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def write_pdf(path, *lines):
+    """Write a one-page PDF whose text is drawn from a form XObject"""
+    shown = b' T* '.join(b'(%s) Tj' % line.encode('latin-1') for line in lines)
+    form = b'BT /F1 12 Tf 14 TL 72 700 Td %s ET' % shown
+    save_pdf(path, [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R '
+        b'/Resources << /XObject << /Fm1 5 0 R >> >> >>',
+        stream(b'q /Fm1 Do Q'),
+        stream(form, b'/Type /XObject /Subtype /Form /BBox [0 0 612 792] /Resources << /Font << /F1 6 0 R >> >> '),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ])
+
+
+def write_page(path, content, compress=False):
+    """Write a one-page PDF drawing the given content stream directly"""
+    if compress:
+        contents = stream(zlib.compress(content), b'/Filter /FlateDecode ')
+    else:
+        contents = stream(content)
+    save_pdf(path, [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R '
+        b'/Resources << /Font << /F1 5 0 R >> >> >>',
+        contents,
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ])
+
+
+def simple_text(tmp_path, content, compress=False):
+    path = str(tmp_path / 'page.pdf')
+    write_page(path, content, compress)
+    with SimpleTextBackend().open(path) as document:
+        return document.extract_text(0)
+
+
+@needs_pypdf2
+def test_fingerprint_covers_form_xobjects(tmp_path):
+    first, second = str(tmp_path / 'a.pdf'), str(tmp_path / 'b.pdf')
+    write_pdf(first, 'Haus - house')
+    write_pdf(second, 'Baum - tree')
+    backend = PyPDF2Backend()
+
+    a, b = backend.open(first), backend.open(second)
+    assert 'Haus' in a.extract_text(0) and 'Baum' in b.extract_text(0)
+    assert a.page_fingerprint(0) != b.page_fingerprint(0)
+
+    write_pdf(second, 'Haus - house')
+    assert backend.open(second).page_fingerprint(0) == a.page_fingerprint(0)
+
+
+@needs_pypdf2
+def test_incremental_reconversion_sees_form_changes(tmp_path):
+    pdf, cache = str(tmp_path / 'deck.pdf'), str(tmp_path / 'deck.libdict.pages')
+    write_pdf(pdf, 'Nouns:', 'pestis, pestis pest', 'ager, agri field')
+    parser = PDFParser()
+    parser.parse_pdf(pdf, page_cache=cache)
+
+    write_pdf(pdf, 'Nouns:', 'pestis, pestis plague', 'ager, agri field')
+    full = PDFParser().parse_pdf(pdf)
+    assert 'plague' in full['nouns'][0]['definition']
+    assert parser.parse_pdf(pdf, page_cache=cache) == full
+
+
+def test_simple_backend_breaks_lines_on_tj_and_line_moves(tmp_path):
+    content = (b"BT /F1 12 Tf 14 TL 72 700 Td (Nouns:) Tj T* (Haus - ) Tj (house) Tj "
+               b"(ager - field) ' 0 -14 Td (pestis - plague) Tj ET")
+    assert simple_text(tmp_path, content).split('\n') == [
+        'Nouns:', 'Haus - house', 'ager - field', 'pestis - plague']
+
+
+def test_simple_backend_spaces_words_by_tj_kerning(tmp_path):
+    # Small adjustments are kerning inside a word, wide ones a word gap
+    content = (b"BT /F1 12 Tf 72 700 Td [(H) -20 (aus) -400 (-) -300 (house)] TJ "
+               b"0 -14 Td [(Baum ) -400 (- tree)] TJ ET")
+    assert simple_text(tmp_path, content).split('\n') == ['Haus - house', 'Baum - tree']
+
+
+def test_simple_backend_reads_flate_streams(tmp_path):
+    content = b"BT /F1 12 Tf 72 700 Td (Haus - house) Tj 0 -14 Td [(Baum) -400 (- tree)] TJ ET"
+    assert simple_text(tmp_path, content, compress=True) == simple_text(tmp_path, content)
+    assert simple_text(tmp_path, content, compress=True).split('\n') == ['Haus - house', 'Baum - tree']
+
+
+class BrokenBackend(ExtractionBackend):
+    name = 'broken'
+
+    def open(self, pdf_path):
+        raise RuntimeError("cannot find page tree")
+
+
+def test_auto_backend_falls_back_on_any_open_error(tmp_path, monkeypatch):
+    path = str(tmp_path / 'deck.pdf')
+    write_page(path, b"BT /F1 12 Tf 14 TL 72 700 Td (Nouns:) Tj T* (pestis, pestis plague) Tj ET")
+    monkeypatch.setitem(BACKENDS, 'broken', BrokenBackend)
+    monkeypatch.setattr(AutoBackend, 'preference', ('broken', 'simple'))
+
+    with AutoBackend().open(path) as document:
+        assert document.backend == 'simple'
+        assert document.warnings == ["The broken backend could not open the file: cannot find page tree"]
+    result = PDFParser(backend='auto').parse_pdf(path)
+    assert result['nouns'] and result.warnings == document.warnings
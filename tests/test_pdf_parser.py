@@ -0,0 +1,15 @@
+import pytest
+
+from pdf_parser import parse_page_ranges
+
+
+def test_parse_page_ranges():
+    assert parse_page_ranges('1-3, 7, 10-') == [(1, 3), (7, 7), (10, None)]
+    assert parse_page_ranges(' 2 - 4 ; 9 ') == [(2, 4), (9, 9)]
+    assert parse_page_ranges('') == []
+
+
+@pytest.mark.parametrize('spec', ['0', '5-3', 'a', '1-2-3', '-4'])
+def test_parse_page_ranges_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_page_ranges(spec)
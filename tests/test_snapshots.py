@@ -0,0 +1,48 @@
+from deck import Deck, StudySession
+
+
+def vocabulary(cards=40):
+    return {'nouns': [(f'noun{i}', f'thing {i}') for i in range(cards)],
+            'verbs': [(f'verb{i}', f'to do {i}') for i in range(cards)]}
+
+
+def test_session_round_trip(make_deck):
+    deck = Deck.load(make_deck(sections=vocabulary()))
+    session = StudySession(deck, remove_on_correct=True, seed=5)
+    session.toggle_section('verbs')
+    session.shuffle_cards()
+    session.next_card()
+    session.check_answer('wrong')
+    session.remove_current_card()
+    session.set_adaptive(True)
+    session.save()
+
+    restored = StudySession(deck)
+    assert restored.restore()
+    assert list(restored.view) == list(session.view)
+    assert restored.current_index == session.current_index
+    assert restored.active_sections == session.active_sections
+    assert (restored.remove_on_correct, restored.adaptive, restored.seed) == (True, True, 5)
+    assert {i: (s.attempts, s.misses) for i, s in restored.card_stats.items()} == \
+        {i: (s.attempts, s.misses) for i, s in session.card_stats.items()}
+    assert [restored.next_card() for _ in range(5)] == [session.next_card() for _ in range(5)]
+
+
+def test_unshuffled_session_round_trip(make_deck):
+    deck = Deck.load(make_deck(sections=vocabulary()))
+    session = StudySession(deck, seed=1)
+    session.next_card()
+    session.remove_current_card()
+    session.save()
+
+    restored = StudySession(deck)
+    assert restored.restore()
+    assert list(restored.view) == list(session.view) and restored.current_index == 1
+
+
+def test_snapshot_of_changed_deck_is_rejected(make_deck):
+    path = make_deck(sections=vocabulary())
+    StudySession(Deck.load(path), seed=1).save()
+
+    make_deck(sections=vocabulary(41))
+    assert not StudySession(Deck.load(path)).restore()